@@ -1,6 +1,7 @@
 import json
 import xml.etree.ElementTree as ET
 from datetime import datetime
+from typing import List
 from models import MarketDataPoint
 
 # Problem: Standardize external data formats into MarketDataPoint objects.
@@ -10,37 +11,59 @@ from models import MarketDataPoint
 # BloombergXMLAdapter
 # Each exposes .get_data(symbol: str) -> MarketDataPoint.
 # Demonstrate ingestion from external_data_yahoo.json and external_data_bloomberg.xml.
+# Both adapters take the file to read (defaulting to the sample inputs), so
+# the bulk ingestion job (ingest.py) can run them over whole vendor drops.
+
+YAHOO_JSON = 'inputs/external_data_yahoo.json'
+BLOOMBERG_XML = 'inputs/external_data_bloomberg.xml'
+
+
+def _to_point(entry) -> MarketDataPoint:
+    return MarketDataPoint(
+        timestamp=datetime.fromisoformat(entry.get('timestamp').replace('Z', '+00:00')),
+        symbol=entry.get('symbol'),
+        price=float(entry.get('price')),
+        daily_volume=None
+    )
 
 class YahooFinanceAdapter:
-    def __init__(self):
+    def __init__(self, filepath: str = YAHOO_JSON):
+        self.filepath = filepath
         self.data = self.load_data()
 
     def load_data(self):
-        with open('inputs/external_data_yahoo.json', 'r') as f:
+        with open(self.filepath, 'r') as f:
             raw_data = json.load(f)
+            # One quote per file, or a list of quotes
+            quotes = raw_data if isinstance(raw_data, list) else [raw_data]
             return [{
-                'symbol': raw_data.get('ticker'),
-                'price': raw_data.get('last_price'),
-                'timestamp': raw_data.get('timestamp')
-            }]
+                'symbol': quote.get('ticker'),
+                'price': quote.get('last_price'),
+                'timestamp': quote.get('timestamp')
+            } for quote in quotes]
 
     def get_data(self, symbol: str) -> MarketDataPoint:
         for entry in self.data:
             if entry.get('symbol') == symbol or entry.get('ticker') == symbol:
-                return MarketDataPoint(
-                    timestamp=datetime.fromisoformat(entry.get('timestamp').replace('Z', '+00:00')),
-                    symbol=entry.get('symbol'),
-                    price=float(entry.get('price')),
-                    daily_volume=None
-                )
+                return _to_point(entry)
+
+    @staticmethod
+    def parse_quote(quote: dict) -> MarketDataPoint:
+        """One raw Yahoo quote ({'ticker', 'last_price', 'timestamp'}), e.g. from a live feed."""
+        return _to_point({'symbol': quote.get('ticker'), 'price': quote.get('last_price'),
+                          'timestamp': quote.get('timestamp')})
+
+    def get_all(self) -> List[MarketDataPoint]:
+        return [_to_point(entry) for entry in self.data]
 
 
 class BloombergXMLAdapter:
-    def __init__(self):
+    def __init__(self, filepath: str = BLOOMBERG_XML):
+        self.filepath = filepath
         self.data = self.load_data()
 
     def load_data(self):
-        with open('inputs/external_data_bloomberg.xml', 'r') as f:
+        with open(self.filepath, 'r') as f:
             tree = ET.parse(f)
             root = tree.getroot()
             
@@ -67,10 +90,16 @@ class BloombergXMLAdapter:
     def get_data(self, symbol: str) -> MarketDataPoint:
         for entry in self.data:
             if entry.get('symbol') == symbol:
-                return MarketDataPoint(
-                    timestamp=datetime.fromisoformat(entry.get('timestamp').replace('Z', '+00:00')),
-                    symbol=entry.get('symbol'),
-                    price=float(entry.get('price')),
-                    daily_volume=None
-                )
-        return None
\ No newline at end of file
+                return _to_point(entry)
+        return None
+
+    @staticmethod
+    def parse_quote(instrument) -> MarketDataPoint:
+        """One <instrument> element (or its XML text), e.g. from a live feed."""
+        if isinstance(instrument, (str, bytes)):
+            instrument = ET.fromstring(instrument)
+        return _to_point({'symbol': instrument.find('symbol').text, 'price': instrument.find('price').text,
+                          'timestamp': instrument.find('timestamp').text})
+
+    def get_all(self) -> List[MarketDataPoint]:
+        return [_to_point(entry) for entry in self.data]
@@ -1,10 +1,23 @@
 from typing import List, Optional, Any, Dict
 import math
-import pandas as pd
+
+from lazy_imports import lazy_import
+from market_data import MarketData
+from monte_carlo import MonteCarloEngine
+
+pd = lazy_import('pandas')
 
 MARKET_DATA_CSV = 'inputs/market_data.csv'
 
 
+def _load_market_data():
+    """Partitioned market data, loaded once per file version and shared by all decorators."""
+    try:
+        return MarketData.cached(MARKET_DATA_CSV)
+    except Exception:
+        return None
+
+
 class InstrumentDecorator:
     """Base decorator that forwards attribute access to the wrapped instrument.
 
@@ -31,6 +44,9 @@ class InstrumentDecorator:
 class VolatilityDecorator(InstrumentDecorator):
     """Compute simple volatility from `inputs/market_data.csv` for the instrument's symbol.
 
+    The file is loaded once into a shared MarketData partition (see
+    market_data.py) and reloaded only when it changes on disk.
+
     This is intentionally simple: we compute the standard deviation of
     simple returns (pct change) over the available data and return the
     (unannualized) std as `volatility`.
@@ -41,14 +57,13 @@ class VolatilityDecorator(InstrumentDecorator):
         self.window = window
 
     def _load_returns(self):
-        try:
-            df = pd.read_csv(MARKET_DATA_CSV, parse_dates=['timestamp'])
-        except Exception:
+        data = _load_market_data()
+        if data is None:
             return None
         sym = getattr(self._instrument, 'symbol', None)
         if sym is None:
             return None
-        s = df.loc[df['symbol'] == sym].sort_values('timestamp')
+        s = data.get(sym)
         if s.empty:
             return None
         returns = s['price'].pct_change().dropna()
@@ -71,38 +86,37 @@ class BetaDecorator(InstrumentDecorator):
     """Compute beta vs a market proxy (default 'SPY').
 
     Beta = cov(r_i, r_m) / var(r_m). Uses simple returns from data file.
+    The symbol is aligned as-of the market proxy's timestamps (see asof.py),
+    so asynchronous ticks are forward-filled rather than dropped; with
+    `tolerance` set, prices older than that count as missing.
     If market symbol not found or insufficient data, returns None.
     """
 
-    def __init__(self, instrument: Any, market_symbol: str = 'SPY', window: int = None):
+    def __init__(self, instrument: Any, market_symbol: str = 'SPY', window: int = None, tolerance=None):
         super().__init__(instrument)
         self.market_symbol = market_symbol
         self.window = window
+        self.tolerance = tolerance
 
     def _load_pair_returns(self):
-        try:
-            df = pd.read_csv(MARKET_DATA_CSV, parse_dates=['timestamp'])
-        except Exception:
+        data = _load_market_data()
+        if data is None:
             return None, None
         sym = getattr(self._instrument, 'symbol', None)
         if sym is None:
             return None, None
-        s = df.loc[df['symbol'] == sym].sort_values('timestamp')
-        m = df.loc[df['symbol'] == self.market_symbol].sort_values('timestamp')
-        if s.empty or m.empty:
+        if sym not in data or self.market_symbol not in data:
             return None, None
-        # align on timestamp by inner join
-        merged = pd.merge(s[['timestamp', 'price']], m[['timestamp', 'price']], on='timestamp', suffixes=('_s', '_m'))
-        if merged.empty:
+        # align on the market's clock, as of each market tick
+        aligned = data.align([sym, self.market_symbol], clock=self.market_symbol, tolerance=self.tolerance).dropna()
+        if len(aligned.timestamps) == 0:
             return None, None
-        r_s = merged['price_s'].pct_change().dropna()
-        r_m = merged['price_m'].pct_change().dropna()
+        r_s = pd.Series(aligned.values[:, 0]).pct_change().dropna()
+        r_m = pd.Series(aligned.values[:, 1]).pct_change().dropna()
         if self.window:
             r_s = r_s.tail(self.window)
             r_m = r_m.tail(self.window)
-        # keep equal lengths
-        n = min(len(r_s), len(r_m))
-        return r_s.tail(n), r_m.tail(n)
+        return r_s, r_m
 
     def get_metrics(self):
         metrics = super().get_metrics()
@@ -127,14 +141,13 @@ class DrawdownDecorator(InstrumentDecorator):
         super().__init__(instrument)
 
     def _load_prices(self):
-        try:
-            df = pd.read_csv(MARKET_DATA_CSV, parse_dates=['timestamp'])
-        except Exception:
+        data = _load_market_data()
+        if data is None:
             return None
         sym = getattr(self._instrument, 'symbol', None)
         if sym is None:
             return None
-        s = df.loc[df['symbol'] == sym].sort_values('timestamp')
+        s = data.get(sym)
         if s.empty:
             return None
         return s['price']
@@ -150,3 +163,29 @@ class DrawdownDecorator(InstrumentDecorator):
         max_dd = float(drawdowns.max())
         metrics['max_drawdown'] = max_dd
         return metrics
+
+
+class BootstrapDecorator(InstrumentDecorator):
+    """Confidence intervals for return, max drawdown and Sharpe from block-bootstrapped price paths.
+
+    Resamples the symbol's returns into `n_paths` paths (see monte_carlo.py)
+    and reports `bootstrap` as {metric: {'mean', 'p5', 'p50', 'p95'}}, next
+    to the point estimates of the other decorators.
+    """
+
+    def __init__(self, instrument: Any, n_paths: int = 1000, block_size: int = 20, seed: Optional[int] = None):
+        super().__init__(instrument)
+        self.n_paths = n_paths
+        self.block_size = block_size
+        self.seed = seed
+
+    def get_metrics(self):
+        metrics = super().get_metrics()
+        data = _load_market_data()
+        sym = getattr(self._instrument, 'symbol', None)
+        if data is None or sym is None or sym not in data or len(data.prices(sym)) < 3:
+            metrics['bootstrap'] = None
+            return metrics
+        engine = MonteCarloEngine(n_paths=self.n_paths, block_size=self.block_size, seed=self.seed)
+        metrics['bootstrap'] = engine.simulate(data.prices(sym))['intervals']
+        return metrics
@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+import hashlib
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from lazy_imports import lazy_import
+
+np = lazy_import('numpy')
+pd = lazy_import('pandas')
+
+# As-of alignment of several time series onto one clock.
+# For every clock time t a series contributes its last value at or before t
+# (searchsorted(side='right') - 1 on its sorted timestamps), optionally only
+# if that value is at most `tolerance` old; with ffill=False only a value
+# stamped exactly t counts. Missing values are NaN. One searchsorted per
+# series replaces a merge per pair, and asynchronous series keep their rows
+# instead of being cut down to the timestamps they happen to share.
+# MarketData.align caches alignments per (symbols, clock, tolerance, ffill).
+
+
+def to_ns_delta(tolerance) -> Optional[int]:
+    """Tolerance in nanoseconds from None, an int (ns), a Timedelta or a string like '2s'."""
+    if tolerance is None:
+        return None
+    ns = tolerance if isinstance(tolerance, (int, np.integer)) else pd.Timedelta(tolerance).value
+    if ns < 0:
+        raise ValueError("tolerance must not be negative")
+    return int(ns)
+
+
+def asof_indices(source_ns, clock_ns, tolerance=None, ffill: bool = True) -> np.ndarray:
+    """Index of the row of `source_ns` (sorted) each clock time takes its value from, -1 for none."""
+    source_ns = np.asarray(source_ns, dtype=np.int64)
+    clock_ns = np.asarray(clock_ns, dtype=np.int64)
+    idx = np.searchsorted(source_ns, clock_ns, side='right') - 1
+    found = idx >= 0
+    age = np.where(found, clock_ns - source_ns[np.maximum(idx, 0)], 0)
+    limit = 0 if not ffill else to_ns_delta(tolerance)
+    if limit is not None:
+        found &= age <= limit
+    return np.where(found, idx, -1)
+
+
+def asof_values(source_ns, values, clock_ns, tolerance=None, ffill: bool = True) -> np.ndarray:
+    """`values` (float) sampled as of each clock time, NaN where there is no usable value."""
+    idx = asof_indices(source_ns, clock_ns, tolerance, ffill)
+    values = np.asarray(values, dtype=np.float64)
+    out = np.full(len(idx), np.nan)
+    hit = idx >= 0
+    out[hit] = values[idx[hit]]
+    return out
+
+
+def union_clock(timestamps: Sequence) -> np.ndarray:
+    """Sorted union of several int64 timestamp arrays."""
+    arrays = [np.asarray(t, dtype=np.int64) for t in timestamps]
+    return np.unique(np.concatenate(arrays)) if arrays else np.array([], dtype=np.int64)
+
+
+def clock_key(clock_ns: np.ndarray) -> Tuple[int, str]:
+    """Cache key of an explicit clock array."""
+    clock_ns = np.ascontiguousarray(clock_ns, dtype=np.int64)
+    return len(clock_ns), hashlib.sha1(clock_ns.tobytes()).hexdigest()
+
+
+@dataclass(frozen=True)
+class Alignment:
+    """Series aligned onto one clock: values[i, j] is series j as of timestamps[i]."""
+    timestamps: np.ndarray  # int64 ns
+    names: Tuple[str, ...]
+    values: np.ndarray      # (len(timestamps), len(names)), NaN where missing
+
+    def column(self, name: str) -> np.ndarray:
+        return self.values[:, self.names.index(name)]
+
+    def complete(self) -> np.ndarray:
+        """Mask of clock rows where every series has a value."""
+        return ~np.isnan(self.values).any(axis=1)
+
+    def dropna(self) -> 'Alignment':
+        mask = self.complete()
+        return Alignment(self.timestamps[mask], self.names, self.values[mask])
+
+    def to_frame(self) -> pd.DataFrame:
+        frame = pd.DataFrame(self.values, columns=list(self.names))
+        frame.insert(0, 'timestamp', self.timestamps.view('datetime64[ns]'))
+        return frame
+
+
+def align_series(series: Dict[str, Tuple], clock=None, tolerance=None, ffill: bool = True) -> Alignment:
+    """Align {name: (timestamps_ns, values)} onto `clock` (default: union of all timestamps).
+
+    Works for any sources -- MarketData symbols, adapter snapshots, vendor
+    store columns -- as long as each series' timestamps are sorted.
+    """
+    names = list(series)
+    clock_ns = union_clock([series[n][0] for n in names]) if clock is None else np.asarray(clock, dtype=np.int64)
+    values = np.empty((len(clock_ns), len(names)))
+    for j, name in enumerate(names):
+        source_ns, source_values = series[name]
+        values[:, j] = asof_values(source_ns, source_values, clock_ns, tolerance, ffill)
+    return Alignment(clock_ns, tuple(names), values)
+
+
+def points_to_series(points) -> Dict[str, Tuple[np.ndarray, np.ndarray]]:
+    """{symbol: (timestamps_ns, prices)} from MarketDataPoints, e.g. adapter snapshots."""
+    grouped: Dict[str, List] = {}
+    for point in points:
+        ts = pd.Timestamp(point.timestamp)
+        if ts.tzinfo is not None:
+            ts = ts.tz_convert('UTC').tz_localize(None)
+        grouped.setdefault(point.symbol, []).append((ts.as_unit('ns').value, float(point.price)))
+    series = {}
+    for symbol, rows in grouped.items():
+        rows.sort()
+        series[symbol] = (np.array([r[0] for r in rows], dtype=np.int64), np.array([r[1] for r in rows]))
+    return series
@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+from typing import Dict, Optional
+
+from lazy_imports import lazy_import
+
+np = lazy_import('numpy')
+pd = lazy_import('pandas')
+
+# Tick-to-bar resampling.
+# Ticks of one symbol are already sorted by time (see market_data.py), so
+# each bar is a contiguous run of rows: bucket = timestamp // bar length,
+# and a bar starts wherever the bucket changes. OHLCV then comes from one
+# pass of ufunc.reduceat over those start offsets (max / min / add) plus
+# fancy indexing for open and close -- no groupby, no Python per bar.
+# Buckets are aligned to the epoch, so bars are labelled with the start of
+# their interval like DataFrame.resample(freq), and empty intervals produce
+# no bar. Without a `volume` column, volume is the number of ticks.
+
+BAR_COLUMNS = ('timestamp', 'open', 'high', 'low', 'close', 'volume', 'ticks')
+
+
+def freq_to_ns(freq) -> int:
+    """Bar length in nanoseconds from a pandas offset string ('5min', '1h', '1D') or Timedelta."""
+    ns = pd.Timedelta(freq).value
+    if ns <= 0:
+        raise ValueError(f"Bar frequency must be positive, got {freq!r}")
+    return int(ns)
+
+
+def resample_ohlcv(timestamps_ns, prices, freq, volumes=None) -> Dict[str, np.ndarray]:
+    """OHLCV bars of one symbol's time-sorted ticks, as a dict of arrays (see BAR_COLUMNS)."""
+    timestamps_ns = np.asarray(timestamps_ns, dtype=np.int64)
+    prices = np.asarray(prices, dtype=np.float64)
+    if len(prices) == 0:
+        return {name: np.array([], dtype=np.int64 if name in ('timestamp', 'ticks') else np.float64)
+                for name in BAR_COLUMNS}
+    bar_ns = freq_to_ns(freq)
+    buckets = timestamps_ns // bar_ns
+    starts = np.flatnonzero(np.r_[True, buckets[1:] != buckets[:-1]])
+    ends = np.r_[starts[1:], len(prices)]
+    ticks = ends - starts
+    if volumes is None:
+        volume = ticks.astype(np.float64)
+    else:
+        volume = np.add.reduceat(np.asarray(volumes, dtype=np.float64), starts)
+    return {
+        'timestamp': buckets[starts] * bar_ns,
+        'open': prices[starts],
+        'high': np.maximum.reduceat(prices, starts),
+        'low': np.minimum.reduceat(prices, starts),
+        'close': prices[ends - 1],
+        'volume': volume,
+        'ticks': ticks,
+    }
+
+
+def bars_frame(symbol: str, bars: Dict[str, np.ndarray]) -> pd.DataFrame:
+    """Long-format bar frame; `price` is the close, so the engine can backtest it like ticks."""
+    return pd.DataFrame({
+        'timestamp': bars['timestamp'].view('datetime64[ns]'),
+        'symbol': symbol,
+        'price': bars['close'],
+        'open': bars['open'],
+        'high': bars['high'],
+        'low': bars['low'],
+        'close': bars['close'],
+        'volume': bars['volume'],
+        'ticks': bars['ticks'],
+    })
+
@@ -0,0 +1,355 @@
+import argparse
+import contextlib
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+import psutil
+
+# Ensure project root is importable when running benchmarks
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+import Decorator_Analytics
+from Adapter_DataLoader import YahooFinanceAdapter, BloombergXMLAdapter
+from Decorator_Analytics import VolatilityDecorator, BetaDecorator, DrawdownDecorator
+from engine import BacktestEngine
+from models import MarketDataPoint
+from patterns.Composite_PortModel import Position, PortfolioGroup
+from patterns.Factory_InstrumentTypes import Stock
+from patterns.Strategy_SignalGen import MeanReversionStrategy, BreakoutStrategy
+
+from benchmarks.synthetic_data import generate_market_data, write_market_data_csv, write_adapter_inputs
+
+# Benchmark suite for the engine, strategies, analytics and adapters.
+# Usage:
+#   python benchmarks/run_benchmarks.py --symbols 5 --ticks 10000
+#   python benchmarks/run_benchmarks.py --save-baseline
+#   python benchmarks/run_benchmarks.py --fail-on-regression
+# Each benchmark reports the best and median wall time over `--repeat` runs,
+# ticks/sec for the work it processed and the peak RSS of the process while
+# it ran. Results are compared against `benchmarks/baseline.json` if present.
+# The baseline is machine specific and not committed: record one with
+# --save-baseline on the machine that runs the checks. --fail-on-regression
+# without a baseline is an error rather than a silent pass.
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_BASELINE = os.path.join(BENCH_DIR, 'baseline.json')
+DEFAULT_OUTPUT = os.path.join(BENCH_DIR, 'results.json')
+
+
+class PeakRSSSampler:
+    """Samples the process RSS on a background thread and keeps the maximum."""
+
+    def __init__(self, interval: float = 0.005):
+        self.interval = interval
+        self.process = psutil.Process()
+        self.peak = 0
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _sample(self):
+        rss = self.process.memory_info().rss
+        if rss > self.peak:
+            self.peak = rss
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self._sample()
+
+    def __enter__(self):
+        self.peak = 0
+        self._sample()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+        self._sample()
+        return False
+
+
+class BenchmarkContext:
+    """Synthetic inputs shared by every benchmark in one suite run."""
+
+    def __init__(self, n_symbols: int, n_ticks: int, seed: int, workdir: str):
+        self.n_symbols = n_symbols
+        self.n_ticks = n_ticks
+        self.seed = seed
+        self.workdir = workdir
+
+        self.df = generate_market_data(n_symbols=n_symbols, n_ticks=n_ticks, seed=seed)
+        self.symbols = list(self.df['symbol'].unique())
+        # Benchmark a non-market symbol when there is one, SPY otherwise
+        self.symbol = self.symbols[1] if len(self.symbols) > 1 else self.symbols[0]
+
+        self.csv_path = os.path.join(workdir, 'market_data.csv')
+        write_market_data_csv(self.df, self.csv_path)
+
+        last_prices = self.df.groupby('symbol', sort=False)['price'].last()
+        write_adapter_inputs(workdir, self.symbols, [float(last_prices[s]) for s in self.symbols])
+
+        symbol_rows = self.df[self.df['symbol'] == self.symbol]
+        self.ticks = [
+            MarketDataPoint(timestamp=ts, symbol=self.symbol, price=float(p))
+            for ts, p in zip(symbol_rows['timestamp'], symbol_rows['price'])
+        ]
+
+
+def time_runs(fn: Callable[[], None], repeat: int, setup: Optional[Callable[[], None]] = None) -> List[float]:
+    """Run `fn` `repeat` times and return the wall time of each run."""
+    timings = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+# Benchmarks
+# Each returns (setup, fn, work) where `work` is the number of ticks (or rows)
+# processed by one call of `fn`.
+
+def bench_backtest_strategy(ctx: BenchmarkContext, strategy_cls):
+    state = {}
+
+    def setup():
+        state['engine'] = BacktestEngine(initial_capital=100000)
+        state['strategy'] = strategy_cls()
+
+    def run():
+        state['engine'].backtest_strategy(state['strategy'], ctx.symbol, ctx.df)
+
+    return setup, run, ctx.n_ticks
+
+
+def bench_generate_signals(ctx: BenchmarkContext, strategy_cls):
+    state = {}
+
+    def setup():
+        state['strategy'] = strategy_cls()
+
+    def run():
+        generate = state['strategy'].generate_signals
+        for tick in ctx.ticks:
+            generate(tick)
+
+    return setup, run, len(ctx.ticks)
+
+
+def bench_calculate_portfolio_value(ctx: BenchmarkContext, n_calls: int = 50):
+    engine = BacktestEngine(initial_capital=1e12)
+    first_ts = ctx.df['timestamp'].iloc[0]
+    for symbol in ctx.symbols:
+        engine.execute_trade(first_ts, symbol, 'BUY', 1.0, quantity=10)
+    timestamps = ctx.df['timestamp'].drop_duplicates()
+    step = max(len(timestamps) // n_calls, 1)
+    sampled = list(timestamps.iloc[::step][:n_calls])
+
+    def run():
+        for ts in sampled:
+            engine.calculate_portfolio_value(ctx.df, ts)
+
+    return None, run, len(sampled)
+
+
+def bench_decorator(ctx: BenchmarkContext, decorator_cls):
+    instrument = Stock({'symbol': ctx.symbol, 'price': '100', 'type': 'stock'})
+    decorated = decorator_cls(instrument)
+
+    def run():
+        decorated.get_metrics()
+
+    return None, run, len(ctx.df)
+
+
+def bench_composite_get_value(ctx: BenchmarkContext, n_groups: int = 100, n_calls: int = 100):
+    root = PortfolioGroup('root')
+    for g in range(n_groups):
+        group = PortfolioGroup(f'group_{g}')
+        for i, symbol in enumerate(ctx.symbols):
+            group.add(Position(symbol=symbol, quantity=10 + i, price=100.0 + g))
+        root.add(group)
+    n_leaves = n_groups * len(ctx.symbols)
+
+    def run():
+        for _ in range(n_calls):
+            root.get_value()
+
+    return None, run, n_leaves * n_calls
+
+
+def bench_adapter(ctx: BenchmarkContext, adapter_cls, n_loads: int = 20):
+    symbols = ctx.symbols
+
+    def run():
+        for _ in range(n_loads):
+            adapter = adapter_cls()
+            for symbol in symbols:
+                adapter.get_data(symbol)
+
+    return None, run, n_loads * len(symbols)
+
+
+BENCHMARKS: Dict[str, Callable] = {
+    'backtest_strategy.MeanReversionStrategy': lambda ctx: bench_backtest_strategy(ctx, MeanReversionStrategy),
+    'backtest_strategy.BreakoutStrategy': lambda ctx: bench_backtest_strategy(ctx, BreakoutStrategy),
+    'generate_signals.MeanReversionStrategy': lambda ctx: bench_generate_signals(ctx, MeanReversionStrategy),
+    'generate_signals.BreakoutStrategy': lambda ctx: bench_generate_signals(ctx, BreakoutStrategy),
+    'calculate_portfolio_value': bench_calculate_portfolio_value,
+    'decorator.VolatilityDecorator': lambda ctx: bench_decorator(ctx, VolatilityDecorator),
+    'decorator.BetaDecorator': lambda ctx: bench_decorator(ctx, BetaDecorator),
+    'decorator.DrawdownDecorator': lambda ctx: bench_decorator(ctx, DrawdownDecorator),
+    'composite.get_value': bench_composite_get_value,
+    'adapter.YahooFinanceAdapter': lambda ctx: bench_adapter(ctx, YahooFinanceAdapter),
+    'adapter.BloombergXMLAdapter': lambda ctx: bench_adapter(ctx, BloombergXMLAdapter),
+}
+
+
+def run_suite(n_symbols: int = 5, n_ticks: int = 10000, repeat: int = 3, seed: int = 42,
+              only: Optional[List[str]] = None) -> Dict:
+    """Run the benchmark suite on freshly generated synthetic data."""
+    names = [name for name in BENCHMARKS if not only or any(name.startswith(o) for o in only)]
+    results = {}
+    cwd = os.getcwd()
+    original_csv = Decorator_Analytics.MARKET_DATA_CSV
+
+    with tempfile.TemporaryDirectory() as workdir:
+        ctx = BenchmarkContext(n_symbols, n_ticks, seed, workdir)
+        # Decorators read MARKET_DATA_CSV, adapters read from ./inputs/
+        Decorator_Analytics.MARKET_DATA_CSV = ctx.csv_path
+        os.chdir(workdir)
+        try:
+            with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+                for name in names:
+                    setup, run, work = BENCHMARKS[name](ctx)
+                    sampler = PeakRSSSampler()
+                    with sampler:
+                        timings = time_runs(run, repeat, setup)
+                    best = min(timings)
+                    results[name] = {
+                        'seconds': best,
+                        'median_seconds': statistics.median(timings),
+                        'work': work,
+                        'ticks_per_sec': work / best if best > 0 else None,
+                        'peak_rss_mb': sampler.peak / (1024 * 1024),
+                    }
+        finally:
+            os.chdir(cwd)
+            Decorator_Analytics.MARKET_DATA_CSV = original_csv
+
+    return {
+        'meta': {
+            'n_symbols': n_symbols,
+            'n_ticks': n_ticks,
+            'repeat': repeat,
+            'seed': seed,
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'created': datetime.now().isoformat(timespec='seconds'),
+        },
+        'results': results,
+    }
+
+
+def compare_to_baseline(report: Dict, baseline: Dict, tolerance: float = 0.2) -> Dict:
+    """Compare best times against a baseline report.
+
+    A benchmark regresses when it is more than `tolerance` slower than the
+    baseline. Benchmarks missing from either side are skipped.
+    """
+    comparison = {}
+    base_results = baseline.get('results', {})
+    for name, result in report['results'].items():
+        base = base_results.get(name)
+        if not base or not base.get('seconds'):
+            continue
+        ratio = result['seconds'] / base['seconds']
+        comparison[name] = {
+            'baseline_seconds': base['seconds'],
+            'seconds': result['seconds'],
+            'ratio': ratio,
+            'regression': ratio > 1 + tolerance,
+        }
+    if baseline.get('meta', {}).get('n_ticks') != report['meta']['n_ticks'] or \
+            baseline.get('meta', {}).get('n_symbols') != report['meta']['n_symbols']:
+        print("WARNING: baseline was recorded with a different data size, ratios are not comparable")
+    return comparison
+
+
+def print_report(report: Dict):
+    print(f"\n{'='*96}")
+    meta = report['meta']
+    print(f"Benchmarks: {meta['n_symbols']} symbols x {meta['n_ticks']} ticks, best of {meta['repeat']}")
+    print(f"{'='*96}")
+    print(f"{'benchmark':<44}{'best (s)':>12}{'ticks/sec':>16}{'peak RSS (MB)':>15}{'vs base':>9}")
+    comparison = report.get('comparison', {})
+    for name, result in report['results'].items():
+        vs = comparison.get(name)
+        vs_text = f"{vs['ratio']:.2f}x" if vs else '-'
+        if vs and vs['regression']:
+            vs_text += '!'
+        print(f"{name:<44}{result['seconds']:>12.4f}{result['ticks_per_sec']:>16,.0f}"
+              f"{result['peak_rss_mb']:>15.1f}{vs_text:>9}")
+    print(f"{'-'*96}\n")
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Run the backtest benchmark suite.")
+    parser.add_argument('--symbols', type=int, default=5, help="number of synthetic symbols")
+    parser.add_argument('--ticks', type=int, default=10000, help="ticks per symbol")
+    parser.add_argument('--repeat', type=int, default=3, help="timed runs per benchmark")
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--only', nargs='*', help="run benchmarks whose name starts with any of these")
+    parser.add_argument('--output', default=DEFAULT_OUTPUT, help="where to write the JSON report")
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE, help="baseline JSON to compare against")
+    parser.add_argument('--save-baseline', action='store_true', help="store this run as the new baseline")
+    parser.add_argument('--tolerance', type=float, default=0.2, help="allowed slowdown before flagging a regression")
+    parser.add_argument('--fail-on-regression', action='store_true', help="exit with status 1 on regressions")
+    args = parser.parse_args(argv)
+    has_baseline = os.path.exists(args.baseline)
+    if args.fail_on_regression and not has_baseline and not args.save_baseline:
+        parser.error(f"--fail-on-regression needs a baseline, but {args.baseline} does not exist; "
+                     f"record one first with --save-baseline")
+
+    report = run_suite(n_symbols=args.symbols, n_ticks=args.ticks, repeat=args.repeat,
+                       seed=args.seed, only=args.only)
+
+    if not has_baseline and not args.save_baseline:
+        print(f"No baseline at {args.baseline}; not checking for regressions (record one with --save-baseline)")
+    elif has_baseline and not args.save_baseline:
+        with open(args.baseline, 'r') as f:
+            baseline = json.load(f)
+        report['comparison'] = compare_to_baseline(report, baseline, args.tolerance)
+
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=2)
+    if args.save_baseline:
+        with open(args.baseline, 'w') as f:
+            json.dump(report, f, indent=2)
+
+    print_report(report)
+
+    regressions = [name for name, c in report.get('comparison', {}).items() if c['regression']]
+    if regressions:
+        print(f"Regressions: {', '.join(regressions)}")
+        if args.fail_on_regression:
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
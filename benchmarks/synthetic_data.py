@@ -0,0 +1,72 @@
+import json
+import os
+from typing import List
+
+import numpy as np
+import pandas as pd
+
+# Synthetic market data for the benchmark suite.
+# Prices follow a geometric random walk per symbol so the strategies produce
+# a realistic mix of BUY / SELL / NO ACTION signals. Everything is seeded,
+# so the same (n_symbols, n_ticks, seed) always produces the same frame.
+
+
+def make_symbols(n_symbols: int) -> List[str]:
+    """Return `n_symbols` ticker names, always including SPY as the market proxy."""
+    symbols = ['SPY']
+    i = 0
+    while len(symbols) < n_symbols:
+        symbols.append(f"SYM{i:04d}")
+        i += 1
+    return symbols[:max(n_symbols, 1)]
+
+
+def generate_market_data(n_symbols: int = 5, n_ticks: int = 10000, seed: int = 42,
+                         start: str = '2025-01-01 09:30:00', freq: str = 's') -> pd.DataFrame:
+    """Generate a long-format frame with `timestamp`, `symbol` and `price` columns.
+
+    Every symbol gets `n_ticks` ticks on the same clock, so the frame has
+    `n_symbols * n_ticks` rows in timestamp order, like `inputs/market_data.csv`.
+    """
+    rng = np.random.default_rng(seed)
+    symbols = make_symbols(n_symbols)
+    timestamps = pd.date_range(start=start, periods=n_ticks, freq=freq)
+
+    start_prices = rng.uniform(20.0, 500.0, size=len(symbols))
+    log_returns = rng.normal(0.0, 0.002, size=(n_ticks, len(symbols)))
+    prices = start_prices * np.exp(np.cumsum(log_returns, axis=0))
+
+    return pd.DataFrame({
+        'timestamp': np.repeat(timestamps.values, len(symbols)),
+        'symbol': np.tile(np.array(symbols, dtype=object), n_ticks),
+        'price': np.round(prices.reshape(-1), 4),
+    })
+
+
+def write_market_data_csv(df: pd.DataFrame, filepath: str):
+    """Write a synthetic frame in the same layout as `inputs/market_data.csv`."""
+    df.to_csv(filepath, index=False)
+
+
+def write_adapter_inputs(directory: str, symbols: List[str], prices: List[float]):
+    """Write vendor files the adapters can read from `<directory>/inputs/`."""
+    inputs_dir = os.path.join(directory, 'inputs')
+    os.makedirs(inputs_dir, exist_ok=True)
+
+    with open(os.path.join(inputs_dir, 'external_data_yahoo.json'), 'w') as f:
+        json.dump({
+            'ticker': symbols[0],
+            'last_price': float(prices[0]),
+            'timestamp': '2025-10-01T09:30:00Z'
+        }, f)
+
+    lines = ['<instruments>']
+    for symbol, price in zip(symbols, prices):
+        lines.append('  <instrument>')
+        lines.append(f'    <symbol>{symbol}</symbol>')
+        lines.append(f'    <price>{price:.2f}</price>')
+        lines.append('    <timestamp>2025-10-01T09:30:00Z</timestamp>')
+        lines.append('  </instrument>')
+    lines.append('</instruments>')
+    with open(os.path.join(inputs_dir, 'external_data_bloomberg.xml'), 'w') as f:
+        f.write('\n'.join(lines))
@@ -0,0 +1,263 @@
+from __future__ import annotations
+
+import json
+import os
+from datetime import date
+from typing import Dict, List, Optional, Tuple
+
+from lazy_imports import lazy_import
+from equity_curve import EquityCurve, to_ns
+
+np = lazy_import('numpy')
+pd = lazy_import('pandas')
+
+# Binary checkpoints of a running backtest (engine + strategy state).
+# Every `interval` ticks the engine writes one .npz file (uncompressed NumPy
+# arrays, no pickle) into the checkpoint directory:
+#   header   small JSON blob: symbol, strategy, tick index, cash, curve scalars
+#   state    positions, per-symbol marks, strategy price history and, with
+#            a FillSimulator attached, its resting orders and daily volume
+#            used, as arrays
+#   delta    trades, equity-curve points and sampled equity appended since the
+#            previous checkpoint
+# Only the delta is written, so a checkpoint costs O(interval) rather than
+# O(run length). Resuming restores the state of the latest checkpoint and
+# concatenates the deltas of every checkpoint up to it. Files are written to a
+# temporary name and renamed, so a crash mid-write leaves the previous
+# checkpoint intact.
+
+FORMAT_VERSION = 2
+_PREFIX = 'checkpoint_'
+_SIDES = {'BUY': 1, 'SELL': -1}
+_ACTIONS = {1: 'BUY', -1: 'SELL'}
+
+
+class Checkpointer:
+    """Writes and restores periodic checkpoints of one backtest run."""
+
+    def __init__(self, directory: str, interval: int = 10000):
+        if interval <= 0:
+            raise ValueError("Checkpoint interval must be positive")
+        self.directory = directory
+        self.interval = int(interval)
+        os.makedirs(directory, exist_ok=True)
+        # How much of the engine's trades / curve / samples is already on disk
+        self._written = (0, 0, 0)
+        # Curve size and traded notional when the checkpointed run started
+        self.run_start = (0, 0.0)
+
+    # Files
+
+    def path_for(self, tick_index: int) -> str:
+        return os.path.join(self.directory, f"{_PREFIX}{tick_index:012d}.npz")
+
+    def checkpoints(self) -> List[Tuple[int, str]]:
+        """(tick_index, path) of every complete checkpoint, oldest first."""
+        found = []
+        for name in os.listdir(self.directory):
+            if name.startswith(_PREFIX) and name.endswith('.npz'):
+                found.append((int(name[len(_PREFIX):-4]), os.path.join(self.directory, name)))
+        return sorted(found)
+
+    def latest(self) -> Optional[int]:
+        """Tick index of the latest checkpoint, or None."""
+        found = self.checkpoints()
+        return found[-1][0] if found else None
+
+    def clear(self):
+        """Remove all checkpoints, e.g. when a run starts from the beginning."""
+        for _, path in self.checkpoints():
+            os.remove(path)
+        self._written = (0, 0, 0)
+
+    def begin(self, engine, start_index: int):
+        """Called by the engine when a run starts; a fresh run discards old checkpoints."""
+        if start_index == 0:
+            self.clear()
+            self.run_start = (engine.curve.size, engine.curve.traded_notional)
+
+    # Writing
+
+    def save(self, engine, strategy, symbol: str, tick_index: int) -> str:
+        """Write a checkpoint of `engine` and `strategy` after `tick_index` ticks of `symbol`."""
+        n_trades, n_points, n_samples = self._written
+        curve = engine.curve
+        symbols: Dict[str, int] = {}
+
+        def code(s):
+            return symbols.setdefault(s, len(symbols))
+
+        trades = engine.trades[n_trades:]
+        positions = engine.positions
+        history = strategy.get_state()
+        lengths = [len(prices) for prices in history.values()]
+        samples = engine.equity_curve[n_samples:]
+        simulator = engine.fill_simulator
+        fills = simulator.get_state() if simulator is not None else {'orders': [], 'books': {}}
+        orders = fills['orders']
+        books = fills['books']
+
+        arrays = {
+            'trade_ts': np.array([to_ns(t.timestamp) for t in trades], dtype=np.int64),
+            'trade_symbol': np.array([code(t.symbol) for t in trades], dtype=np.int32),
+            'trade_side': np.array([_SIDES[t.action] for t in trades], dtype=np.int8),
+            'trade_price': np.array([t.price for t in trades], dtype=np.float64),
+            'trade_quantity': np.array([t.quantity for t in trades], dtype=np.int64),
+            'trade_cost': np.array([t.cost for t in trades], dtype=np.float64),
+            'curve_ts': np.array(curve.get_timestamps(n_points).view(np.int64)),
+            'curve_values': np.array(curve.get_values(n_points)),
+            'sample_ts': np.array([to_ns(ts) for ts, _ in samples], dtype=np.int64),
+            'sample_values': np.array([value for _, value in samples], dtype=np.float64),
+            'position_symbol': np.array([code(s) for s in positions], dtype=np.int32),
+            'position_quantity': np.array([p.quantity for p in positions.values()], dtype=np.int64),
+            'position_avg_cost': np.array([p.avg_cost for p in positions.values()], dtype=np.float64),
+            'position_total_cost': np.array([p.total_cost for p in positions.values()], dtype=np.float64),
+            'mark_symbol': np.array([code(s) for s in curve.quantities], dtype=np.int32),
+            'mark_quantity': np.array(list(curve.quantities.values()), dtype=np.int64),
+            'last_price_symbol': np.array([code(s) for s in curve.last_prices], dtype=np.int32),
+            'last_price': np.array(list(curve.last_prices.values()), dtype=np.float64),
+            'history_symbol': np.array([code(s) for s in history], dtype=np.int32),
+            'history_offsets': np.cumsum([0] + lengths, dtype=np.int64),
+            'history_prices': np.array([p for prices in history.values() for p in prices], dtype=np.float64),
+            'order_id': np.array([o[0] for o in orders], dtype=np.int64),
+            'order_symbol': np.array([code(o[1]) for o in orders], dtype=np.int32),
+            'order_side': np.array([o[2] for o in orders], dtype=np.int8),
+            'order_quantity': np.array([o[3] for o in orders], dtype=np.int64),
+            'order_remaining': np.array([o[4] for o in orders], dtype=np.int64),
+            'order_limit': np.array([np.nan if o[5] is None else o[5] for o in orders], dtype=np.float64),
+            'order_ts': np.array([to_ns(o[6]) for o in orders], dtype=np.int64),
+            'book_symbol': np.array([code(s) for s in books], dtype=np.int32),
+            'book_day': np.array([-1 if day is None else day.toordinal() for day, _ in books.values()], dtype=np.int64),
+            'book_filled': np.array([filled for _, filled in books.values()], dtype=np.int64),
+        }
+        header = {
+            'version': FORMAT_VERSION,
+            'symbol': symbol,
+            'strategy': strategy.__class__.__name__,
+            'tick_index': int(tick_index),
+            'initial_capital': engine.initial_capital,
+            'cash': engine.cash,
+            'market_value': curve.market_value,
+            'traded_notional': curve.traded_notional,
+            'totals': [len(engine.trades), curve.size, len(engine.equity_curve)],
+            'run_start': list(self.run_start),
+            'fill_simulator': {'seq': fills['seq'], 'totals': list(fills['totals'])} if simulator is not None else None,
+            'symbols': list(symbols),
+        }
+        arrays['header'] = np.frombuffer(json.dumps(header).encode(), dtype=np.uint8)
+
+        path = self.path_for(tick_index)
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            np.savez(f, **arrays)
+        os.replace(tmp_path, path)
+        self._written = tuple(header['totals'])
+        return path
+
+    # Reading
+
+    @staticmethod
+    def read(path: str) -> Tuple[Dict, Dict]:
+        """(header, arrays) of one checkpoint file."""
+        with np.load(path, allow_pickle=False) as f:
+            arrays = {name: f[name] for name in f.files}
+        header = json.loads(arrays.pop('header').tobytes().decode())
+        if header.get('version') != FORMAT_VERSION:
+            raise ValueError(f"Unsupported checkpoint version in {path}: {header.get('version')}")
+        return header, arrays
+
+    def restore(self, engine, strategy, symbol: str, tick_index: Optional[int] = None) -> int:
+        """Load the latest (or given) checkpoint into a fresh engine and strategy.
+
+        Returns the tick index to resume from (0 when there is no checkpoint).
+        Raises ValueError if the checkpoint belongs to another symbol or strategy,
+        or was written with a FillSimulator and the engine has none (or vice versa).
+        """
+        found = [(t, p) for t, p in self.checkpoints() if tick_index is None or t <= tick_index]
+        if not found:
+            self._written = (0, 0, 0)
+            return 0
+        parts = [self.read(path) for _, path in found]
+        header, last = parts[-1]
+        if header['symbol'] != symbol or header['strategy'] != strategy.__class__.__name__:
+            raise ValueError(
+                f"Checkpoint in {self.directory} is for {header['strategy']} on {header['symbol']}, "
+                f"not {strategy.__class__.__name__} on {symbol}"
+            )
+        simulator = engine.fill_simulator
+        if (header['fill_simulator'] is None) != (simulator is None):
+            raise ValueError(
+                f"Checkpoint in {self.directory} was written "
+                f"{'without' if header['fill_simulator'] is None else 'with'} fill simulation; "
+                f"enable or disable it on the engine to match"
+            )
+
+        def joined(name):
+            return np.concatenate([arrays[name] for _, arrays in parts])
+
+        trades = []
+        for part_header, arrays in parts:
+            names = part_header['symbols']
+            trades.extend(
+                [ts, names[c], _ACTIONS[side], price, quantity, cost]
+                for ts, c, side, price, quantity, cost in zip(
+                    arrays['trade_ts'].tolist(), arrays['trade_symbol'].tolist(),
+                    arrays['trade_side'].tolist(), arrays['trade_price'].tolist(),
+                    arrays['trade_quantity'].tolist(), arrays['trade_cost'].tolist())
+            )
+
+        names = header['symbols']
+        engine.curve = EquityCurve()
+        engine.restore_state({
+            'initial_capital': header['initial_capital'],
+            'cash': header['cash'],
+            'positions': {
+                names[c]: [q, avg, total]
+                for c, q, avg, total in zip(last['position_symbol'].tolist(), last['position_quantity'].tolist(),
+                                            last['position_avg_cost'].tolist(), last['position_total_cost'].tolist())
+            },
+            'trades': trades,
+            'curve': {
+                'quantities': dict(zip([names[c] for c in last['mark_symbol'].tolist()], last['mark_quantity'].tolist())),
+                'last_prices': dict(zip([names[c] for c in last['last_price_symbol'].tolist()], last['last_price'].tolist())),
+                'market_value': header['market_value'],
+                'traded_notional': header['traded_notional'],
+            },
+        })
+        engine.curve.extend(joined('curve_ts'), joined('curve_values'))
+        engine.equity_curve = [
+            (pd.Timestamp(ts), value)
+            for ts, value in zip(joined('sample_ts').tolist(), joined('sample_values').tolist())
+        ]
+
+        offsets = last['history_offsets']
+        prices = last['history_prices'].tolist()
+        strategy.set_state({
+            names[c]: prices[offsets[i]:offsets[i + 1]]
+            for i, c in enumerate(last['history_symbol'].tolist())
+        })
+
+        if simulator is not None:
+            simulator.restore_state({
+                'seq': header['fill_simulator']['seq'],
+                'totals': header['fill_simulator']['totals'],
+                'orders': [
+                    (order_id, names[c], side, quantity, remaining, None if limit != limit else limit, pd.Timestamp(ts))
+                    for order_id, c, side, quantity, remaining, limit, ts in zip(
+                        last['order_id'].tolist(), last['order_symbol'].tolist(), last['order_side'].tolist(),
+                        last['order_quantity'].tolist(), last['order_remaining'].tolist(),
+                        last['order_limit'].tolist(), last['order_ts'].tolist())
+                ],
+                'books': {
+                    names[c]: (None if day < 0 else date.fromordinal(day), filled)
+                    for c, day, filled in zip(last['book_symbol'].tolist(), last['book_day'].tolist(),
+                                              last['book_filled'].tolist())
+                },
+            })
+
+        totals = (len(engine.trades), engine.curve.size, len(engine.equity_curve))
+        if list(totals) != header['totals']:
+            raise ValueError(f"Checkpoints in {self.directory} are incomplete: expected {header['totals']}, got {list(totals)}")
+        self._written = totals
+        self.run_start = tuple(header['run_start'])
+        return header['tick_index']
@@ -0,0 +1,182 @@
+import queue
+import threading
+from typing import Dict, Iterable, Iterator, Optional, Sequence
+
+from engine import BacktestEngine
+from market_data import MarketData
+from models import MarketDataPoint
+from patterns.Strategy_SignalGen import Strategy
+
+# Engine variant that can be fed from several threads at once (live feeds,
+# adapter threads, an asyncio loop handing work to a pool, ...).
+#   - Signal generation runs on the feeding thread under a per-symbol lock,
+#     so different symbols are processed in parallel while ticks of one
+#     symbol reach the strategy in order.
+#   - Everything that touches the book (cash, positions, trades, the equity
+#     curve) is applied by a single writer thread that drains an order queue.
+#     Feeding threads never mutate the book, so no cash or position update
+#     can interleave with another.
+# The queue is bounded, so fast feeds block instead of growing it without
+# limit. Readers use snapshot(), which waits for the writer to finish the
+# event it is applying.
+
+_TICK = 'TICK'
+_ORDER = 'ORDER'
+_STOP = object()
+
+
+class ConcurrentEngine(BacktestEngine):
+    """BacktestEngine with sharded signal generation and a single-writer order queue."""
+
+    def __init__(self, strategy: Strategy, initial_capital: float = 100000, quantity: int = 1,
+                 max_pending: int = 10000, use_command_pattern: bool = False):
+        super().__init__(initial_capital=initial_capital, instrumentation=None)
+        self.strategy = strategy
+        self.quantity = quantity
+        self.use_command_pattern = use_command_pattern
+        self.ticks_processed = 0
+
+        self._events: queue.Queue = queue.Queue(maxsize=max_pending)
+        self._symbol_locks: Dict[str, threading.Lock] = {}
+        self._guard = threading.Lock()       # creation of symbol locks, start/stop
+        self._book_lock = threading.Lock()   # held by the writer while applying an event
+        self._writer: Optional[threading.Thread] = None
+        self._error: Optional[BaseException] = None
+
+    # Lifecycle
+
+    def start(self):
+        """Start the writer thread (called automatically on the first tick or order)."""
+        with self._guard:
+            if self._writer is None:
+                self._writer = threading.Thread(target=self._write_loop, name='engine-writer', daemon=True)
+                self._writer.start()
+
+    def flush(self):
+        """Block until every queued event has been applied; re-raise a writer error."""
+        if self._writer is not None:
+            self._events.join()
+        if self._error is not None:
+            error, self._error = self._error, None
+            raise error
+
+    def stop(self):
+        """Apply the remaining events and stop the writer thread."""
+        with self._guard:
+            writer, self._writer = self._writer, None
+        if writer is not None:
+            self._events.put(_STOP)
+            writer.join()
+        if self._error is not None:
+            error, self._error = self._error, None
+            raise error
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.stop()
+        return False
+
+    # Feeding (any thread)
+
+    def symbol_lock(self, symbol: str) -> threading.Lock:
+        lock = self._symbol_locks.get(symbol)
+        if lock is None:
+            with self._guard:
+                lock = self._symbol_locks.setdefault(symbol, threading.Lock())
+        return lock
+
+    def on_tick(self, tick: MarketDataPoint) -> int:
+        """Run the strategy on `tick` and queue the mark (and any order) for the writer."""
+        if self._writer is None:
+            self.start()
+        with self.symbol_lock(tick.symbol):
+            signal = self.strategy.generate_signals(tick)
+            action = 'BUY' if signal == 1 else 'SELL' if signal == -1 else None
+            # Queued under the symbol lock, so events of one symbol stay in tick order
+            self._events.put((_TICK, tick.timestamp, tick.symbol, tick.price, action, self.quantity))
+        return signal
+
+    def submit_order(self, timestamp, symbol: str, action: str, price: float, quantity: int = 1):
+        """Queue an order that did not come from the strategy (e.g. a manual fill)."""
+        if action not in ('BUY', 'SELL'):
+            raise ValueError(f"Unknown action: {action}")
+        if self._writer is None:
+            self.start()
+        with self.symbol_lock(symbol):
+            self._events.put((_ORDER, timestamp, symbol, price, action, quantity))
+
+    def run_feeds(self, feeds: Sequence[Iterable[MarketDataPoint]]) -> dict:
+        """Feed each iterable of ticks from its own thread, wait for all of them and return a snapshot."""
+        errors = []
+
+        def consume(feed):
+            try:
+                for tick in feed:
+                    self.on_tick(tick)
+            except BaseException as e:
+                errors.append(e)
+
+        self.start()
+        threads = [threading.Thread(target=consume, args=(feed,), name=f'feed-{i}') for i, feed in enumerate(feeds)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.flush()
+        if errors:
+            raise errors[0]
+        return self.snapshot()
+
+    # Writer thread
+
+    def _write_loop(self):
+        events = self._events
+        while True:
+            event = events.get()
+            try:
+                if event is _STOP:
+                    return
+                self._apply(*event)
+            except BaseException as e:
+                if self._error is None:
+                    self._error = e
+            finally:
+                events.task_done()
+
+    def _apply(self, kind: str, timestamp, symbol: str, price: float, action: Optional[str], quantity: int):
+        with self._book_lock:
+            curve = self.curve
+            if kind == _TICK:
+                curve.on_tick(symbol, price)
+                self.ticks_processed += 1
+            if action is not None:
+                self.execute_trade(timestamp, symbol, action, price, quantity,
+                                   use_command_pattern=self.use_command_pattern)
+                position = self.positions.get(symbol)
+                curve.update_position(symbol, position.quantity if position else 0, price)
+            if kind == _TICK:
+                curve.record(timestamp, self.cash)
+
+    # Reading (any thread)
+
+    def snapshot(self) -> dict:
+        """Consistent copy of the book as of the last applied event."""
+        with self._book_lock:
+            return {
+                'cash': self.cash,
+                'positions': {s: p.quantity for s, p in self.positions.items() if p.quantity},
+                'market_value': self.curve.market_value,
+                'portfolio_value': self.cash + self.curve.market_value,
+                'total_trades': len(self.trades),
+                'ticks_processed': self.ticks_processed,
+            }
+
+
+def market_data_feed(data: MarketData, symbol: str) -> Iterator[MarketDataPoint]:
+    """Ticks of one symbol in time order, e.g. to replay stored data as a live feed."""
+    frame = data.get(symbol)
+    for timestamp, price in zip(frame['timestamp'].tolist(), frame['price'].tolist()):
+        yield MarketDataPoint(timestamp=timestamp, symbol=symbol, price=price)
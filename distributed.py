@@ -0,0 +1,332 @@
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from multiprocessing import Process
+from multiprocessing.connection import Client, Listener
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from market_data import MarketData
+from patterns.Singleton_ConfigAccess import STRATEGY_PARAMS_FILE
+from runner import run_job
+
+# Coordinator / worker mode for backtests across machines.
+# The coordinator listens on a TCP address (or a Unix socket path) and hands
+# out shards -- one strategy with one parameter set over a range of symbols
+# -- to whichever worker asks next. A worker loads its own local copy of the
+# market data once (a columnar store directory from ingest.py, or a CSV),
+# runs every job of a shard with runner.run_job and streams each result back
+# as soon as it is done. Results of a shard only count once the worker
+# reports the whole shard done; if its connection drops (or it exceeds
+# `task_timeout`) the shard goes back on the queue and is retried on another
+# worker, up to `max_retries` times, after which its jobs are reported as
+# errors. Connections are authenticated with `authkey`
+# (multiprocessing.connection). Every message is unpickled, so anyone holding
+# the key can run code on the other side: there is no default key (pass
+# --authkey or set BACKTEST_AUTHKEY) and the coordinator binds to localhost
+# unless told otherwise. On one machine, spawn_local_workers starts worker
+# processes that stand in for nodes.
+#
+# Messages (tuples):
+#   worker -> coordinator   ('hello', worker_id) ('ready',)
+#                           ('result', task_id, index, result) ('done', task_id)
+#   coordinator -> worker   ('task', task_id, shard) ('stop',)
+
+AUTHKEY_ENV = 'BACKTEST_AUTHKEY'
+
+
+@dataclass
+class Shard:
+    strategy: str
+    params: Optional[Dict]
+    symbols: List[str]
+    initial_capital: float = 100000
+
+
+@dataclass
+class _Task:
+    task_id: int
+    shard: Shard
+    attempts: int = 0
+    workers: List[str] = field(default_factory=list)
+
+
+def make_shards(strategies: Sequence[str], symbols: Sequence[str], param_sets: Sequence[Optional[Dict]] = (None,),
+                shard_size: int = 10, initial_capital: float = 100000) -> List[Shard]:
+    """(strategy x params) x symbol ranges of up to `shard_size` symbols."""
+    symbols = list(symbols)
+    return [
+        Shard(strategy, params, symbols[i:i + shard_size], initial_capital)
+        for strategy in strategies
+        for params in param_sets
+        for i in range(0, len(symbols), shard_size)
+    ]
+
+
+def compact_result(result: Dict) -> Dict:
+    """The result without the bulky parts (tracebacks are cut to their last line)."""
+    result = dict(result)
+    if 'traceback' in result:
+        lines = result.pop('traceback').strip().splitlines()
+        result['traceback_tail'] = lines[-1] if lines else ''
+    return result
+
+
+def parse_address(text: str):
+    """'host:port' -> (host, port); anything else is a Unix socket path."""
+    host, sep, port = text.rpartition(':')
+    if sep and port.isdigit():
+        return host or '127.0.0.1', int(port)
+    return text
+
+
+class Coordinator:
+    """Work queue of backtest shards served to workers over multiprocessing.connection."""
+
+    def __init__(self, address=('127.0.0.1', 0), *, authkey: bytes, max_retries: int = 2,
+                 task_timeout: Optional[float] = None):
+        self.authkey = authkey
+        self.max_retries = max_retries
+        self.task_timeout = task_timeout
+        self._listener = Listener(address, authkey=authkey)
+        self._cond = threading.Condition()
+        self._pending: deque = deque()
+        self._results: Dict[int, List] = {}
+        self._failed: Dict[int, str] = {}
+        self._tasks: Dict[int, _Task] = {}
+        self._next_id = 0
+        self._closed = False
+        self.workers_seen = set()
+        self.retries = 0
+        self._accept_thread = threading.Thread(target=self._accept_loop, name='coordinator-accept', daemon=True)
+        self._accept_thread.start()
+
+    @property
+    def address(self):
+        return self._listener.address
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    # Scheduling
+
+    def submit(self, shards: Sequence[Shard]) -> List[int]:
+        """Queue shards and return their task ids."""
+        with self._cond:
+            ids = []
+            for shard in shards:
+                task = _Task(self._next_id, shard)
+                self._next_id += 1
+                self._tasks[task.task_id] = task
+                self._pending.append(task)
+                ids.append(task.task_id)
+            self._cond.notify_all()
+        return ids
+
+    def wait(self, task_ids: Sequence[int], timeout: Optional[float] = None) -> List[Dict]:
+        """Block until every task has finished or failed; results in task order, job order within."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            while not all(t in self._results or t in self._failed for t in task_ids):
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    raise TimeoutError(f"{sum(t not in self._results and t not in self._failed for t in task_ids)}"
+                                       f" shard(s) still running")
+                self._cond.wait(remaining if remaining is not None else 1.0)
+            out = []
+            for t in task_ids:
+                if t in self._results:
+                    out.extend(self._results[t])
+                else:
+                    shard = self._tasks[t].shard
+                    out.extend({'strategy': shard.strategy, 'symbol': symbol, 'params': shard.params or {},
+                                'error': self._failed[t]} for symbol in shard.symbols)
+            return out
+
+    def run(self, shards: Sequence[Shard], timeout: Optional[float] = None) -> List[Dict]:
+        return self.wait(self.submit(shards), timeout)
+
+    def close(self):
+        """Stop handing out work; idle workers are told to stop."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        try:
+            self._listener.close()
+        except OSError:
+            pass
+
+    def _next_task(self) -> Optional[_Task]:
+        with self._cond:
+            while not self._pending and not self._closed:
+                self._cond.wait()
+            return None if self._closed else self._pending.popleft()
+
+    def _finish(self, task: _Task, results: List[Dict]):
+        with self._cond:
+            self._results[task.task_id] = [result for _, result in sorted(results, key=lambda r: r[0])]
+            self._cond.notify_all()
+
+    def _retry(self, task: _Task, reason: str):
+        with self._cond:
+            task.attempts += 1
+            if task.attempts > self.max_retries:
+                self._failed[task.task_id] = (f"gave up after {task.attempts} attempt(s) "
+                                              f"on {', '.join(task.workers)}: {reason}")
+            else:
+                self.retries += 1
+                self._pending.appendleft(task)
+            self._cond.notify_all()
+
+    # Connections
+
+    def _accept_loop(self):
+        while True:
+            try:
+                conn = self._listener.accept()
+            except (OSError, EOFError):
+                if self._closed:
+                    return
+                continue  # failed handshake (e.g. wrong authkey); keep serving
+            threading.Thread(target=self._serve, args=(conn,), daemon=True).start()
+
+    def _serve(self, conn):
+        worker, task, results = '?', None, []
+        try:
+            while True:
+                if task is not None and self.task_timeout is not None and not conn.poll(self.task_timeout):
+                    raise TimeoutError(f"no message from {worker} for {self.task_timeout}s")
+                message = conn.recv()
+                kind = message[0]
+                if kind == 'hello':
+                    worker = message[1]
+                    self.workers_seen.add(worker)
+                elif kind == 'ready':
+                    task = self._next_task()
+                    if task is None:
+                        conn.send(('stop',))
+                        return
+                    task.workers.append(worker)
+                    results = []
+                    conn.send(('task', task.task_id, task.shard))
+                elif kind == 'result' and task is not None and message[1] == task.task_id:
+                    results.append((message[2], message[3]))
+                elif kind == 'done' and task is not None and message[1] == task.task_id:
+                    self._finish(task, results)
+                    task = None
+        except (EOFError, OSError, TimeoutError) as e:
+            if task is not None:
+                self._retry(task, f"{e.__class__.__name__}: {e}" if str(e) else e.__class__.__name__)
+        finally:
+            conn.close()
+
+
+# Workers
+
+def load_local_data(path: str) -> MarketData:
+    """A worker's market data: a columnar store directory (ingest.py) or a market-data CSV."""
+    if os.path.isdir(path):
+        from ingest import MarketDataStore
+        return MarketDataStore(path).load()
+    return MarketData.load(path)
+
+
+def run_worker(address, data_path: str, authkey: bytes, worker_id: Optional[str] = None,
+               params_file: Optional[str] = STRATEGY_PARAMS_FILE) -> int:
+    """Serve shards from the coordinator at `address` until told to stop; returns the number of jobs run."""
+    data = load_local_data(data_path)
+    worker_id = worker_id or f"{os.uname().nodename}:{os.getpid()}"
+    n_jobs = 0
+    conn = Client(address, authkey=authkey)
+    try:
+        conn.send(('hello', worker_id))
+        while True:
+            conn.send(('ready',))
+            message = conn.recv()
+            if message[0] == 'stop':
+                return n_jobs
+            _, task_id, shard = message
+            for index, symbol in enumerate(shard.symbols):
+                result = run_job(shard.strategy, symbol, data, shard.initial_capital, shard.params, params_file)
+                result['worker'] = worker_id
+                conn.send(('result', task_id, index, compact_result(result)))
+                n_jobs += 1
+            conn.send(('done', task_id))
+    except (EOFError, OSError):
+        return n_jobs  # coordinator went away
+    finally:
+        conn.close()
+
+
+def spawn_local_workers(address, data_path: str, n_workers: int, authkey: bytes,
+                        params_file: Optional[str] = STRATEGY_PARAMS_FILE) -> List[Process]:
+    """Start `n_workers` worker processes on this machine (stand-ins for nodes)."""
+    processes = []
+    for i in range(n_workers):
+        process = Process(target=run_worker, args=(address, data_path, authkey, f"local-{i}", params_file),
+                          daemon=True)
+        process.start()
+        processes.append(process)
+    return processes
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Distributed backtests: coordinator or worker.")
+    sub = parser.add_subparsers(dest='mode', required=True)
+    coord = sub.add_parser('coordinator', help="serve shards and collect results")
+    coord.add_argument('--bind', default='127.0.0.1:6000',
+                       help="host:port or Unix socket path (use 0.0.0.0:PORT to accept remote workers)")
+    coord.add_argument('--data', required=True, help="store directory or CSV (for the symbol list)")
+    coord.add_argument('--strategies', nargs='+', default=['MeanReversionStrategy', 'BreakoutStrategy'])
+    coord.add_argument('--symbols', nargs='+', default=None)
+    coord.add_argument('--shard-size', type=int, default=10)
+    coord.add_argument('--local-workers', type=int, default=0, help="also start this many workers here")
+    coord.add_argument('--output', default='reports/distributed_results.json')
+    coord.add_argument('--timeout', type=float, default=3600.0,
+                       help="seconds to wait for all shards before giving up (0 = wait forever)")
+    work = sub.add_parser('worker', help="run shards from a coordinator")
+    work.add_argument('--connect', required=True, help="coordinator host:port or Unix socket path")
+    work.add_argument('--data', required=True, help="local store directory or CSV")
+    for p in (coord, work):
+        p.add_argument('--authkey', default=os.environ.get(AUTHKEY_ENV),
+                       help=f"shared secret (default: ${AUTHKEY_ENV})")
+    args = parser.parse_args(argv)
+    if not args.authkey:
+        parser.error(f"an authkey is required: pass --authkey or set {AUTHKEY_ENV}")
+    authkey = args.authkey.encode()
+
+    if args.mode == 'worker':
+        n = run_worker(parse_address(args.connect), args.data, authkey)
+        print(f"Worker finished after {n} job(s)")
+        return 0
+
+    symbols = args.symbols or load_local_data(args.data).symbols
+    shards = make_shards(args.strategies, symbols, shard_size=args.shard_size)
+    with Coordinator(parse_address(args.bind), authkey=authkey) as coordinator:
+        print(f"Coordinator on {coordinator.address}: {len(shards)} shard(s)")
+        spawn_local_workers(coordinator.address, args.data, args.local_workers, authkey)
+        try:
+            results = coordinator.run(shards, timeout=args.timeout or None)
+        except TimeoutError as e:
+            print(f"error: timed out after {args.timeout:g}s with {e} "
+                  f"({len(coordinator.workers_seen)} worker(s) connected)", file=sys.stderr)
+            return 1
+    output_dir = os.path.dirname(args.output)
+    if output_dir:
+        os.makedirs(output_dir, exist_ok=True)
+    with open(args.output, 'w') as f:
+        json.dump(results, f, indent=2, default=str)
+    failed = sum('error' in r for r in results)
+    print(f"{len(results)} result(s), {failed} failed, retries: {coordinator.retries} -> {args.output}")
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
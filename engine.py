@@ -1,86 +1,114 @@
+from __future__ import annotations
 
-import csv
-import pandas as pd
+import time
 from datetime import datetime
 from typing import Dict, List, Tuple
-from dataclasses import dataclass, field
-from collections import defaultdict
-from patterns.Strategy_SignalGen import Strategy, MeanReversionStrategy, BreakoutStrategy
-from models import MarketDataPoint
-
-from patterns.Command_TradeExecution import CommandInvoker
-
-
-@dataclass
-class Trade:
-    """Represents a single trade execution."""
-    timestamp: datetime
-    symbol: str
-    action: str  # 'BUY' or 'SELL'
-    price: float
-    quantity: int
-    cost: float  # Positive for buy, negative for sell
-    
+from patterns.Strategy_SignalGen import Strategy
+from models import MarketDataPoint, Trade, Position
 
-@dataclass
-class Position:
-    """Tracks a position in a symbol."""
-    symbol: str
-    quantity: int = 0
-    avg_cost: float = 0.0
-    total_cost: float = 0.0
-    
-    def update_position(self, action: str, price: float, quantity: int = 1):
-        """Update position based on trade action."""
-        if action == 'BUY':
-            # Calculate new average cost
-            new_cost = self.total_cost + (price * quantity)
-            self.quantity += quantity
-            self.total_cost = new_cost
-            self.avg_cost = new_cost / self.quantity if self.quantity > 0 else 0
-        elif action == 'SELL':
-            if self.quantity >= quantity:
-                self.quantity -= quantity
-                if self.quantity == 0:
-                    self.total_cost = 0
-                    self.avg_cost = 0
-                else:
-                    # Adjust average cost for remaining position
-                    remaining_value = self.avg_cost * self.quantity
-                    self.total_cost = remaining_value
-            else:
-                raise ValueError("Cannot sell more shares than owned")
-    
-    def get_current_value(self, current_price: float) -> float:
-        """Calculate current value of position."""
-        return self.quantity * current_price
+from patterns.Command_TradeExecution import CommandInvoker, ExecuteOrderCommand
+from patterns.Observer_SignalNotification import SignalPublisher
+from instrumentation import EngineInstrumentation
+from lazy_imports import lazy_import
+from equity_curve import EquityCurve, to_ns
+from market_data import MarketData
+from checkpoint import Checkpointer
+from fill_simulator import Fill, FillSimulator
+
+# pandas is only loaded when market data is first read
+pd = lazy_import('pandas')
 
 
 class BacktestEngine:
     """Main backtesting engine that applies strategies to market data."""
     
-    def __init__(self, initial_capital: float = 100000):
+    def __init__(self, initial_capital: float = 100000, instrumentation: EngineInstrumentation = None):
         self.initial_capital = initial_capital
         self.cash = initial_capital
         self.positions: Dict[str, Position] = {}
         self.trades: List[Trade] = []
-        self.equity_curve: List[Tuple[datetime, float]] = []
+        self.equity_curve: List[Tuple[datetime, float]] = []  # sampled every 1000 ticks
+
+        # full-resolution curve, marked to market incrementally on every tick and fill
+        self.curve = EquityCurve()
 
         # publisher
-        from patterns.Observer_SignalNotification import SignalPublisher
         self.publisher = SignalPublisher()
 
         # command invoker
         self.command_invoker = CommandInvoker()
+
+        # optional hot-path instrumentation (None = off)
+        self.instrumentation = instrumentation if instrumentation is not None else EngineInstrumentation.from_env()
+
+        # optional periodic checkpoints of engine + strategy state (None = off)
+        self.checkpointer: Checkpointer = None
+
+        # optional fill simulation: signals become resting orders (None = instant fills)
+        self.fill_simulator: FillSimulator = None
+
+    def enable_instrumentation(self, profiler=None) -> EngineInstrumentation:
+        """Turn on stage timers and latency histograms, optionally with a profiler."""
+        self.instrumentation = EngineInstrumentation(profiler=profiler)
+        return self.instrumentation
+
+    def disable_instrumentation(self):
+        """Turn instrumentation off; the backtest loop goes back to its untimed path."""
+        self.instrumentation = None
+
+    def enable_checkpointing(self, directory: str, interval: int = 10000) -> Checkpointer:
+        """Write a checkpoint to `directory` every `interval` ticks of a backtest."""
+        self.checkpointer = Checkpointer(directory, interval)
+        return self.checkpointer
+
+    def disable_checkpointing(self):
+        self.checkpointer = None
+
+    def enable_fill_simulation(self, simulator: FillSimulator = None, **kwargs) -> FillSimulator:
+        """Route signals through a FillSimulator (built from `kwargs` if not given)."""
+        self.fill_simulator = simulator if simulator is not None else FillSimulator(**kwargs)
+        return self.fill_simulator
+
+    def disable_fill_simulation(self):
+        """Go back to filling every signal instantly at the tick price."""
+        self.fill_simulator = None
+
+    def resume_from_checkpoint(self, strategy: Strategy, symbol: str, df) -> dict:
+        """Restore the latest checkpoint of an interrupted run and backtest the remaining ticks.
+
+        Starts from the beginning when there is no checkpoint yet.
+        """
+        if self.checkpointer is None:
+            raise ValueError("Checkpointing is not enabled; call enable_checkpointing first")
+        checkpointer = self.checkpointer
+        start_index = checkpointer.restore(self, strategy, symbol)
+        results = self.backtest_strategy(strategy, symbol, df, start_index=start_index)
+        if start_index > 0:
+            # Curve stats over the whole run, not just the resumed part
+            run_start, notional_start = checkpointer.run_start
+            results['equity'] = self.curve.get_stats(
+                run_start, traded_notional=self.curve.traded_notional - notional_start)
+        return results
     
-    def load_market_data(self, filepath: str = 'inputs/market_data.csv') -> pd.DataFrame:
-        """Load market data from CSV."""
+    def load_market_data(self, filepath: str = 'inputs/market_data.csv', partitioned: bool = False,
+                         bar_freq: str = None):
+        """Load market data from CSV, optionally as a per-symbol partitioned MarketData.
+
+        With `bar_freq` ('5min', '1h', '1D', ...) the ticks are resampled into
+        OHLCV bars and returned as a MarketData whose `price` is the bar close.
+        """
+        if bar_freq is not None:
+            return MarketData.load(filepath).resample(bar_freq)
+        if partitioned:
+            return MarketData.load(filepath)
         df = pd.read_csv(filepath)
         df['timestamp'] = pd.to_datetime(df['timestamp'])
         return df
     
-    def get_symbol_data(self, df: pd.DataFrame, symbol: str) -> pd.DataFrame:
-        """Extract data for a single symbol."""
+    def get_symbol_data(self, df, symbol: str) -> pd.DataFrame:
+        """Extract data for a single symbol (a zero-copy slice when df is a MarketData)."""
+        if isinstance(df, MarketData):
+            return df.get(symbol)
         return df[df['symbol'] == symbol].sort_values('timestamp').reset_index(drop=True)
     
     def create_data_point(self, row) -> MarketDataPoint:
@@ -88,7 +116,8 @@ class BacktestEngine:
         return MarketDataPoint(
             timestamp=row['timestamp'],
             symbol=row['symbol'],
-            price=row['price']
+            price=row['price'],
+            daily_volume=row.get('daily_volume')
         )
     
     def execute_trade(self, timestamp: datetime, symbol: str, action: str, price: float, quantity: int = 1, use_command_pattern: bool = False):
@@ -96,7 +125,6 @@ class BacktestEngine:
 
         if use_command_pattern:
             # Use Command pattern
-            from patterns.Command_TradeExecution import ExecuteOrderCommand
             command = ExecuteOrderCommand(
                 engine=self,
                 timestamp=timestamp,
@@ -170,9 +198,72 @@ class BacktestEngine:
                     self.publisher.notify(signal_dict)
                 print(f"INSUFFICIENT SHARES: Cannot sell {symbol} | Available: {self.positions.get(symbol, Position(symbol)).quantity if symbol in self.positions else 0}")
     
-    def calculate_portfolio_value(self, df: pd.DataFrame, timestamp: datetime) -> float:
-        """Calculate total portfolio value at a given timestamp."""
+    def apply_fills(self, fills: List[Fill]) -> bool:
+        """Book simulated fills (price and commission from the simulator).
+
+        A fill the account cannot cover is rejected (the rest of its order is
+        cancelled) and observers are notified. Returns True if anything was booked.
+        """
+        booked = False
+        for fill in fills:
+            symbol, action, price, quantity = fill.symbol, fill.action, fill.price, fill.quantity
+            notional = price * quantity
+            position = self.positions.get(symbol)
+            if action == 'BUY':
+                ok = self.cash >= notional + fill.commission
+                reason = 'INSUFFICIENT_FUNDS'
+            else:
+                ok = position is not None and position.quantity >= quantity
+                reason = 'INSUFFICIENT_POSITION'
+            if not ok:
+                self.fill_simulator.reject(fill)
+                self.publisher.notify({
+                    'timestamp': fill.timestamp,
+                    'symbol': symbol,
+                    'price': price,
+                    'signal_type': reason,
+                    'quantity': quantity,
+                    'available_cash': self.cash,
+                    'available_quantity': position.quantity if position else 0,
+                    'action': action,
+                })
+                print(f"{reason.replace('_', ' ')}: cancelled {action} order {fill.order_id} for {symbol}")
+                continue
+
+            if action == 'BUY':
+                self.cash -= notional + fill.commission
+                cost = notional + fill.commission
+                if position is None:
+                    position = self.positions[symbol] = Position(symbol=symbol)
+            else:
+                self.cash += notional - fill.commission
+                cost = -(notional - fill.commission)
+            position.update_position(action, price, quantity)
+            self.trades.append(Trade(timestamp=fill.timestamp, symbol=symbol, action=action,
+                                     price=price, quantity=quantity, cost=cost))
+            booked = True
+            print(f"{action + ':':<5} {quantity} share(s) of {symbol} at ${price:.2f} (fill, {fill.remaining} open)"
+                  f" | Cash: ${self.cash:.2f} | position: {position.quantity}")
+        return booked
+
+    def calculate_portfolio_value(self, df, timestamp: datetime, asof: bool = False, tolerance=None) -> float:
+        """Calculate total portfolio value at a given timestamp.
+
+        With `asof` (MarketData only) each position is marked at its symbol's
+        last price at or before `timestamp`, at most `tolerance` old, instead
+        of only at a tick stamped exactly `timestamp`.
+        """
         portfolio_value = self.cash
+
+        if isinstance(df, MarketData):
+            for symbol, position in self.positions.items():
+                if asof:
+                    current_price = df.price_asof(symbol, timestamp, tolerance)
+                else:
+                    current_price = df.price_at(symbol, timestamp)
+                if current_price is not None:
+                    portfolio_value += position.get_current_value(current_price)
+            return portfolio_value
         
         for symbol, position in self.positions.items():
             # Get current price from dataframe
@@ -183,10 +274,15 @@ class BacktestEngine:
         
         return portfolio_value
     
-    def backtest_strategy(self, strategy: Strategy, symbol: str, df: pd.DataFrame):
+    def backtest_strategy(self, strategy: Strategy, symbol: str, df, start_index: int = 0) -> dict:
         """
         Backtest a strategy on a single symbol.
         Demonstrates the Strategy pattern - each strategy is interchangeable.
+        `df` is either the raw market-data frame or a partitioned MarketData.
+        With `start_index` > 0 the run continues from restored engine and
+        strategy state and only processes the symbol's ticks from that index.
+        Returns the results dict from print_results, plus an 'instrumentation'
+        summary when instrumentation is enabled.
         """
         print(f"\n{'='*80}")
         print(f"Backtesting {strategy.__class__.__name__} on {symbol}")
@@ -197,43 +293,153 @@ class BacktestEngine:
         
         # Initialize/reset portfolio for this symbol
         # (In a multi-symbol backtest, you'd track separately)
-        self.reset_positions_for_symbol(symbol)
-        
-        for idx, row in symbol_data.iterrows():
-            # Create market data point
-            tick = self.create_data_point(row)
-            
-            # Get signal from strategy
-            signal = strategy.generate_signals(tick)
-            
-            # Execute trade based on signal
-            if signal == 1:  # BUY signal
-                self.execute_trade(tick.timestamp, symbol, 'BUY', tick.price, quantity=1)
-            elif signal == -1:  # SELL signal
-                self.execute_trade(tick.timestamp, symbol, 'SELL', tick.price, quantity=1)
-            
-            # Record equity curve periodically (every 1000 ticks)
-            if idx % 1000 == 0 or idx == len(symbol_data) - 1:
-                portfolio_value = self.calculate_portfolio_value(df, tick.timestamp)
-                self.equity_curve.append((tick.timestamp, portfolio_value))
+        if start_index == 0:
+            self.reset_positions_for_symbol(symbol)
+        else:
+            symbol_data = symbol_data.iloc[start_index:]
+
+        curve = self.curve
+        n_ticks = start_index + len(symbol_data)
+        curve.reserve(len(symbol_data))
+        run_start = curve.size
+        notional_start = curve.traded_notional
+
+        inst = self.instrumentation
+        timed = inst is not None
+        if timed:
+            clock = time.perf_counter_ns
+            inst.instrument_publisher(self.publisher)
+            inst.instrument_publisher(getattr(strategy, 'publisher', None))
+            inst.start_run()
+
+        simulator = self.fill_simulator
+        filled = False
+
+        checkpointer = self.checkpointer
+        if checkpointer is not None:
+            checkpointer.begin(self, start_index)
+            checkpoint_every = checkpointer.interval
+
+        try:
+            for idx, (_, row) in enumerate(symbol_data.iterrows(), start_index):
+                if timed:
+                    tick_start = t0 = clock()
+
+                # Create market data point
+                tick = self.create_data_point(row)
+                if timed:
+                    t1 = clock()
+                    inst.add('create_data_point', t1 - t0)
+                    t0 = t1
+
+                # Get signal from strategy
+                signal = strategy.generate_signals(tick)
+                if timed:
+                    t1 = clock()
+                    inst.add('generate_signals', t1 - t0)
+                    t0 = t1
+
+                # Execute trade based on signal
+                if simulator is not None:
+                    # Resting orders fill against this tick; the new order can fill from the next one
+                    filled = self.apply_fills(simulator.on_tick(tick))
+                    if signal != 0:
+                        simulator.submit(symbol, 'BUY' if signal == 1 else 'SELL', 1, tick.timestamp)
+                elif signal == 1:  # BUY signal
+                    self.execute_trade(tick.timestamp, symbol, 'BUY', tick.price, quantity=1)
+                elif signal == -1:  # SELL signal
+                    self.execute_trade(tick.timestamp, symbol, 'SELL', tick.price, quantity=1)
+                if timed and (signal != 0 or simulator is not None):
+                    t1 = clock()
+                    inst.add('execute_trade', t1 - t0)
+                    t0 = t1
+
+                # Mark to market and record the equity curve on every tick
+                self.mark_to_market(symbol, tick.timestamp, tick.price, signal != 0 or filled, idx, n_ticks)
+                if timed:
+                    t1 = clock()
+                    inst.add('mark_to_market', t1 - t0)
+
+                if checkpointer is not None and (idx + 1) % checkpoint_every == 0:
+                    checkpointer.save(self, strategy, symbol, idx + 1)
+
+                if timed:
+                    inst.record_tick(clock() - tick_start)
+        finally:
+            if timed:
+                inst.stop_run()
+                inst.restore_publisher(self.publisher)
+                inst.restore_publisher(getattr(strategy, 'publisher', None))
         
         # Print results
-        self.print_results(strategy, symbol)
+        equity_stats = curve.get_stats(run_start, traded_notional=curve.traded_notional - notional_start)
+        results = self.print_results(strategy, symbol, equity_stats)
+        if timed:
+            results['instrumentation'] = inst.summary()
+        if simulator is not None:
+            results['fills'] = simulator.stats()
+        return results
     
+    def mark_to_market(self, symbol: str, timestamp, price: float, position_changed: bool,
+                       idx: int, n_ticks: int) -> float:
+        """Mark `symbol` at `price`, record the equity curve point and return the portfolio value.
+
+        A sampled copy goes into equity_curve every 1000 ticks and on the last one.
+        """
+        curve = self.curve
+        curve.on_tick(symbol, price)
+        if position_changed:
+            position = self.positions.get(symbol)
+            curve.update_position(symbol, position.quantity if position else 0, price)
+        portfolio_value = curve.record(timestamp, self.cash)
+        if idx % 1000 == 0 or idx == n_ticks - 1:
+            self.equity_curve.append((timestamp, portfolio_value))
+        return portfolio_value
+
+    def get_state(self) -> dict:
+        """Cash, positions, trades and mark-to-market state as plain Python values."""
+        curve = self.curve
+        return {
+            'initial_capital': self.initial_capital,
+            'cash': self.cash,
+            'positions': {s: [p.quantity, p.avg_cost, p.total_cost] for s, p in self.positions.items()},
+            'trades': [[to_ns(t.timestamp), t.symbol, t.action, t.price, t.quantity, t.cost] for t in self.trades],
+            'curve': {
+                'quantities': dict(curve.quantities),
+                'last_prices': dict(curve.last_prices),
+                'market_value': curve.market_value,
+                'traded_notional': curve.traded_notional,
+            },
+        }
+
+    def restore_state(self, state: dict):
+        """Restore state produced by get_state (the recorded curve points are not included)."""
+        self.initial_capital = state['initial_capital']
+        self.cash = state['cash']
+        self.positions = {
+            s: Position(symbol=s, quantity=q, avg_cost=avg, total_cost=total)
+            for s, (q, avg, total) in state['positions'].items()
+        }
+        self.trades = [
+            Trade(timestamp=pd.Timestamp(ts), symbol=s, action=a, price=p, quantity=q, cost=c)
+            for ts, s, a, p, q, c in state['trades']
+        ]
+        curve_state = state['curve']
+        self.curve.quantities = dict(curve_state['quantities'])
+        self.curve.last_prices = dict(curve_state['last_prices'])
+        self.curve.market_value = curve_state['market_value']
+        self.curve.traded_notional = curve_state['traded_notional']
+
     def reset_positions_for_symbol(self, symbol: str):
         """Reset positions for a specific symbol."""
         if symbol in self.positions:
             del self.positions[symbol]
+        self.curve.update_position(symbol, 0, 0.0, count_turnover=False)
     
-    def print_results(self, strategy: Strategy, symbol: str):
-        """Print backtest results for a strategy-symbol combination."""
-        final_portfolio_value = self.cash
-        if symbol in self.positions:
-            # Get last price
-            position = self.positions[symbol]
-            if position.quantity > 0:
-                # This would need the dataframe to get final price
-                final_portfolio_value += position.get_current_value(0)  # Placeholder
+    def print_results(self, strategy: Strategy, symbol: str, equity_stats: dict = None) -> dict:
+        """Print backtest results for a strategy-symbol combination and return them as a dict."""
+        # Open positions are marked at their last traded price
+        final_portfolio_value = self.cash + self.curve.market_value
         
         total_return = ((final_portfolio_value - self.initial_capital) / self.initial_capital) * 100
         
@@ -249,6 +455,30 @@ class BacktestEngine:
         sell_trades = [t for t in self.trades if t.action == 'SELL' and t.symbol == symbol]
         print(f"  BUY trades: {len(buy_trades)}")
         print(f"  SELL trades: {len(sell_trades)}")
+        if equity_stats:
+            print(f"Final Portfolio Value: ${final_portfolio_value:,.2f}")
+            print(f"Sharpe (per tick): {_format_stat(equity_stats['sharpe'])}")
+            print(f"Max Drawdown: {_format_stat(equity_stats['max_drawdown'], pct=True)}")
+            print(f"Turnover: {_format_stat(equity_stats['turnover'])}")
         print(f"{'-'*80}\n")
 
+        results = {
+            'strategy': strategy.__class__.__name__,
+            'symbol': symbol,
+            'initial_capital': self.initial_capital,
+            'final_cash': self.cash,
+            'final_portfolio_value': final_portfolio_value,
+            'total_return_pct': total_return,
+            'total_trades': len(self.trades),
+            'buy_trades': len(buy_trades),
+            'sell_trades': len(sell_trades),
+        }
+        if equity_stats is not None:
+            results['equity'] = equity_stats
+        return results
+
 
+def _format_stat(value, pct: bool = False) -> str:
+    if value is None:
+        return 'n/a'
+    return f"{value * 100:.2f}%" if pct else f"{value:.4f}"
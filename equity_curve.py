@@ -0,0 +1,156 @@
+from __future__ import annotations
+
+import math
+from typing import Dict, Optional
+
+from lazy_imports import lazy_import
+
+np = lazy_import('numpy')
+
+# Full-resolution equity curve with incremental mark-to-market.
+# Instead of rescanning the market-data frame to value the portfolio, the
+# curve keeps running position quantities and last prices per symbol and
+# adjusts the market value on every tick and fill:
+#   tick:  market_value += quantity * (new_price - last_price)
+#   fill:  market_value += (new_quantity - old_quantity) * last_price
+# Each recorded point is cash + market_value, written into preallocated
+# NumPy arrays that grow geometrically when a run needs more room. The
+# arrays are allocated on first use, so creating an engine stays cheap.
+
+
+def to_ns(timestamp) -> int:
+    """Convert a datetime / pd.Timestamp / datetime64 to int64 nanoseconds."""
+    value = getattr(timestamp, 'value', None)  # pd.Timestamp
+    if isinstance(value, (int, np.integer)):
+        return int(value)
+    return int(np.datetime64(timestamp, 'ns').astype(np.int64))
+
+
+class EquityCurve:
+    """Per-tick portfolio value tracked incrementally in preallocated arrays."""
+
+    def __init__(self, capacity: int = 1024):
+        self.capacity = max(int(capacity), 1)
+        self.timestamps = None
+        self.values = None
+        self.size = 0
+
+        self.quantities: Dict[str, int] = {}
+        self.last_prices: Dict[str, float] = {}
+        self.market_value = 0.0
+        self.traded_notional = 0.0
+
+    # State updates
+
+    def reserve(self, n: int):
+        """Make sure `n` more points fit without reallocating inside the loop."""
+        needed = self.size + n
+        if self.values is None:
+            capacity = max(needed, self.capacity)
+        elif needed <= len(self.values):
+            return
+        else:
+            capacity = max(needed, 2 * len(self.values))
+        timestamps = np.empty(capacity, dtype=np.int64)
+        values = np.empty(capacity, dtype=np.float64)
+        if self.values is not None:
+            timestamps[:self.size] = self.timestamps[:self.size]
+            values[:self.size] = self.values[:self.size]
+        self.timestamps = timestamps
+        self.values = values
+        self.capacity = capacity
+
+    def extend(self, timestamps_ns, values):
+        """Append previously recorded points, e.g. when resuming a stored run."""
+        n = len(values)
+        self.reserve(n)
+        self.timestamps[self.size:self.size + n] = timestamps_ns
+        self.values[self.size:self.size + n] = values
+        self.size += n
+
+    def on_tick(self, symbol: str, price: float):
+        """Re-mark a symbol at its latest price."""
+        last = self.last_prices.get(symbol)
+        if last is not None:
+            quantity = self.quantities.get(symbol, 0)
+            if quantity:
+                self.market_value += quantity * (price - last)
+        self.last_prices[symbol] = price
+
+    def update_position(self, symbol: str, quantity: int, price: float, count_turnover: bool = True):
+        """Set the position in `symbol` to `quantity` after a fill at `price`."""
+        old_quantity = self.quantities.get(symbol, 0)
+        delta = quantity - old_quantity
+        if delta == 0:
+            return
+        if symbol not in self.last_prices:
+            self.last_prices[symbol] = price
+        self.market_value += delta * self.last_prices[symbol]
+        if count_turnover:
+            self.traded_notional += abs(delta) * price
+        if quantity:
+            self.quantities[symbol] = quantity
+        else:
+            del self.quantities[symbol]
+
+    def position_value(self, symbol: str) -> float:
+        """Market value of the position in `symbol` at its last price."""
+        return self.quantities.get(symbol, 0) * self.last_prices.get(symbol, 0.0)
+
+    def record(self, timestamp, cash: float) -> float:
+        """Append a point (cash + marked positions) to the curve and return it."""
+        if self.values is None or self.size == len(self.values):
+            self.reserve(1)
+        value = cash + self.market_value
+        self.timestamps[self.size] = to_ns(timestamp)
+        self.values[self.size] = value
+        self.size += 1
+        return value
+
+    # Results
+
+    def get_values(self, start: int = 0, end: Optional[int] = None) -> np.ndarray:
+        """Read-only view of the recorded values."""
+        self.reserve(0)
+        view = self.values[start:self.size if end is None else end]
+        view.flags.writeable = False
+        return view
+
+    def get_timestamps(self, start: int = 0, end: Optional[int] = None) -> np.ndarray:
+        """Recorded timestamps as datetime64[ns]."""
+        self.reserve(0)
+        return self.timestamps[start:self.size if end is None else end].view('datetime64[ns]')
+
+    def get_stats(self, start: int = 0, end: Optional[int] = None,
+                  periods_per_year: Optional[float] = None, traded_notional: Optional[float] = None) -> Dict:
+        """Sharpe ratio, max drawdown and turnover over a slice of the curve.
+
+        Sharpe is per recorded period unless `periods_per_year` is given, in
+        which case it is annualized by sqrt(periods_per_year). Turnover is
+        traded notional divided by the average portfolio value.
+        """
+        self.reserve(0)
+        values = self.values[start:self.size if end is None else end]
+        if traded_notional is None:
+            traded_notional = self.traded_notional
+        stats = {'points': int(len(values)), 'sharpe': None, 'max_drawdown': None, 'turnover': None}
+        if len(values) == 0:
+            return stats
+
+        running_max = np.maximum.accumulate(values)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            drawdowns = np.where(running_max > 0, (running_max - values) / running_max, 0.0)
+        stats['max_drawdown'] = float(drawdowns.max())
+
+        mean_value = float(values.mean())
+        stats['turnover'] = traded_notional / mean_value if mean_value else None
+
+        if len(values) > 2:
+            returns = np.diff(values) / values[:-1]
+            std = float(returns.std(ddof=1))
+            if std > 0 and not math.isnan(std):
+                sharpe = float(returns.mean()) / std
+                if periods_per_year:
+                    sharpe *= math.sqrt(periods_per_year)
+                stats['sharpe'] = sharpe
+        return stats
@@ -0,0 +1,340 @@
+import heapq
+import math
+from abc import ABC, abstractmethod
+from collections import deque
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from models import MarketDataPoint
+
+# Fill simulation for orders that do not fill instantly at the tick price.
+# Orders rest in per-symbol queues until a later tick can fill them:
+#   market orders  FIFO deque
+#   limit orders   one heap per side, best price first, then time priority
+# Each tick fills at most `participation` x daily_volume per symbol and day
+# (daily_volume comes from MarketDataPoint; None means no cap), optionally
+# also capped by `max_fill_per_tick`, so large orders fill partially over
+# several ticks. Fill prices go through a slippage model and every fill
+# pays a commission. The engine matches a tick before it submits the orders
+# that tick's signal produces, so an order fills at the earliest on the next
+# tick of its symbol (no look-ahead). A tick for a symbol with nothing
+# resting costs one dict lookup.
+
+
+# Slippage models
+
+class SlippageModel(ABC):
+    """Adjusts the tick price to the price a fill actually gets."""
+
+    @abstractmethod
+    def fill_price(self, side: int, price: float, quantity: int, daily_volume: Optional[float]) -> float:
+        pass
+
+
+class NoSlippage(SlippageModel):
+    def fill_price(self, side, price, quantity, daily_volume):
+        return price
+
+
+class FixedBpsSlippage(SlippageModel):
+    """Pay a fixed number of basis points through the tick price."""
+
+    def __init__(self, bps: float = 1.0):
+        self.bps = bps
+
+    def fill_price(self, side, price, quantity, daily_volume):
+        return price * (1 + side * self.bps / 10000.0)
+
+
+class SquareRootImpactSlippage(SlippageModel):
+    """Impact of `coefficient * sqrt(quantity / daily_volume)` (fraction of price), plus a fixed spread in bps."""
+
+    def __init__(self, coefficient: float = 0.1, spread_bps: float = 0.0):
+        self.coefficient = coefficient
+        self.spread_bps = spread_bps
+
+    def fill_price(self, side, price, quantity, daily_volume):
+        impact = self.spread_bps / 10000.0
+        if daily_volume:
+            impact += self.coefficient * math.sqrt(quantity / daily_volume)
+        return price * (1 + side * impact)
+
+
+# Commission models
+
+class CommissionModel(ABC):
+    """Fee charged on a fill."""
+
+    @abstractmethod
+    def commission(self, price: float, quantity: int) -> float:
+        pass
+
+
+class NoCommission(CommissionModel):
+    def commission(self, price, quantity):
+        return 0.0
+
+
+class PerShareCommission(CommissionModel):
+    def __init__(self, per_share: float = 0.005, minimum: float = 0.0):
+        self.per_share = per_share
+        self.minimum = minimum
+
+    def commission(self, price, quantity):
+        return max(self.per_share * quantity, self.minimum)
+
+
+class BpsCommission(CommissionModel):
+    def __init__(self, bps: float = 1.0):
+        self.bps = bps
+
+    def commission(self, price, quantity):
+        return price * quantity * self.bps / 10000.0
+
+
+# Orders and fills
+
+class Order:
+    """A resting order; `remaining` shrinks as it fills."""
+    __slots__ = ('order_id', 'symbol', 'side', 'quantity', 'remaining', 'limit_price', 'timestamp', 'active')
+
+    def __init__(self, order_id: int, symbol: str, side: int, quantity: int,
+                 limit_price: Optional[float], timestamp: datetime):
+        self.order_id = order_id
+        self.symbol = symbol
+        self.side = side  # 1 = BUY, -1 = SELL
+        self.quantity = quantity
+        self.remaining = quantity
+        self.limit_price = limit_price
+        self.timestamp = timestamp
+        self.active = True
+
+    @property
+    def action(self) -> str:
+        return 'BUY' if self.side > 0 else 'SELL'
+
+
+@dataclass
+class Fill:
+    """A (possibly partial) execution of an order."""
+    order_id: int
+    timestamp: datetime
+    symbol: str
+    action: str
+    quantity: int
+    price: float
+    commission: float
+    remaining: int  # quantity of the order still open after this fill
+    tick_price: float  # price of the tick it filled against, before slippage
+
+
+class _SymbolBook:
+    __slots__ = ('market', 'bids', 'asks', 'day', 'filled_today', 'open_orders')
+
+    def __init__(self):
+        self.market = deque()  # market orders, FIFO
+        self.bids = []         # (-limit, seq, order)
+        self.asks = []         # (limit, seq, order)
+        self.day = None
+        self.filled_today = 0
+        self.open_orders = 0
+
+
+class FillSimulator:
+    """Per-symbol resting-order queues with volume-capped partial fills."""
+
+    def __init__(self, participation: float = 0.1, max_fill_per_tick: Optional[int] = None,
+                 slippage: Optional[SlippageModel] = None, commission: Optional[CommissionModel] = None):
+        if not 0 < participation <= 1:
+            raise ValueError("participation must be in (0, 1]")
+        self.participation = participation
+        self.max_fill_per_tick = max_fill_per_tick
+        self.slippage = slippage or NoSlippage()
+        self.commission_model = commission or NoCommission()
+        self.books: Dict[str, _SymbolBook] = {}
+        self.orders: Dict[int, Order] = {}
+        self._seq = 0
+        # Totals for capacity analysis
+        self.submitted_quantity = 0
+        self.filled_quantity = 0
+        self.fill_count = 0
+        self.commission_paid = 0.0
+        self.slippage_cost = 0.0
+
+    # Orders
+
+    def submit(self, symbol: str, action: str, quantity: int, timestamp: datetime = None,
+               limit_price: Optional[float] = None) -> int:
+        """Queue an order and return its id; it can fill from the next tick of `symbol` on."""
+        if action not in ('BUY', 'SELL'):
+            raise ValueError(f"Unknown action: {action}")
+        if quantity <= 0:
+            raise ValueError("Order quantity must be positive")
+        self._seq += 1
+        order = Order(self._seq, symbol, 1 if action == 'BUY' else -1, int(quantity), limit_price, timestamp)
+        self._enqueue(order)
+        self.submitted_quantity += order.quantity
+        return order.order_id
+
+    def _enqueue(self, order: Order):
+        book = self.books.get(order.symbol)
+        if book is None:
+            book = self.books[order.symbol] = _SymbolBook()
+        if order.limit_price is None:
+            book.market.append(order)
+        elif order.side > 0:
+            heapq.heappush(book.bids, (-order.limit_price, order.order_id, order))
+        else:
+            heapq.heappush(book.asks, (order.limit_price, order.order_id, order))
+        book.open_orders += 1
+        self.orders[order.order_id] = order
+
+    def cancel(self, order_id: int) -> bool:
+        """Cancel the open part of an order. Cancelled heap entries are dropped lazily."""
+        order = self.orders.pop(order_id, None)
+        if order is None or not order.active:
+            return False
+        order.active = False
+        book = self.books[order.symbol]
+        book.open_orders -= 1
+        if book.open_orders == 0:
+            # Nothing live is left; drop cancelled entries still sitting in the queues
+            book.market.clear()
+            book.bids.clear()
+            book.asks.clear()
+        return True
+
+    def reject(self, fill: Fill):
+        """Undo a fill the account could not book and cancel the rest of its order.
+
+        The rejected quantity still counts against the day's participation.
+        """
+        self.filled_quantity -= fill.quantity
+        self.fill_count -= 1
+        self.commission_paid -= fill.commission
+        sign = 1 if fill.action == 'BUY' else -1
+        self.slippage_cost -= sign * (fill.price - fill.tick_price) * fill.quantity
+        self.cancel(fill.order_id)
+
+    def open_orders(self, symbol: Optional[str] = None) -> List[Order]:
+        return [o for o in self.orders.values() if symbol is None or o.symbol == symbol]
+
+    # Matching
+
+    def on_tick(self, tick: MarketDataPoint) -> List[Fill]:
+        """Fill resting orders of `tick.symbol` against this tick."""
+        book = self.books.get(tick.symbol)
+        if book is None or book.open_orders == 0:
+            return []
+
+        capacity = self._capacity(book, tick)
+        fills = []
+        market = book.market
+        while market and capacity > 0:
+            order = market[0]
+            if not order.active:
+                market.popleft()
+                continue
+            capacity = self._fill(order, tick, capacity, fills)
+            if order.remaining == 0:
+                market.popleft()
+
+        capacity = self._match_limits(book.bids, -1, tick, capacity, fills)
+        self._match_limits(book.asks, 1, tick, capacity, fills)
+
+        book.filled_today += sum(f.quantity for f in fills)
+        return fills
+
+    def _match_limits(self, heap, sign: int, tick: MarketDataPoint, capacity, fills: List[Fill]):
+        # Heap keys are sign * limit: -limit for bids, limit for asks
+        price = tick.price
+        while heap and capacity > 0:
+            key, _, order = heap[0]
+            if not order.active:
+                heapq.heappop(heap)
+                continue
+            if sign * price < key:  # bid: price > limit, ask: price < limit
+                break
+            capacity = self._fill(order, tick, capacity, fills)
+            if order.remaining == 0:
+                heapq.heappop(heap)
+        return capacity
+
+    def _capacity(self, book: _SymbolBook, tick: MarketDataPoint) -> float:
+        capacity = math.inf
+        daily_volume = tick.daily_volume
+        if daily_volume is not None and daily_volume == daily_volume:  # not NaN
+            day = tick.timestamp.date() if hasattr(tick.timestamp, 'date') else None
+            if day != book.day:
+                book.day = day
+                book.filled_today = 0
+            capacity = math.floor(self.participation * daily_volume) - book.filled_today
+        if self.max_fill_per_tick is not None:
+            capacity = min(capacity, self.max_fill_per_tick)
+        return capacity
+
+    def _fill(self, order: Order, tick: MarketDataPoint, capacity, fills: List[Fill]):
+        quantity = int(min(order.remaining, capacity))
+        daily_volume = tick.daily_volume if tick.daily_volume == tick.daily_volume else None
+        price = self.slippage.fill_price(order.side, tick.price, quantity, daily_volume)
+        if order.limit_price is not None:
+            # Slippage never takes a limit order through its limit
+            price = min(price, order.limit_price) if order.side > 0 else max(price, order.limit_price)
+        commission = self.commission_model.commission(price, quantity)
+
+        order.remaining -= quantity
+        if order.remaining == 0:
+            order.active = False
+            self.orders.pop(order.order_id, None)
+            self.books[order.symbol].open_orders -= 1  # the caller pops it off its queue
+        self.filled_quantity += quantity
+        self.fill_count += 1
+        self.commission_paid += commission
+        self.slippage_cost += order.side * (price - tick.price) * quantity
+        fills.append(Fill(order.order_id, tick.timestamp, order.symbol, order.action,
+                          quantity, price, commission, order.remaining, tick.price))
+        return capacity - quantity
+
+    # Checkpointing
+
+    def get_state(self) -> Dict:
+        """Open orders (queue order), per-symbol daily volume used, next order id and totals."""
+        return {
+            'seq': self._seq,
+            'orders': [
+                (o.order_id, o.symbol, o.side, o.quantity, o.remaining, o.limit_price, o.timestamp)
+                for o in sorted(self.orders.values(), key=lambda o: o.order_id)
+            ],
+            'books': {symbol: (book.day, book.filled_today) for symbol, book in self.books.items()},
+            'totals': (self.submitted_quantity, self.filled_quantity, self.fill_count,
+                       self.commission_paid, self.slippage_cost),
+        }
+
+    def restore_state(self, state: Dict):
+        """Restore state produced by get_state (fill and cost models are kept as configured)."""
+        self.books = {}
+        self.orders = {}
+        for symbol, (day, filled_today) in state['books'].items():
+            book = self.books[symbol] = _SymbolBook()
+            book.day = day
+            book.filled_today = filled_today
+        for order_id, symbol, side, quantity, remaining, limit_price, timestamp in state['orders']:
+            order = Order(order_id, symbol, side, quantity, limit_price, timestamp)
+            order.remaining = remaining
+            self._enqueue(order)
+        self._seq = state['seq']
+        (self.submitted_quantity, self.filled_quantity, self.fill_count,
+         self.commission_paid, self.slippage_cost) = state['totals']
+
+    def stats(self) -> Dict:
+        """Totals for capacity analysis: fill ratio, commissions and slippage paid."""
+        return {
+            'submitted_quantity': self.submitted_quantity,
+            'filled_quantity': self.filled_quantity,
+            'fill_ratio': self.filled_quantity / self.submitted_quantity if self.submitted_quantity else None,
+            'fills': self.fill_count,
+            'open_orders': len(self.orders),
+            'commission_paid': self.commission_paid,
+            'slippage_cost': self.slippage_cost,
+        }
@@ -0,0 +1,194 @@
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Dict, Iterable, List, Mapping, Optional
+
+from lazy_imports import lazy_import
+from models import MarketDataPoint
+
+np = lazy_import('numpy')
+
+# Shared rolling indicators.
+# Strategies declare the indicators they read (Strategy.indicators()), e.g.
+# SMA(20) or RollingMax(15). An IndicatorGraph collects the declarations of
+# all attached strategies into one deduplicated set of nodes -- twenty
+# strategies asking for SMA(20) make one node -- plus their dependencies
+# (RollingStd(n) reuses SMA(n)). Per symbol the graph keeps a single price
+# history, as long as the longest window. On each tick every node is
+# computed once and strategies get a read-only mapping {indicator: value};
+# the first strategy to see a tick triggers the computation and the others
+# reuse it, so it works whichever engine drives the strategies. Ticks are
+# counted per symbol rather than compared by value (real feeds repeat the
+# same timestamp and price): a strategy that has read as many ticks as the
+# graph holds advances it, one that is behind reads the values already
+# computed for the tick it is on. Windows are
+# summed oldest to newest and max/min/std are taken over the same window, so
+# values equal what the strategies computed on their own price_history.
+# compute_batch evaluates the same nodes over a whole price array at once.
+
+KINDS = ('sma', 'max', 'min', 'std')
+
+
+@dataclass(frozen=True)
+class Indicator:
+    kind: str
+    window: int
+
+    def __post_init__(self):
+        if self.kind not in KINDS:
+            raise ValueError(f"Unknown indicator: {self.kind} (choose from {', '.join(KINDS)})")
+        if int(self.window) < 1:
+            raise ValueError("Indicator window must be at least 1")
+
+    def dependencies(self) -> tuple:
+        return (SMA(self.window),) if self.kind == 'std' else ()
+
+    def __repr__(self) -> str:
+        return f"{self.kind.upper()}({self.window})"
+
+
+def SMA(window: int) -> Indicator:
+    return Indicator('sma', int(window))
+
+
+def RollingMax(window: int) -> Indicator:
+    return Indicator('max', int(window))
+
+
+def RollingMin(window: int) -> Indicator:
+    return Indicator('min', int(window))
+
+
+def RollingStd(window: int) -> Indicator:
+    """Sample standard deviation (ddof=1) over the window."""
+    return Indicator('std', int(window))
+
+
+class IndicatorGraph:
+    """Deduplicated indicator nodes computed once per tick and shared by strategies."""
+
+    def __init__(self, indicators: Iterable[Indicator] = ()):
+        self.nodes: List[Indicator] = []  # dependencies before dependents
+        self.depth = 0
+        self.computations = 0  # node evaluations so far
+        self._history: Dict[str, List[float]] = {}
+        self._values: Dict[str, Dict[Indicator, Optional[float]]] = {}
+        self._views: Dict[str, Mapping[Indicator, Optional[float]]] = {}
+        self._ticks: Dict[str, int] = {}  # ticks appended per symbol
+        self._read: Dict[str, Dict[object, int]] = {}  # ticks each strategy has read, per symbol
+        self.add(*indicators)
+
+    def add(self, *indicators: Indicator):
+        """Add nodes (and their dependencies); ones already in the graph are reused."""
+        for indicator in indicators:
+            if indicator in self.nodes:
+                continue
+            self.add(*indicator.dependencies())
+            self.nodes.append(indicator)
+            self.depth = max(self.depth, indicator.window)
+
+    def attach(self, strategy):
+        """Register the strategy's indicators and have it read them from this graph."""
+        self.add(*strategy.indicators())
+        strategy.indicator_graph = self
+
+    # Per tick
+
+    def on_tick(self, tick: MarketDataPoint, reader=None) -> Mapping[Indicator, Optional[float]]:
+        """Values of every node for `tick.symbol` after this tick (None while the window fills).
+
+        `reader` is the strategy asking. When another reader has already
+        advanced the graph past the ticks this one has read, this call reads
+        those values instead of appending the tick again. Without a reader
+        every call appends.
+        """
+        symbol = tick.symbol
+        if reader is not None:
+            read = self._read.setdefault(symbol, {})
+            seen = read.get(reader, 0)
+            read[reader] = seen + 1
+            if seen < self._ticks.get(symbol, 0):
+                return self._views[symbol]
+        self._ticks[symbol] = self._ticks.get(symbol, 0) + 1
+
+        history = self._history.get(symbol)
+        if history is None:
+            history = self._history[symbol] = []
+            self._values[symbol] = {}
+            self._views[symbol] = MappingProxyType(self._values[symbol])
+        history.append(tick.price)
+        if len(history) > self.depth:
+            del history[:len(history) - self.depth]
+
+        values = self._values[symbol]
+        n = len(history)
+        for node in self.nodes:
+            w = node.window
+            if n < w:
+                values[node] = None
+                continue
+            window = history[-w:]
+            if node.kind == 'sma':
+                values[node] = sum(window) / w
+            elif node.kind == 'max':
+                values[node] = max(window)
+            elif node.kind == 'min':
+                values[node] = min(window)
+            else:
+                mean = values[SMA(w)]
+                values[node] = math.sqrt(sum((p - mean) ** 2 for p in window) / (w - 1)) if w > 1 else 0.0
+            self.computations += 1
+        return self._views[symbol]
+
+    def view(self, symbol: str) -> Mapping[Indicator, Optional[float]]:
+        """Read-only, live view of the latest values for `symbol`."""
+        return self._views.get(symbol, MappingProxyType({}))
+
+    def reset(self, symbol: Optional[str] = None):
+        """Forget the price history of one symbol, or of all."""
+        for store in (self._history, self._values, self._views, self._ticks, self._read):
+            if symbol is None:
+                store.clear()
+            else:
+                store.pop(symbol, None)
+
+    def get_state(self) -> dict:
+        """Price history per symbol, in the same {symbol: [prices]} shape as Strategy.get_state."""
+        return {symbol: list(history) for symbol, history in self._history.items()}
+
+    def set_state(self, state: dict):
+        """Replace the price histories with ones produced by get_state."""
+        self.reset()
+        for symbol, prices in state.items():
+            self._history[symbol] = list(prices)[-self.depth:] if self.depth else []
+            self._values[symbol] = {}
+            self._views[symbol] = MappingProxyType(self._values[symbol])
+
+    # Vectorized
+
+    def compute_batch(self, prices) -> Dict[Indicator, np.ndarray]:
+        """Every node over a whole price array, as read-only arrays (NaN while the window fills)."""
+        prices = np.asarray(prices, dtype=np.float64)
+        out: Dict[Indicator, np.ndarray] = {}
+        for node in self.nodes:
+            w = node.window
+            values = np.full(len(prices), np.nan)
+            if len(prices) >= w:
+                windows = np.lib.stride_tricks.sliding_window_view(prices, w)
+                if node.kind == 'sma':
+                    total = np.zeros(len(windows))
+                    for j in range(w):  # oldest to newest, like sum(window)
+                        total += windows[:, j]
+                    values[w - 1:] = total / w
+                elif node.kind == 'max':
+                    values[w - 1:] = windows.max(axis=1)
+                elif node.kind == 'min':
+                    values[w - 1:] = windows.min(axis=1)
+                else:
+                    mean = out[SMA(w)][w - 1:]
+                    values[w - 1:] = np.sqrt(((windows - mean[:, None]) ** 2).sum(axis=1) / (w - 1)) if w > 1 else 0.0
+            values.setflags(write=False)
+            out[node] = values
+        return out
@@ -0,0 +1,280 @@
+import argparse
+import hashlib
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, FrozenSet, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from Adapter_DataLoader import YahooFinanceAdapter, BloombergXMLAdapter
+from market_data import MarketData
+
+# Bulk ingestion of vendor drops into one columnar market-data store.
+# Directories are scanned for vendor files (.json -> YahooFinanceAdapter,
+# .xml -> BloombergXMLAdapter). Each file is checksummed and, unless that
+# checksum is already in the store, parsed by its adapter into
+# MarketDataPoint columns; files are spread over a process pool in chunks,
+# since one drop is thousands of small files.
+#
+# The store is a directory of .npy column files plus manifest.json (chunk
+# list, row count, symbol table, checksums of ingested files). Each ingest
+# writes only its own rows, sorted by (symbol, timestamp), as a new chunk of
+# column files and then swaps in the manifest listing it, so a crash
+# mid-write leaves the previous store intact and earlier chunks are never
+# rewritten. The symbol table only grows, so codes in old chunks stay valid.
+# Reads concatenate the chunks and deduplicate on (symbol, timestamp), the
+# row from the latest chunk winning; compact() folds the chunks into one.
+# Re-running on the same files is a no-op.
+
+STORE_DIR = 'data/market_store'
+FORMAT_VERSION = 1
+ADAPTERS = {'.json': YahooFinanceAdapter, '.xml': BloombergXMLAdapter}
+
+# Checksums already in the store, set in each worker by _init_worker
+_worker_known: FrozenSet[str] = frozenset()
+
+
+def file_checksum(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def find_vendor_files(paths: Sequence[str]) -> List[str]:
+    """Vendor files under `paths` (files or directories, searched recursively), sorted."""
+    found = []
+    for path in paths:
+        if os.path.isfile(path):
+            found.append(path)
+            continue
+        for dirpath, _, filenames in os.walk(path):
+            found.extend(os.path.join(dirpath, name) for name in filenames)
+    return sorted(os.path.abspath(p) for p in found if os.path.splitext(p)[1].lower() in ADAPTERS)
+
+
+def _timestamp_ns(timestamp) -> int:
+    ts = pd.Timestamp(timestamp)
+    if ts.tzinfo is not None:
+        ts = ts.tz_convert('UTC').tz_localize(None)
+    return ts.as_unit('ns').value
+
+
+def parse_vendor_file(path: str) -> Dict[str, np.ndarray]:
+    """timestamp (int64 ns, UTC) / symbol / price / daily_volume columns of one vendor file."""
+    adapter = ADAPTERS[os.path.splitext(path)[1].lower()](path)
+    points = adapter.get_all()
+    return {
+        'timestamp': np.array([_timestamp_ns(p.timestamp) for p in points], dtype=np.int64),
+        'symbol': np.array([p.symbol for p in points], dtype=str),
+        'price': np.array([p.price for p in points], dtype=np.float64),
+        'daily_volume': np.array([np.nan if p.daily_volume is None else p.daily_volume for p in points],
+                                 dtype=np.float64),
+    }
+
+
+def _latest_rows(symbol: np.ndarray, timestamp: np.ndarray) -> np.ndarray:
+    """Indices of the last row of each (symbol, timestamp), ordered by (symbol, timestamp)."""
+    n = len(timestamp)
+    order = np.lexsort((np.arange(n), timestamp, symbol))
+    if not n:
+        return order
+    sym, ts = symbol[order], timestamp[order]
+    return order[np.r_[(sym[1:] != sym[:-1]) | (ts[1:] != ts[:-1]), True]]
+
+
+def _init_worker(known: FrozenSet[str]):
+    global _worker_known
+    _worker_known = known
+
+
+def _ingest_worker(path: str) -> Dict:
+    try:
+        checksum = file_checksum(path)
+        if checksum in _worker_known:
+            return {'path': path, 'checksum': checksum, 'columns': None}
+        return {'path': path, 'checksum': checksum, 'columns': parse_vendor_file(path)}
+    except Exception as e:
+        return {'path': path, 'error': f"{e.__class__.__name__}: {e}"}
+
+
+class MarketDataStore:
+    """Columnar market-data store: chunks of .npy column files plus a JSON manifest."""
+
+    COLUMNS = ('timestamp', 'symbol', 'price', 'daily_volume')
+
+    def __init__(self, directory: str = STORE_DIR):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        self.manifest = self._read_manifest()
+
+    @property
+    def manifest_path(self) -> str:
+        return os.path.join(self.directory, 'manifest.json')
+
+    def _read_manifest(self) -> Dict:
+        if not os.path.exists(self.manifest_path):
+            return {'version': FORMAT_VERSION, 'chunks': [], 'next_chunk': 1, 'rows': 0, 'symbols': [], 'files': {}}
+        with open(self.manifest_path) as f:
+            manifest = json.load(f)
+        if manifest.get('version') != FORMAT_VERSION:
+            raise ValueError(f"Unsupported store version {manifest.get('version')} in {self.directory}")
+        return manifest
+
+    def _column_path(self, name: str, chunk: int) -> str:
+        return os.path.join(self.directory, f"{name}.{chunk}.npy")
+
+    def _load_chunk(self, chunk: int, names: Sequence[str] = COLUMNS) -> Dict[str, np.ndarray]:
+        return {name: np.load(self._column_path(name, chunk), allow_pickle=False, mmap_mode='r') for name in names}
+
+    def _write_manifest(self, manifest: Dict):
+        tmp = self.manifest_path + '.tmp'
+        with open(tmp, 'w') as f:
+            json.dump(manifest, f, indent=2)
+        os.replace(tmp, self.manifest_path)
+        self.manifest = manifest
+
+    @property
+    def checksums(self) -> FrozenSet[str]:
+        return frozenset(self.manifest['files'])
+
+    def __len__(self) -> int:
+        return self.manifest['rows']
+
+    def columns(self) -> Dict[str, np.ndarray]:
+        """Stored columns, deduplicated across chunks and sorted by (symbol code, timestamp).
+
+        `symbol` holds int32 codes into manifest['symbols'].
+        """
+        chunks = [self._load_chunk(chunk['id']) for chunk in self.manifest['chunks']]
+        if not chunks:
+            return {'timestamp': np.array([], dtype=np.int64), 'symbol': np.array([], dtype=np.int32),
+                    'price': np.array([], dtype=np.float64), 'daily_volume': np.array([], dtype=np.float64)}
+        if len(chunks) == 1:
+            return {name: np.array(values) for name, values in chunks[0].items()}  # deduplicated when written
+        merged = {name: np.concatenate([chunk[name] for chunk in chunks]) for name in self.COLUMNS}
+        keep = _latest_rows(merged['symbol'], merged['timestamp'])
+        return {name: np.ascontiguousarray(values[keep]) for name, values in merged.items()}
+
+    def append(self, parts: Sequence[Dict[str, np.ndarray]], files: Dict[str, Dict]) -> Dict:
+        """Write parsed columns as a new chunk and record `files` ({checksum: info}) as ingested."""
+        symbols = list(self.manifest['symbols'])
+        known = set(symbols)
+        symbols += sorted(set().union(*(set(p['symbol'].tolist()) for p in parts)) - known)
+        codes = {symbol: i for i, symbol in enumerate(symbols)}
+        new = {name: np.concatenate([p[name] for p in parts]) for name in ('timestamp', 'price', 'daily_volume')}
+        names, inverse = np.unique(np.concatenate([p['symbol'] for p in parts]), return_inverse=True)
+        new['symbol'] = np.array([codes[name] for name in names.tolist()], dtype=np.int32)[inverse]
+
+        # Latest arrival wins within the chunk; across chunks it is resolved when reading
+        n_new = len(new['timestamp'])
+        keep = _latest_rows(new['symbol'], new['timestamp'])
+        chunk = {name: np.ascontiguousarray(values[keep]) for name, values in new.items()}
+
+        # Distinct (symbol, timestamp) keys over all chunks, for the row count
+        keys = [self._load_chunk(c['id'], ('symbol', 'timestamp')) for c in self.manifest['chunks']]
+        rows = len(_latest_rows(np.concatenate([k['symbol'] for k in keys] + [chunk['symbol']]),
+                                np.concatenate([k['timestamp'] for k in keys] + [chunk['timestamp']])))
+
+        chunk_id = self.manifest['next_chunk']
+        for name in self.COLUMNS:
+            np.save(self._column_path(name, chunk_id), chunk[name], allow_pickle=False)
+        previous_rows = self.manifest['rows']
+        self._write_manifest(dict(
+            self.manifest, chunks=self.manifest['chunks'] + [{'id': chunk_id, 'rows': len(keep)}],
+            next_chunk=chunk_id + 1, rows=rows, symbols=symbols, files={**self.manifest['files'], **files},
+        ))
+        return {'rows': rows, 'rows_added': rows - previous_rows,
+                'duplicates_dropped': previous_rows + n_new - rows}
+
+    def compact(self) -> int:
+        """Fold all chunks into one deduplicated chunk; returns the number of chunks removed."""
+        old = self.manifest['chunks']
+        if len(old) <= 1:
+            return 0
+        columns = self.columns()
+        chunk_id = self.manifest['next_chunk']
+        for name in self.COLUMNS:
+            np.save(self._column_path(name, chunk_id), columns[name], allow_pickle=False)
+        self._write_manifest(dict(self.manifest, chunks=[{'id': chunk_id, 'rows': len(columns['timestamp'])}],
+                                  next_chunk=chunk_id + 1))
+        for chunk in old:
+            for name in self.COLUMNS:
+                os.remove(self._column_path(name, chunk['id']))
+        return len(old)
+
+    def to_frame(self) -> pd.DataFrame:
+        """Long-format frame with the same columns as inputs/market_data.csv (plus daily_volume)."""
+        columns = self.columns()
+        symbols = np.array(self.manifest['symbols'], dtype=object)
+        return pd.DataFrame({
+            'timestamp': columns['timestamp'].view('datetime64[ns]'),
+            'symbol': symbols[columns['symbol']] if len(symbols) else np.array([], dtype=object),
+            'price': columns['price'],
+            'daily_volume': columns['daily_volume'],
+        })
+
+    def load(self) -> MarketData:
+        return MarketData(self.to_frame())
+
+
+def ingest(paths: Sequence[str], store_dir: str = STORE_DIR, workers: int = 1,
+           chunksize: Optional[int] = None) -> Dict:
+    """Parse every new vendor file under `paths` into the store at `store_dir`.
+
+    Files whose checksum the store already has are skipped, so re-running
+    ingests only what is new. Files that fail to parse are reported and not
+    recorded, so the next run retries them.
+    """
+    store = MarketDataStore(store_dir)
+    files = find_vendor_files(paths)
+    known = store.checksums
+    if workers <= 1 or len(files) <= 1:
+        _init_worker(known)
+        results = [_ingest_worker(path) for path in files]
+    else:
+        chunksize = chunksize or max(1, len(files) // (workers * 4))
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(known,)) as pool:
+            results = list(pool.map(_ingest_worker, files, chunksize=chunksize))
+
+    parts, new_files, errors = [], {}, []
+    skipped = 0
+    for result in results:
+        if 'error' in result:
+            errors.append({'path': result['path'], 'error': result['error']})
+        elif result['columns'] is None or result['checksum'] in new_files:
+            skipped += 1  # already in the store, or an identical copy earlier in this drop
+        else:
+            parts.append(result['columns'])
+            new_files[result['checksum']] = {'path': result['path'], 'rows': len(result['columns']['price'])}
+
+    summary = {'files_found': len(files), 'files_ingested': len(new_files), 'files_skipped': skipped,
+               'errors': errors, 'rows_added': 0, 'duplicates_dropped': 0, 'rows': len(store)}
+    if new_files:
+        summary.update(store.append(parts, new_files))
+    return summary
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Ingest vendor files into the columnar market-data store.")
+    parser.add_argument('paths', nargs='+', help="vendor files or directories")
+    parser.add_argument('--store', default=STORE_DIR, help="store directory")
+    parser.add_argument('--workers', type=int, default=1, help="worker processes")
+    args = parser.parse_args(argv)
+
+    summary = ingest(args.paths, args.store, workers=args.workers)
+    print(f"{summary['files_found']} file(s): {summary['files_ingested']} ingested, "
+          f"{summary['files_skipped']} already in store, {len(summary['errors'])} failed")
+    print(f"{summary['rows_added']} row(s) added, {summary['duplicates_dropped']} duplicate(s) dropped, "
+          f"{summary['rows']} row(s) in {args.store}")
+    for error in summary['errors']:
+        print(f"  {error['path']}: {error['error']}")
+    return 1 if summary['errors'] else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,188 @@
+import os
+import time
+from typing import Any, Dict, List, Optional
+
+# Optional timing instrumentation for the backtest loop.
+# Attach an EngineInstrumentation to BacktestEngine to collect per-stage
+# cumulative timers and call counts, a histogram of per-tick latency and,
+# optionally, a cProfile / pyinstrument-style profiler around the run.
+# When no instrumentation is attached the engine skips all of this.
+
+STAGES = (
+    'create_data_point',
+    'generate_signals',
+    'execute_trade',
+    'notify',
+    'mark_to_market',
+)
+
+# Environment switch so production runs can be instrumented without code changes:
+#   BACKTEST_INSTRUMENTATION=timers    -> stage timers and latency histogram
+#   BACKTEST_INSTRUMENTATION=cprofile  -> the above plus a cProfile run
+ENV_VAR = 'BACKTEST_INSTRUMENTATION'
+
+
+class EngineInstrumentation:
+    """Per-stage timers, counters and a per-tick latency histogram.
+
+    Latencies are bucketed by powers of two nanoseconds: bucket `k` holds
+    ticks that took less than 2**k ns (and at least 2**(k-1) ns), so
+    recording a tick is a single `int.bit_length()` and a list increment.
+
+    `notify` time is measured inside the stage that triggered it, so it is
+    also included in `generate_signals` / `execute_trade`.
+    """
+
+    def __init__(self, profiler: Any = None, n_buckets: int = 40):
+        self.profiler = profiler
+        self.n_buckets = n_buckets
+        self.reset()
+
+    @classmethod
+    def from_env(cls) -> Optional['EngineInstrumentation']:
+        """Build instrumentation from the BACKTEST_INSTRUMENTATION variable, or None if unset."""
+        mode = os.environ.get(ENV_VAR, '').strip().lower()
+        if not mode or mode in ('0', 'off', 'false'):
+            return None
+        if mode == 'cprofile':
+            import cProfile
+            return cls(profiler=cProfile.Profile())
+        return cls()
+
+    def reset(self):
+        """Clear all timers, counters and the latency histogram."""
+        self.stage_ns: Dict[str, int] = {stage: 0 for stage in STAGES}
+        self.stage_calls: Dict[str, int] = {stage: 0 for stage in STAGES}
+        self.histogram: List[int] = [0] * self.n_buckets
+        self.ticks = 0
+        self.tick_ns_total = 0
+        self.tick_ns_min = None
+        self.tick_ns_max = 0
+        self.runs = 0
+        self.run_ns = 0
+
+    def add(self, stage: str, elapsed_ns: int):
+        """Add one timed call of `stage`."""
+        self.stage_ns[stage] += elapsed_ns
+        self.stage_calls[stage] += 1
+
+    def record_tick(self, elapsed_ns: int):
+        """Record the end-to-end latency of one tick."""
+        self.ticks += 1
+        self.tick_ns_total += elapsed_ns
+        if self.tick_ns_min is None or elapsed_ns < self.tick_ns_min:
+            self.tick_ns_min = elapsed_ns
+        if elapsed_ns > self.tick_ns_max:
+            self.tick_ns_max = elapsed_ns
+        bucket = elapsed_ns.bit_length()
+        if bucket >= self.n_buckets:
+            bucket = self.n_buckets - 1
+        self.histogram[bucket] += 1
+
+    # Observer notification timing
+
+    def instrument_publisher(self, publisher):
+        """Time `publisher.notify` calls until `restore_publisher` is called."""
+        if publisher is None or '_instrumented_notify' in publisher.__dict__:
+            return
+        original = publisher.notify
+        perf_counter_ns = time.perf_counter_ns
+
+        def timed_notify(signal):
+            start = perf_counter_ns()
+            try:
+                return original(signal)
+            finally:
+                self.add('notify', perf_counter_ns() - start)
+
+        publisher.notify = timed_notify
+        publisher._instrumented_notify = original
+
+    @staticmethod
+    def restore_publisher(publisher):
+        """Undo `instrument_publisher`."""
+        if publisher is None or '_instrumented_notify' not in publisher.__dict__:
+            return
+        del publisher.__dict__['notify']
+        del publisher.__dict__['_instrumented_notify']
+
+    # Profiler hook
+
+    def start_run(self):
+        self._run_start = time.perf_counter_ns()
+        if self.profiler is None:
+            return
+        if hasattr(self.profiler, 'enable'):
+            self.profiler.enable()  # cProfile.Profile
+        else:
+            self.profiler.start()  # pyinstrument.Profiler and similar
+
+    def stop_run(self):
+        if self.profiler is not None:
+            if hasattr(self.profiler, 'disable'):
+                self.profiler.disable()
+            else:
+                self.profiler.stop()
+        self.runs += 1
+        self.run_ns += time.perf_counter_ns() - self._run_start
+
+    def percentile(self, q: float) -> Optional[int]:
+        """Approximate latency percentile (upper bucket bound, in ns)."""
+        if self.ticks == 0:
+            return None
+        target = q / 100.0 * self.ticks
+        seen = 0
+        for bucket, count in enumerate(self.histogram):
+            seen += count
+            if count and seen >= target:
+                return 1 << bucket
+        return 1 << (self.n_buckets - 1)
+
+    def profile_stats(self, limit: int = 20) -> Optional[List[Dict[str, Any]]]:
+        """Top functions by cumulative time when a cProfile profiler is attached."""
+        if self.profiler is None or not hasattr(self.profiler, 'getstats'):
+            return None
+        import pstats
+        stats = pstats.Stats(self.profiler)
+        rows = []
+        for (filename, line, func), (cc, nc, tt, ct, _) in stats.stats.items():
+            rows.append({
+                'function': f"{os.path.basename(filename)}:{line}({func})",
+                'calls': nc,
+                'total_time': tt,
+                'cumulative_time': ct,
+            })
+        rows.sort(key=lambda r: r['cumulative_time'], reverse=True)
+        return rows[:limit]
+
+    def summary(self) -> Dict[str, Any]:
+        """Return timers, counters and latency statistics as a plain dict."""
+        stages = {}
+        for stage in STAGES:
+            calls = self.stage_calls[stage]
+            total = self.stage_ns[stage]
+            stages[stage] = {
+                'calls': calls,
+                'total_seconds': total / 1e9,
+                'mean_us': (total / calls / 1e3) if calls else None,
+            }
+        histogram = [
+            {'upper_ns': 1 << bucket, 'count': count}
+            for bucket, count in enumerate(self.histogram) if count
+        ]
+        return {
+            'runs': self.runs,
+            'run_seconds': self.run_ns / 1e9,
+            'ticks': self.ticks,
+            'ticks_per_sec': self.ticks / (self.run_ns / 1e9) if self.run_ns else None,
+            'stages': stages,
+            'tick_latency': {
+                'mean_us': (self.tick_ns_total / self.ticks / 1e3) if self.ticks else None,
+                'min_us': self.tick_ns_min / 1e3 if self.tick_ns_min is not None else None,
+                'max_us': self.tick_ns_max / 1e3,
+                'p50_us': self.percentile(50) / 1e3 if self.ticks else None,
+                'p99_us': self.percentile(99) / 1e3 if self.ticks else None,
+                'histogram': histogram,
+            },
+            'profile': self.profile_stats(),
+        }
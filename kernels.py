@@ -0,0 +1,227 @@
+from dataclasses import dataclass
+from typing import Optional
+
+import numpy as np
+
+from patterns.Strategy_SignalGen import MeanReversionStrategy, BreakoutStrategy
+
+# Compiled strategy kernels.
+# Each kernel runs the signal-plus-fill state machine of one strategy over a
+# NumPy price array in a single sequential loop: the same signal rule as the
+# strategy's generate_signals, followed by the engine's fill rule (BUY only
+# with enough cash, SELL only with enough shares). With Numba installed the
+# kernels are compiled with @njit; otherwise the identical Python functions
+# run as-is. The Strategy classes remain the reference implementation and
+# the kernels are tested against them tick for tick.
+#
+# Window state (last `lookback` prices kept as a ring buffer), cash and
+# position are passed in and handed back, so a run can be continued on the
+# next chunk of prices without replaying history.
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:  # pragma: no cover - depends on the environment
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda fn: fn
+
+
+def _mean_reversion_loop(prices, lookback, threshold, quantity, window, count, head, cash, position,
+                         signals, positions, cash_path, equity):
+    n_trades = 0
+    for i in range(prices.shape[0]):
+        price = prices[i]
+
+        # Update the rolling window (oldest price at window[head])
+        if count < lookback:
+            window[(head + count) % lookback] = price
+            count += 1
+        else:
+            window[head] = price
+            head = (head + 1) % lookback
+
+        signal = 0
+        if count >= lookback:
+            # Sum oldest to newest, matching sum(price_history) in the strategy
+            total = 0.0
+            for j in range(lookback):
+                total += window[(head + j) % lookback]
+            mean_price = total / lookback
+            deviation = (price - mean_price) / mean_price
+            if deviation < -threshold:
+                signal = 1
+            elif deviation > threshold:
+                signal = -1
+
+        # Fill rule from BacktestEngine.execute_trade
+        cost = price * quantity
+        if signal == 1:
+            if cash >= cost:
+                cash -= cost
+                position += quantity
+                n_trades += 1
+        elif signal == -1:
+            if position >= quantity:
+                cash += cost
+                position -= quantity
+                n_trades += 1
+
+        signals[i] = signal
+        positions[i] = position
+        cash_path[i] = cash
+        equity[i] = cash + position * price
+    return count, head, cash, position, n_trades
+
+
+def _breakout_loop(prices, lookback, threshold, quantity, window, count, head, cash, position,
+                   signals, positions, cash_path, equity):
+    n_trades = 0
+    for i in range(prices.shape[0]):
+        price = prices[i]
+
+        if count < lookback:
+            window[(head + count) % lookback] = price
+            count += 1
+        else:
+            window[head] = price
+            head = (head + 1) % lookback
+
+        signal = 0
+        if count >= lookback:
+            high_price = window[0]
+            low_price = window[0]
+            for j in range(1, lookback):
+                value = window[j]
+                if value > high_price:
+                    high_price = value
+                if value < low_price:
+                    low_price = value
+            upward_breakout = high_price * (1 + threshold)
+            downward_breakout = low_price * (1 - threshold)
+            if price > upward_breakout:
+                signal = 1
+            elif price < downward_breakout:
+                signal = -1
+
+        cost = price * quantity
+        if signal == 1:
+            if cash >= cost:
+                cash -= cost
+                position += quantity
+                n_trades += 1
+        elif signal == -1:
+            if position >= quantity:
+                cash += cost
+                position -= quantity
+                n_trades += 1
+
+        signals[i] = signal
+        positions[i] = position
+        cash_path[i] = cash
+        equity[i] = cash + position * price
+    return count, head, cash, position, n_trades
+
+
+# Python reference versions are always available; compiled ones only with Numba
+PYTHON_KERNELS = {
+    'MeanReversionStrategy': _mean_reversion_loop,
+    'BreakoutStrategy': _breakout_loop,
+}
+COMPILED_KERNELS = {
+    name: njit(cache=True)(fn) for name, fn in PYTHON_KERNELS.items()
+} if NUMBA_AVAILABLE else {}
+
+
+@dataclass
+class KernelState:
+    """Carry-over state between kernel calls."""
+    window: np.ndarray
+    count: int = 0
+    head: int = 0
+    cash: float = 100000.0
+    position: int = 0
+    n_trades: int = 0
+
+    @classmethod
+    def initial(cls, lookback: int, cash: float) -> 'KernelState':
+        return cls(window=np.zeros(max(int(lookback), 1), dtype=np.float64), cash=float(cash))
+
+    def copy(self) -> 'KernelState':
+        return KernelState(self.window.copy(), self.count, self.head, self.cash, self.position, self.n_trades)
+
+    def price_history(self) -> list:
+        """Window contents oldest to newest, like Strategy.price_history[symbol]."""
+        lookback = len(self.window)
+        return [float(self.window[(self.head + j) % lookback]) for j in range(self.count)]
+
+
+@dataclass
+class KernelResult:
+    signals: np.ndarray    # int8: 1 BUY, -1 SELL, 0 NO ACTION
+    positions: np.ndarray  # int64 position after each tick
+    cash: np.ndarray       # float64 cash after each tick
+    equity: np.ndarray     # float64 cash + position * price
+    state: KernelState
+
+
+def kernel_name(strategy) -> Optional[str]:
+    """Name of the kernel implementing `strategy`, or None if there is none."""
+    if isinstance(strategy, MeanReversionStrategy):
+        return 'MeanReversionStrategy'
+    if isinstance(strategy, BreakoutStrategy):
+        return 'BreakoutStrategy'
+    return None
+
+
+def get_kernel(name: str, backend: str = 'auto'):
+    """Return the kernel function for `name`.
+
+    backend: 'auto' (compiled when Numba is installed), 'numba' or 'python'.
+    """
+    if backend not in ('auto', 'numba', 'python'):
+        raise ValueError(f"Invalid kernel backend: {backend}")
+    if name not in PYTHON_KERNELS:
+        raise ValueError(f"No kernel for strategy: {name}")
+    if backend == 'python' or (backend == 'auto' and not NUMBA_AVAILABLE):
+        return PYTHON_KERNELS[name]
+    if not NUMBA_AVAILABLE:
+        raise ImportError("numba is not installed")
+    return COMPILED_KERNELS[name]
+
+
+def run_kernel(strategy, prices, initial_cash: float = 100000.0, quantity: int = 1,
+               state: Optional[KernelState] = None, backend: str = 'auto') -> KernelResult:
+    """Run the strategy's kernel over `prices`, continuing from `state` if given.
+
+    Parameters come from the strategy instance (lookback_window, threshold).
+    The input state is not modified; the returned result carries the new one.
+    """
+    name = kernel_name(strategy)
+    if name is None:
+        raise ValueError(f"No kernel for strategy: {strategy.__class__.__name__}")
+    kernel = get_kernel(name, backend)
+
+    prices = np.ascontiguousarray(prices, dtype=np.float64)
+    lookback = int(strategy.lookback_window)
+    state = KernelState.initial(lookback, initial_cash) if state is None else state.copy()
+    if len(state.window) != lookback:
+        raise ValueError("Kernel state was created with a different lookback_window")
+
+    n = prices.shape[0]
+    signals = np.zeros(n, dtype=np.int8)
+    positions = np.zeros(n, dtype=np.int64)
+    cash_path = np.zeros(n, dtype=np.float64)
+    equity = np.zeros(n, dtype=np.float64)
+
+    count, head, cash, position, n_trades = kernel(
+        prices, lookback, float(strategy.threshold), int(quantity), state.window,
+        int(state.count), int(state.head), float(state.cash), int(state.position),
+        signals, positions, cash_path, equity,
+    )
+    state.count, state.head, state.cash, state.position = int(count), int(head), float(cash), int(position)
+    state.n_trades += int(n_trades)
+    return KernelResult(signals, positions, cash_path, equity, state)
@@ -0,0 +1,237 @@
+import argparse
+import contextlib
+import json
+import os
+import sys
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from Adapter_DataLoader import YahooFinanceAdapter, BloombergXMLAdapter
+from engine import BacktestEngine
+from market_data import MarketData, MARKET_DATA_CSV
+from runner import make_strategy
+
+# Tick-to-trade latency replay.
+# Recorded ticks are turned back into raw vendor messages (Yahoo quote dicts
+# or Bloomberg <instrument> XML) and pushed one at a time through the live
+# path: adapter parse -> strategy.generate_signals (observer notifications
+# included) -> engine.execute_trade. Messages are released on a schedule --
+# the recorded inter-arrival times divided by `speed`, a fixed `rate` in
+# messages per second, or back to back -- and each event's latency is
+# measured from its scheduled arrival, so when the path cannot keep up the
+# queueing delay shows in the tail. Timestamps come from perf_counter_ns and
+# go into arrays allocated before the run; nothing is allocated per event
+# for the measurement itself. saturation_curve replays at increasing rates
+# to show where throughput stops following the offered load.
+
+PERCENTILES = (50, 99, 99.9)
+STAGES = ('queue', 'adapter', 'strategy', 'execute', 'total')
+
+
+def record_messages(data: MarketData, symbol: str, source: str = 'yahoo', limit: Optional[int] = None):
+    """(arrival offsets in ns from the first tick, raw vendor messages) for `symbol`."""
+    timestamps = data.timestamps(symbol)[:limit]
+    prices = data.prices(symbol)[:limit]
+    offsets = (timestamps.view(np.int64) - timestamps.view(np.int64)[0]) if len(timestamps) else np.array([], dtype=np.int64)
+    iso = np.datetime_as_string(timestamps, unit='us')
+    if source == 'yahoo':
+        messages = [{'ticker': symbol, 'last_price': float(p), 'timestamp': t + 'Z'} for t, p in zip(iso, prices)]
+    elif source == 'bloomberg':
+        messages = [f"<instrument><symbol>{symbol}</symbol><price>{float(p)!r}</price><timestamp>{t}Z</timestamp></instrument>"
+                    for t, p in zip(iso, prices)]
+    else:
+        raise ValueError(f"Unknown source: {source} (choose from yahoo, bloomberg)")
+    return offsets.astype(np.int64), messages
+
+
+@dataclass
+class LatencyReport:
+    """Per-event stage latencies in ns (arrays of length `events`)."""
+    source: str
+    pace: str
+    arrive: np.ndarray    # scheduled arrival, ns since the start of the replay
+    queue: np.ndarray     # scheduled arrival -> start of processing
+    adapter: np.ndarray
+    strategy: np.ndarray  # includes observer notifications
+    execute: np.ndarray   # 0 for events without a signal
+    total: np.ndarray     # scheduled arrival -> trade done (tick-to-trade)
+    trades: np.ndarray    # bool: event produced a signal
+    elapsed_ns: int
+
+    @property
+    def events(self) -> int:
+        return len(self.total)
+
+    def summary(self) -> Dict:
+        """Throughput and p50 / p99 / p99.9 per stage, in microseconds."""
+        out = {
+            'source': self.source,
+            'pace': self.pace,
+            'events': self.events,
+            'signals': int(self.trades.sum()),
+            'throughput_per_s': self.events / (self.elapsed_ns / 1e9) if self.elapsed_ns else None,
+        }
+        for stage in STAGES:
+            values = getattr(self, stage)
+            if stage == 'execute':
+                values = values[self.trades]
+            out[stage] = ({f"p{q:g}": float(np.percentile(values, q)) / 1000 for q in PERCENTILES}
+                          if len(values) else None)
+            if out[stage] is not None:
+                out[stage]['max'] = float(values.max()) / 1000
+        if self.trades.any():
+            tick_to_trade = self.total[self.trades]
+            out['tick_to_trade'] = {f"p{q:g}": float(np.percentile(tick_to_trade, q)) / 1000 for q in PERCENTILES}
+        else:
+            out['tick_to_trade'] = None
+        return out
+
+
+class LatencyReplay:
+    """Replays raw vendor messages through adapter -> strategy -> engine and times each event."""
+
+    def __init__(self, strategy_factory: Callable, initial_capital: float = 100000, quantity: int = 1,
+                 source: str = 'yahoo', quiet: bool = True):
+        if source not in ('yahoo', 'bloomberg'):
+            raise ValueError(f"Unknown source: {source} (choose from yahoo, bloomberg)")
+        self.strategy_factory = strategy_factory
+        self.initial_capital = initial_capital
+        self.quantity = quantity
+        self.source = source
+        self.quiet = quiet
+        self.parse = YahooFinanceAdapter.parse_quote if source == 'yahoo' else BloombergXMLAdapter.parse_quote
+
+    def run(self, offsets_ns: Sequence[int], messages: Sequence, speed: Optional[float] = None,
+            rate: Optional[float] = None, warmup: int = 0) -> LatencyReport:
+        """Replay `messages`; with `speed` at recorded pace / speed, with `rate` at a fixed rate, else flat out.
+
+        A fresh engine and strategy are used per run. The first `warmup`
+        events are processed but not reported.
+        """
+        n = len(messages)
+        if speed is not None and rate is not None:
+            raise ValueError("Pass either speed or rate, not both")
+        if speed is not None:
+            schedule = (np.asarray(offsets_ns, dtype=np.float64) / speed).astype(np.int64)
+            pace = f"{speed:g}x recorded"
+        elif rate is not None:
+            schedule = (np.arange(n) * (1e9 / rate)).astype(np.int64)
+            pace = f"{rate:g}/s"
+        else:
+            schedule = None
+            pace = 'max'
+
+        # Preallocated result arrays: stage boundaries per event
+        arrive = np.zeros(n, dtype=np.int64)
+        start = np.zeros(n, dtype=np.int64)
+        parsed = np.zeros(n, dtype=np.int64)
+        signalled = np.zeros(n, dtype=np.int64)
+        done = np.zeros(n, dtype=np.int64)
+        trades = np.zeros(n, dtype=np.bool_)
+
+        engine = BacktestEngine(initial_capital=self.initial_capital, instrumentation=None)
+        strategy = self.strategy_factory()
+        parse = self.parse
+        quantity = self.quantity
+        clock = time.perf_counter_ns
+        sleep = time.sleep
+
+        with open(os.devnull, 'w') as devnull, \
+                (contextlib.redirect_stdout(devnull) if self.quiet else contextlib.nullcontext()):
+            t0 = clock()
+            for i in range(n):
+                if schedule is None:
+                    due = clock()
+                else:
+                    due = t0 + int(schedule[i])
+                    now = clock()
+                    while now < due:
+                        if due - now > 200_000:  # sleep coarse, spin the last 0.2 ms
+                            sleep((due - now - 200_000) / 1e9)
+                        now = clock()
+                arrive[i] = due
+                start[i] = clock()
+                tick = parse(messages[i])
+                parsed[i] = clock()
+                signal = strategy.generate_signals(tick)
+                signalled[i] = clock()
+                if signal == 1:
+                    engine.execute_trade(tick.timestamp, tick.symbol, 'BUY', tick.price, quantity)
+                    trades[i] = True
+                elif signal == -1:
+                    engine.execute_trade(tick.timestamp, tick.symbol, 'SELL', tick.price, quantity)
+                    trades[i] = True
+                done[i] = clock()
+            elapsed = clock() - t0
+
+        s = slice(warmup, None)
+        return LatencyReport(
+            source=self.source,
+            pace=pace,
+            arrive=(arrive - t0)[s],
+            queue=(start - arrive)[s],
+            adapter=(parsed - start)[s],
+            strategy=(signalled - parsed)[s],
+            execute=(done - signalled)[s],
+            total=(done - arrive)[s],
+            trades=trades[s],
+            elapsed_ns=int(done[-1] - arrive[warmup]) if n > warmup else elapsed,
+        )
+
+    def saturation_curve(self, messages: Sequence, rates: Sequence[float], events_per_rate: int = 2000,
+                         warmup: int = 100) -> List[Dict]:
+        """Offered rate vs achieved throughput and tick-to-trade percentiles."""
+        messages = list(messages)[:events_per_rate + warmup]
+        points = []
+        for rate in rates:
+            report = self.run(None, messages, rate=rate, warmup=warmup)
+            summary = report.summary()
+            points.append({
+                'offered_per_s': rate,
+                'achieved_per_s': summary['throughput_per_s'],
+                **{f"total_{k}": v for k, v in summary['total'].items()},
+            })
+        return points
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Tick-to-trade latency replay.")
+    parser.add_argument('--data', default=MARKET_DATA_CSV, help="market data CSV to replay")
+    parser.add_argument('--symbol', default=None, help="symbol to replay (default: first in the data)")
+    parser.add_argument('--strategy', default='MeanReversionStrategy')
+    parser.add_argument('--source', default='yahoo', choices=('yahoo', 'bloomberg'))
+    parser.add_argument('--events', type=int, default=10000)
+    parser.add_argument('--speed', type=float, default=None, help="replay at recorded pace / speed")
+    parser.add_argument('--rates', type=float, nargs='*', default=None,
+                        help="also run a saturation curve at these offered rates (events/s)")
+    parser.add_argument('--output', default='reports/latency.json')
+    args = parser.parse_args(argv)
+
+    data = MarketData.load(args.data)
+    symbol = args.symbol or data.symbols[0]
+    offsets, messages = record_messages(data, symbol, args.source, args.events)
+    replay = LatencyReplay(lambda: make_strategy(args.strategy), source=args.source)
+    summary = replay.run(offsets, messages, speed=args.speed, warmup=min(100, len(messages) // 10)).summary()
+    report = {'symbol': symbol, 'strategy': args.strategy, 'replay': summary}
+    if args.rates:
+        report['saturation'] = replay.saturation_curve(messages, args.rates)
+
+    total = summary['total']
+    print(f"{summary['events']} events at {summary['pace']}: {summary['throughput_per_s']:,.0f}/s, "
+          f"tick-to-trade p50 {total['p50']:.1f}us p99 {total['p99']:.1f}us p99.9 {total['p99.9']:.1f}us")
+    for point in report.get('saturation', []):
+        print(f"  offered {point['offered_per_s']:>10,.0f}/s  achieved {point['achieved_per_s']:>10,.0f}/s  "
+              f"p99 {point['total_p99']:>10.1f}us")
+    output_dir = os.path.dirname(args.output)
+    if output_dir:
+        os.makedirs(output_dir, exist_ok=True)
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=2)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,24 @@
+import importlib.util
+import sys
+
+# Deferred imports for heavy dependencies (pandas, numpy).
+# `pd = lazy_import('pandas')` registers a module object whose body only
+# runs on first attribute access, so importing a module that uses pandas
+# costs nothing until pandas is actually needed. After that first access
+# the module behaves exactly like a normal import.
+
+
+def lazy_import(name: str):
+    """Return `name` as a lazily executed module (or the real one if already imported)."""
+    module = sys.modules.get(name)
+    if module is not None:
+        return module
+    spec = importlib.util.find_spec(name)
+    if spec is None:
+        raise ModuleNotFoundError(f"No module named '{name}'", name=name)
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    return module
@@ -1,41 +1,99 @@
-import importlib
-import engine
+import argparse
+import json
+import os
+import sys
+import time
+from datetime import datetime
 
-importlib.reload(engine)
+from market_data import MarketData, MARKET_DATA_CSV
+from patterns.Singleton_ConfigAccess import STRATEGY_PARAMS_FILE
+from runner import STRATEGIES, run_jobs
 
-from patterns.Strategy_SignalGen import MeanReversionStrategy
-from patterns.Strategy_SignalGen import BreakoutStrategy
+# Command-line entry point for backtest runs.
+#   python main.py
+#   python main.py --strategies MeanReversionStrategy BreakoutStrategy \
+#                  --symbols AAPL MSFT --workers 4 --output reports/results.json
+#   python main.py --bars 1h        (backtest on hourly OHLCV bars)
+# Market data is loaded once; every strategy x symbol combination runs with
+# its own engine, across worker processes when --workers > 1, and the
+# results are written to one consolidated JSON file.
 
-# Initialize engine
-engine = engine.BacktestEngine(initial_capital=100000)
 
-# Load market data
-print("Loading market data...")
-df = engine.load_market_data()
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Run strategy x symbol backtests.")
+    parser.add_argument('--strategies', nargs='+', default=list(STRATEGIES), choices=list(STRATEGIES),
+                        help="strategies to run (default: all)")
+    parser.add_argument('--symbols', nargs='+', default=None,
+                        help="symbols to run (default: every symbol in the data)")
+    parser.add_argument('--data', default=MARKET_DATA_CSV, help="market data CSV")
+    parser.add_argument('--bars', default=None,
+                        help="resample ticks into OHLCV bars of this length first (e.g. 5min, 1h, 1D)")
+    parser.add_argument('--params', default=STRATEGY_PARAMS_FILE, help="strategy parameter file")
+    parser.add_argument('--workers', type=int, default=1, help="worker processes")
+    parser.add_argument('--capital', type=float, default=100000, help="initial capital per run")
+    parser.add_argument('--output', default='reports/backtest_results.json', help="consolidated results file")
+    parser.add_argument('--verbose', action='store_true', help="print every trade")
+    return parser.parse_args(argv)
 
-# Get unique symbols
-symbols = df['symbol'].unique()
-print(f"Found symbols: {symbols}")
 
-# Initialize strategies
-mean_reversion = MeanReversionStrategy()
-mean_reversion.load_params()
+def print_summary(results):
+    print(f"\n{'='*80}")
+    print("BACKTEST SUMMARY")
+    print(f"{'='*80}")
+    print(f"{'strategy':<24}{'symbol':<10}{'trades':>8}{'final value':>16}{'return %':>10}{'max DD %':>10}")
+    for r in results:
+        if 'error' in r:
+            print(f"{r['strategy']:<24}{r['symbol']:<10}  ERROR: {r['error']}")
+            continue
+        max_dd = (r.get('equity') or {}).get('max_drawdown')
+        max_dd_text = f"{max_dd * 100:.2f}" if max_dd is not None else 'n/a'
+        print(f"{r['strategy']:<24}{r['symbol']:<10}{r['total_trades']:>8}"
+              f"{r['final_portfolio_value']:>16,.2f}{r['total_return_pct']:>10.2f}{max_dd_text:>10}")
+    print(f"{'-'*80}")
 
-# ------------------------------------------------------------
-# strategy.set_strategy(mean_reversion)
-# ------------------------------------------------------------
 
-breakout = BreakoutStrategy()
-breakout.load_params()
+def main(argv=None) -> int:
+    args = parse_args(argv)
 
+    print("Loading market data...")
+    start = time.perf_counter()
+    data = MarketData.load(args.data)
+    if args.bars:
+        data = data.resample(args.bars)
+    symbols = args.symbols or data.symbols
+    missing = [s for s in symbols if s not in data]
+    if missing:
+        print(f"Symbols not in {args.data}: {', '.join(missing)}")
+        return 2
+    print(f"Found symbols: {data.symbols}")
 
-engine.backtest_strategy(mean_reversion, 'AAPL', df)
+    jobs = [(name, symbol, None) for name in args.strategies for symbol in symbols]
+    print(f"Running {len(jobs)} backtest(s) on {args.workers} worker(s)...")
+    results = run_jobs(jobs, data, workers=args.workers, initial_capital=args.capital,
+                       params_file=args.params, quiet=not args.verbose)
+    elapsed = time.perf_counter() - start
 
+    report = {
+        'created': datetime.now().isoformat(timespec='seconds'),
+        'data': os.path.abspath(args.data),
+        'bars': args.bars,
+        'strategies': args.strategies,
+        'symbols': symbols,
+        'workers': args.workers,
+        'initial_capital': args.capital,
+        'elapsed_seconds': elapsed,
+        'results': results,
+    }
+    output_dir = os.path.dirname(args.output)
+    if output_dir:
+        os.makedirs(output_dir, exist_ok=True)
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=2, default=str)
 
-# Overall summary
-print(f"\n{'='*80}")
-print("BACKTEST SUMMARY")
-print(f"{'='*80}")
-print(f"Total trades executed: {len(engine.trades)}")
-print(f"Final cash: ${engine.cash:,.2f}")
-print(f"Open positions: {sum(1 for p in engine.positions.values() if p.quantity > 0)}")
\ No newline at end of file
+    print_summary(results)
+    print(f"Results written to {args.output} ({elapsed:.2f}s)")
+    return 1 if any('error' in r for r in results) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,182 @@
+from __future__ import annotations
+
+import os
+from collections import OrderedDict
+from typing import Dict, List, Tuple
+
+from asof import Alignment, align_series, asof_values, clock_key, to_ns_delta
+from bars import bars_frame, freq_to_ns, resample_ohlcv
+from lazy_imports import lazy_import
+
+np = lazy_import('numpy')
+pd = lazy_import('pandas')
+
+# Per-symbol partition of the long-format market-data frame.
+# At load time the frame is sorted once by (symbol, timestamp), `symbol` is
+# converted to a categorical and each symbol's [start, end) row offsets are
+# recorded. Per-symbol access is then a dict lookup plus a slice, instead of
+# a boolean scan, sort and copy of the whole frame on every call.
+# OHLCV bars (bars.py) are built from the same slices and cached per
+# (symbol, bar length), and per bar length for the resampled MarketData.
+# As-of alignments of several symbols onto one clock (asof.py) are cached
+# per (symbols, clock, tolerance, ffill), keeping the ALIGNMENT_CACHE_SIZE
+# most recently used ones.
+
+MARKET_DATA_CSV = 'inputs/market_data.csv'
+ALIGNMENT_CACHE_SIZE = 16
+
+
+class MarketData:
+    """Market data sorted by (symbol, timestamp) with O(1) per-symbol slices."""
+
+    _cache: Dict[str, Tuple[Tuple[float, int], 'MarketData']] = {}
+
+    def __init__(self, df: pd.DataFrame):
+        df = df.copy()
+        df['timestamp'] = pd.to_datetime(df['timestamp']).dt.as_unit('ns')
+        df['symbol'] = df['symbol'].astype('category')
+
+        codes = df['symbol'].cat.codes.to_numpy()
+        timestamps = df['timestamp'].array.asi8
+        order = np.lexsort((timestamps, codes))  # stable: ties keep file order
+        self.frame = df.take(order).reset_index(drop=True)
+
+        codes = codes[order]
+        self._timestamps_ns = np.ascontiguousarray(timestamps[order])
+        self._prices = self.frame['price'].to_numpy(dtype=np.float64)
+        self._volumes = self.frame['volume'].to_numpy(dtype=np.float64) if 'volume' in self.frame else None
+        self._bars: Dict[Tuple[str, int], pd.DataFrame] = {}
+        self._resampled: Dict[int, 'MarketData'] = {}
+        self._alignments: 'OrderedDict[tuple, Alignment]' = OrderedDict()  # LRU, oldest first
+
+        # Boundaries where the symbol code changes
+        starts = np.flatnonzero(np.r_[True, codes[1:] != codes[:-1]]) if len(codes) else np.array([], dtype=np.int64)
+        ends = np.r_[starts[1:], len(codes)] if len(codes) else np.array([], dtype=np.int64)
+        categories = self.frame['symbol'].cat.categories
+        self._offsets: Dict[str, Tuple[int, int]] = {
+            str(categories[codes[start]]): (int(start), int(end)) for start, end in zip(starts, ends)
+        }
+
+    @classmethod
+    def load(cls, filepath: str = MARKET_DATA_CSV) -> 'MarketData':
+        """Load and partition market data from CSV."""
+        df = pd.read_csv(filepath)
+        df['timestamp'] = pd.to_datetime(df['timestamp'])
+        return cls(df)
+
+    @classmethod
+    def cached(cls, filepath: str = MARKET_DATA_CSV) -> 'MarketData':
+        """Load `filepath` once and reuse it until the file changes on disk."""
+        path = os.path.abspath(filepath)
+        stat = os.stat(path)
+        key = (stat.st_mtime, stat.st_size)
+        entry = cls._cache.get(path)
+        if entry is None or entry[0] != key:
+            entry = (key, cls.load(path))
+            cls._cache[path] = entry
+        return entry[1]
+
+    @classmethod
+    def clear_cache(cls):
+        cls._cache.clear()
+
+    @property
+    def symbols(self) -> List[str]:
+        return list(self._offsets)
+
+    def __contains__(self, symbol: str) -> bool:
+        return symbol in self._offsets
+
+    def __len__(self) -> int:
+        return len(self.frame)
+
+    def offsets(self, symbol: str) -> Tuple[int, int]:
+        """[start, end) row offsets of `symbol`, (0, 0) if it is not present."""
+        return self._offsets.get(symbol, (0, 0))
+
+    def get(self, symbol: str) -> pd.DataFrame:
+        """Rows of `symbol` in timestamp order, as a slice of the sorted frame."""
+        start, end = self.offsets(symbol)
+        return self.frame.iloc[start:end]
+
+    def prices(self, symbol: str) -> np.ndarray:
+        """Price column of `symbol` as a NumPy view."""
+        start, end = self.offsets(symbol)
+        return self._prices[start:end]
+
+    def timestamps(self, symbol: str) -> np.ndarray:
+        """Timestamps of `symbol` as a datetime64[ns] view."""
+        start, end = self.offsets(symbol)
+        return self._timestamps_ns[start:end].view('datetime64[ns]')
+
+    def timestamps_ns(self, symbol: str) -> np.ndarray:
+        """Timestamps of `symbol` as an int64 nanosecond view."""
+        start, end = self.offsets(symbol)
+        return self._timestamps_ns[start:end]
+
+    def price_at(self, symbol: str, timestamp) -> float:
+        """Price of `symbol` at exactly `timestamp`, or None if there is no such tick."""
+        ts = self.timestamps_ns(symbol)
+        target = pd.Timestamp(timestamp).value
+        i = int(np.searchsorted(ts, target))
+        if i < len(ts) and ts[i] == target:
+            start, _ = self.offsets(symbol)
+            return float(self._prices[start + i])
+        return None
+
+    def price_asof(self, symbol: str, timestamp, tolerance=None) -> float:
+        """Last price of `symbol` at or before `timestamp` (at most `tolerance` old), or None."""
+        target = np.array([pd.Timestamp(timestamp).value], dtype=np.int64)
+        price = asof_values(self.timestamps_ns(symbol), self.prices(symbol), target, tolerance)[0]
+        return None if np.isnan(price) else float(price)
+
+    def align(self, symbols: List[str], clock=None, tolerance=None, ffill: bool = True) -> Alignment:
+        """Prices of `symbols` as of a common clock; cached (LRU) per (symbols, clock, tolerance, ffill).
+
+        `clock` is None (union of the symbols' timestamps), a symbol name (its
+        timestamps) or an array of timestamps. The cached Alignment is
+        read-only and shared between callers.
+        """
+        if clock is None or isinstance(clock, str):
+            key_clock = clock
+        else:
+            clock = np.asarray(clock)
+            if clock.dtype.kind == 'M':
+                clock = clock.astype('datetime64[ns]').view(np.int64)
+            key_clock = clock_key(clock)
+        key = (tuple(symbols), key_clock, to_ns_delta(tolerance), ffill)
+        alignment = self._alignments.get(key)
+        if alignment is not None:
+            self._alignments.move_to_end(key)
+        else:
+            series = {s: (self.timestamps_ns(s), self.prices(s)) for s in symbols}
+            if isinstance(clock, str):
+                clock = self.timestamps_ns(clock)
+            alignment = align_series(series, clock, tolerance, ffill)
+            alignment.timestamps.setflags(write=False)
+            alignment.values.setflags(write=False)
+            self._alignments[key] = alignment
+            if len(self._alignments) > ALIGNMENT_CACHE_SIZE:
+                self._alignments.popitem(last=False)
+        return alignment
+
+    def bars(self, symbol: str, freq) -> pd.DataFrame:
+        """OHLCV bars of `symbol` at `freq` ('5min', '1h', '1D', ...), computed once per (symbol, freq)."""
+        key = (symbol, freq_to_ns(freq))
+        frame = self._bars.get(key)
+        if frame is None:
+            start, end = self.offsets(symbol)
+            volumes = self._volumes[start:end] if self._volumes is not None else None
+            bars = resample_ohlcv(self._timestamps_ns[start:end], self._prices[start:end], key[1], volumes)
+            frame = self._bars[key] = bars_frame(symbol, bars)
+        return frame
+
+    def resample(self, freq) -> 'MarketData':
+        """All symbols as `freq` bars, as a MarketData the engine can backtest on directly."""
+        bar_ns = freq_to_ns(freq)
+        data = self._resampled.get(bar_ns)
+        if data is None:
+            frames = [self.bars(symbol, bar_ns) for symbol in self.symbols]
+            frame = pd.concat(frames, ignore_index=True) if frames else bars_frame('', resample_ohlcv([], [], bar_ns))
+            data = self._resampled[bar_ns] = MarketData(frame)
+        return data
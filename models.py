@@ -9,3 +9,48 @@ class MarketDataPoint:
     symbol: str
     price: float
     daily_volume: Optional[float] = None
+
+
+@dataclass
+class Trade:
+    """Represents a single trade execution."""
+    timestamp: datetime
+    symbol: str
+    action: str  # 'BUY' or 'SELL'
+    price: float
+    quantity: int
+    cost: float  # Positive for buy, negative for sell
+    
+
+@dataclass
+class Position:
+    """Tracks a position in a symbol."""
+    symbol: str
+    quantity: int = 0
+    avg_cost: float = 0.0
+    total_cost: float = 0.0
+    
+    def update_position(self, action: str, price: float, quantity: int = 1):
+        """Update position based on trade action."""
+        if action == 'BUY':
+            # Calculate new average cost
+            new_cost = self.total_cost + (price * quantity)
+            self.quantity += quantity
+            self.total_cost = new_cost
+            self.avg_cost = new_cost / self.quantity if self.quantity > 0 else 0
+        elif action == 'SELL':
+            if self.quantity >= quantity:
+                self.quantity -= quantity
+                if self.quantity == 0:
+                    self.total_cost = 0
+                    self.avg_cost = 0
+                else:
+                    # Adjust average cost for remaining position
+                    remaining_value = self.avg_cost * self.quantity
+                    self.total_cost = remaining_value
+            else:
+                raise ValueError("Cannot sell more shares than owned")
+    
+    def get_current_value(self, current_price: float) -> float:
+        """Calculate current value of position."""
+        return self.quantity * current_price
@@ -0,0 +1,173 @@
+from __future__ import annotations
+
+from typing import Dict, Optional, Sequence
+
+from lazy_imports import lazy_import
+from patterns.Strategy_SignalGen import MeanReversionStrategy, BreakoutStrategy
+
+np = lazy_import('numpy')
+
+# Block-bootstrap Monte Carlo over a symbol's returns.
+# Paths are built by stitching together randomly chosen blocks of
+# consecutive historical returns (circular moving-block bootstrap, which
+# keeps short-range autocorrelation and volatility clustering), all as one
+# (paths x ticks) array per chunk. Metrics are computed across the path axis
+# in one go; strategies are replayed with their signal rule evaluated on
+# the whole chunk at once and the engine's fill rule (BUY with enough cash,
+# SELL with enough shares) stepped through time on vectors of paths. Paths
+# are processed `chunk_size` at a time, so memory stays bounded however many
+# paths are requested. The same seed and chunk_size give the same paths.
+
+METRICS = ('total_return', 'max_drawdown', 'sharpe')
+
+
+def block_bootstrap_indices(n: int, n_paths: int, block_size: int, rng) -> np.ndarray:
+    """(n_paths, n) indices into a length-n series, made of circular blocks of `block_size`."""
+    block_size = max(1, min(int(block_size), n))
+    n_blocks = -(-n // block_size)
+    starts = rng.integers(0, n, size=(n_paths, n_blocks))
+    idx = (starts[:, :, None] + np.arange(block_size)) % n
+    return idx.reshape(n_paths, n_blocks * block_size)[:, :n]
+
+
+def bootstrap_price_paths(prices, n_paths: int, block_size: int = 20, rng=None) -> np.ndarray:
+    """(n_paths, len(prices)) price paths starting at prices[0] with resampled simple returns."""
+    rng = rng if rng is not None else np.random.default_rng()
+    prices = np.asarray(prices, dtype=np.float64)
+    returns = prices[1:] / prices[:-1] - 1
+    idx = block_bootstrap_indices(len(returns), n_paths, block_size, rng)
+    paths = np.empty((n_paths, len(prices)), dtype=np.float64)
+    paths[:, 0] = prices[0]
+    np.cumprod(1 + returns[idx], axis=1, out=paths[:, 1:])
+    paths[:, 1:] *= prices[0]
+    return paths
+
+
+def path_metrics(equity: np.ndarray) -> Dict[str, np.ndarray]:
+    """Total return, max drawdown and per-tick Sharpe of every row of an equity array."""
+    total_return = equity[:, -1] / equity[:, 0] - 1
+    running_max = np.maximum.accumulate(equity, axis=1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        drawdowns = np.where(running_max > 0, (running_max - equity) / running_max, 0.0)
+        returns = np.diff(equity, axis=1) / equity[:, :-1]
+        std = returns.std(axis=1, ddof=1)
+        sharpe = np.where(std > 0, returns.mean(axis=1) / std, np.nan)
+    return {'total_return': total_return, 'max_drawdown': drawdowns.max(axis=1), 'sharpe': sharpe}
+
+
+def strategy_signals(strategy, paths: np.ndarray) -> np.ndarray:
+    """Signals of `strategy` on every path at once (int8, same shape as `paths`).
+
+    Same rules as MeanReversionStrategy / BreakoutStrategy.generate_signals;
+    the window mean is summed oldest to newest like the strategy's sum().
+    """
+    lookback = int(strategy.lookback_window)
+    threshold = float(strategy.threshold)
+    signals = np.zeros(paths.shape, dtype=np.int8)
+    if paths.shape[1] < lookback:
+        return signals
+    windows = np.lib.stride_tricks.sliding_window_view(paths, lookback, axis=1)
+    current = paths[:, lookback - 1:]
+    if isinstance(strategy, MeanReversionStrategy):
+        total = np.zeros(current.shape)
+        for j in range(lookback):
+            total += windows[:, :, j]
+        mean = total / lookback
+        deviation = (current - mean) / mean
+        buy, sell = deviation < -threshold, deviation > threshold
+    elif isinstance(strategy, BreakoutStrategy):
+        buy = current > windows.max(axis=2) * (1 + threshold)
+        sell = current < windows.min(axis=2) * (1 - threshold)
+    else:
+        raise ValueError(f"No vectorized signal rule for {strategy.__class__.__name__}")
+    out = signals[:, lookback - 1:]
+    out[buy] = 1
+    out[sell & ~buy] = -1
+    return signals
+
+
+def replay_signals(paths: np.ndarray, signals: np.ndarray, initial_cash: float = 100000.0,
+                   quantity: int = 1) -> np.ndarray:
+    """Equity of the engine's fill rule applied to `signals`, for all paths at once.
+
+    Returns (paths, ticks + 1); column 0 is the initial cash.
+    """
+    n_paths, n = paths.shape
+    cash = np.full(n_paths, float(initial_cash))
+    position = np.zeros(n_paths, dtype=np.int64)
+    equity = np.empty((n_paths, n + 1))
+    equity[:, 0] = initial_cash
+    for t in range(n):
+        price = paths[:, t]
+        signal = signals[:, t]
+        cost = price * quantity
+        buy = (signal == 1) & (cash >= cost)
+        sell = (signal == -1) & (position >= quantity)
+        cash += np.where(sell, cost, 0.0) - np.where(buy, cost, 0.0)
+        position += quantity * (buy.astype(np.int64) - sell)
+        equity[:, t + 1] = cash + position * price
+    return equity
+
+
+def confidence_intervals(metrics: Dict[str, np.ndarray], levels: Sequence[float] = (0.05, 0.5, 0.95)) -> Dict:
+    """Mean and percentiles of each metric, ignoring paths where it is undefined (NaN)."""
+    out = {}
+    for name, values in metrics.items():
+        values = values[~np.isnan(values)]
+        if len(values) == 0:
+            out[name] = None
+            continue
+        summary = {'mean': float(values.mean())}
+        for level, value in zip(levels, np.quantile(values, levels)):
+            summary[f"p{level * 100:g}"] = float(value)
+        out[name] = summary
+    return out
+
+
+class MonteCarloEngine:
+    """Block-bootstrap resampling of a price series with chunked, path-vectorized metrics."""
+
+    def __init__(self, n_paths: int = 10000, block_size: int = 20, seed: Optional[int] = None,
+                 chunk_size: int = 1000, levels: Sequence[float] = (0.05, 0.5, 0.95)):
+        if n_paths <= 0 or chunk_size <= 0:
+            raise ValueError("n_paths and chunk_size must be positive")
+        self.n_paths = n_paths
+        self.block_size = block_size
+        self.seed = seed
+        self.chunk_size = chunk_size
+        self.levels = tuple(levels)
+
+    def simulate(self, prices, strategy=None, initial_cash: float = 100000.0, quantity: int = 1) -> Dict:
+        """Resample `prices` and compute metrics per path.
+
+        Without a strategy the metrics are those of holding the instrument;
+        with one, of replaying its signals through the fill rule. Returns the
+        per-path metric arrays and their confidence intervals.
+        """
+        prices = np.asarray(prices, dtype=np.float64)
+        if len(prices) < 3:
+            raise ValueError("Need at least 3 prices to bootstrap returns")
+        rng = np.random.default_rng(self.seed)
+        metrics = {name: np.empty(self.n_paths) for name in METRICS}
+        for start in range(0, self.n_paths, self.chunk_size):
+            n = min(self.chunk_size, self.n_paths - start)
+            paths = bootstrap_price_paths(prices, n, self.block_size, rng)
+            if strategy is None:
+                equity = paths
+            else:
+                equity = replay_signals(paths, strategy_signals(strategy, paths), initial_cash, quantity)
+            for name, values in path_metrics(equity).items():
+                metrics[name][start:start + n] = values
+        return {
+            'n_paths': self.n_paths,
+            'block_size': self.block_size,
+            'strategy': strategy.__class__.__name__ if strategy is not None else None,
+            'metrics': metrics,
+            'intervals': confidence_intervals(metrics, self.levels),
+        }
+
+    def simulate_symbol(self, data, symbol: str, strategy=None, **kwargs) -> Dict:
+        """simulate() on one symbol of a MarketData."""
+        result = self.simulate(data.prices(symbol), strategy, **kwargs)
+        result['symbol'] = symbol
+        return result
@@ -0,0 +1,218 @@
+import math
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from kernels import KernelState, run_kernel
+from runner import make_strategy
+from walk_forward import DEFAULT_PARAM_GRIDS, OBJECTIVES, param_combinations
+
+# Adaptive parameter search: successive halving and Hyperband.
+# Every candidate parameter set starts on a short prefix of the price
+# series; after each rung only the best 1/eta of the candidates go on, and
+# the prefix grows by a factor of eta until the survivors have seen the
+# whole series. A survivor is never replayed: its kernel state (window,
+# cash, position) and running score are kept after each rung, and the next
+# rung runs the kernel only over the new ticks. Hyperband runs several
+# successive-halving brackets that trade the number of candidates against
+# the prefix they start on. Within a rung, candidates advance in parallel in
+# a process pool that receives the price array once, when it starts.
+
+# Price array of the current worker process, set by _init_worker
+_worker_prices: Optional[np.ndarray] = None
+
+
+@dataclass
+class Candidate:
+    """A parameter set with its kernel state and score after `ticks` ticks."""
+    params: Dict
+    state: Optional[KernelState] = None
+    ticks: int = 0
+    last_equity: float = 0.0
+    # Running sums of per-tick returns for the Sharpe objective
+    n_returns: int = 0
+    sum_returns: float = 0.0
+    sum_squares: float = 0.0
+    history: List[float] = field(default_factory=list)  # score after each rung
+
+    def score(self, objective: str, initial_capital: float) -> float:
+        if self.ticks == 0:
+            return -math.inf
+        if objective == 'total_return':
+            return self.last_equity / initial_capital - 1
+        if self.n_returns < 2:
+            return -math.inf
+        mean = self.sum_returns / self.n_returns
+        var = (self.sum_squares - self.n_returns * mean * mean) / (self.n_returns - 1)
+        return mean / math.sqrt(var) if var > 0 else -math.inf
+
+
+def advance(strategy_name: str, prices: np.ndarray, candidate: Candidate, end: int,
+            initial_capital: float = 100000, quantity: int = 1, backend: str = 'auto') -> Candidate:
+    """Run `candidate` from where it stopped up to tick `end`, continuing its kernel state."""
+    if end <= candidate.ticks:
+        return candidate
+    strategy = make_strategy(strategy_name, candidate.params, params_file=None)
+    if candidate.state is None:
+        candidate.last_equity = float(initial_capital)
+    result = run_kernel(strategy, prices[candidate.ticks:end], initial_capital, quantity,
+                        state=candidate.state, backend=backend)
+    values = np.concatenate(([candidate.last_equity], result.equity))
+    returns = np.diff(values) / values[:-1]
+    candidate.state = result.state
+    candidate.ticks = end
+    candidate.last_equity = float(result.equity[-1])
+    candidate.n_returns += len(returns)
+    candidate.sum_returns += float(returns.sum())
+    candidate.sum_squares += float(np.dot(returns, returns))
+    return candidate
+
+
+def _init_worker(prices: np.ndarray):
+    global _worker_prices
+    _worker_prices = prices
+
+
+def _advance_worker(strategy_name, candidate, end, initial_capital, quantity, backend):
+    return advance(strategy_name, _worker_prices, candidate, end, initial_capital, quantity, backend)
+
+
+def rung_budgets(n_ticks: int, n_rungs: int, eta: int) -> List[int]:
+    """Prefix lengths of `n_rungs` rungs, growing by `eta` and ending with the full series."""
+    budgets = [max(1, n_ticks // eta ** k) for k in range(n_rungs - 1, -1, -1)]
+    return sorted(set(budgets))
+
+
+def max_rungs(n_ticks: int, min_ticks: int, eta: int) -> int:
+    """Most rungs whose first prefix still has at least `min_ticks` ticks."""
+    n_rungs = 1
+    while n_ticks // eta ** n_rungs >= max(1, min_ticks):
+        n_rungs += 1
+    return n_rungs
+
+
+class _Executor:
+    """Runs the candidates of one rung in-process or on a pool sharing the price array."""
+
+    def __init__(self, strategy_name, prices, workers, initial_capital, quantity, backend):
+        self.args = (initial_capital, quantity, backend)
+        self.strategy_name = strategy_name
+        self.prices = prices
+        self.pool = None
+        self.ticks_evaluated = 0
+        if workers > 1:
+            self.pool = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(prices,))
+
+    def advance(self, candidates: List[Candidate], end: int) -> List[Candidate]:
+        self.ticks_evaluated += sum(max(end - c.ticks, 0) for c in candidates)
+        if self.pool is None or len(candidates) <= 1:
+            return [advance(self.strategy_name, self.prices, c, end, *self.args) for c in candidates]
+        futures = [self.pool.submit(_advance_worker, self.strategy_name, c, end, *self.args) for c in candidates]
+        return [future.result() for future in futures]
+
+    def close(self):
+        if self.pool is not None:
+            self.pool.shutdown()
+
+
+def _halving(executor: _Executor, candidates: List[Candidate], budgets: Sequence[int], eta: int,
+             objective: str, initial_capital: float, rungs: List[Dict], bracket: int) -> List[Candidate]:
+    for i, budget in enumerate(budgets):
+        candidates = executor.advance(candidates, budget)
+        scored = sorted(candidates, key=lambda c: c.score(objective, initial_capital), reverse=True)
+        for c in scored:
+            c.history.append(c.score(objective, initial_capital))
+        rungs.append({'bracket': bracket, 'ticks': budget, 'candidates': len(candidates),
+                      'best_score': scored[0].score(objective, initial_capital)})
+        if i < len(budgets) - 1:
+            candidates = scored[:max(1, len(scored) // eta)]
+        else:
+            candidates = scored
+    return candidates
+
+
+def _summary(strategy_name, objective, initial_capital, finalists, rungs, n_ticks, n_configs,
+             ticks_evaluated) -> Dict:
+    best = max(finalists, key=lambda c: c.score(objective, initial_capital))
+    return {
+        'strategy': strategy_name,
+        'objective': objective,
+        'best_params': best.params,
+        'best_score': best.score(objective, initial_capital),
+        'best_return': best.last_equity / initial_capital - 1,
+        'rungs': rungs,
+        'configs_evaluated': n_configs,
+        'ticks_evaluated': ticks_evaluated,
+        'grid_ticks': n_configs * n_ticks,  # cost of running every config on the full series
+    }
+
+
+def successive_halving(strategy_name: str, prices, param_grid: Optional[Dict[str, Sequence]] = None,
+                       candidates: Optional[List[Dict]] = None, min_ticks: Optional[int] = None, eta: int = 3,
+                       objective: str = 'sharpe', initial_capital: float = 100000, quantity: int = 1,
+                       workers: int = 1, backend: str = 'auto') -> Dict:
+    """Successive halving over `candidates` (default: every combination of `param_grid`)."""
+    if objective not in OBJECTIVES:
+        raise ValueError(f"Unknown objective: {objective} (choose from {', '.join(OBJECTIVES)})")
+    if eta < 2:
+        raise ValueError("eta must be at least 2")
+    prices = np.ascontiguousarray(prices, dtype=np.float64)
+    if candidates is None:
+        candidates = param_combinations(param_grid or DEFAULT_PARAM_GRIDS[strategy_name])
+    # Enough rungs to get down to a single candidate, unless the first prefix would be too short
+    n_rungs, remaining = 1, len(candidates)
+    while remaining >= eta:
+        remaining //= eta
+        n_rungs += 1
+    if min_ticks:
+        n_rungs = min(n_rungs, max_rungs(len(prices), min_ticks, eta))
+    budgets = rung_budgets(len(prices), n_rungs, eta)
+
+    executor = _Executor(strategy_name, prices, workers, initial_capital, quantity, backend)
+    rungs: List[Dict] = []
+    try:
+        finalists = _halving(executor, [Candidate(dict(p)) for p in candidates], budgets, eta,
+                             objective, initial_capital, rungs, bracket=0)
+    finally:
+        executor.close()
+    return _summary(strategy_name, objective, initial_capital, finalists, rungs, len(prices), len(candidates),
+                    executor.ticks_evaluated)
+
+
+def hyperband(strategy_name: str, prices, param_grid: Optional[Dict[str, Sequence]] = None,
+              min_ticks: int = 500, eta: int = 3, objective: str = 'sharpe', initial_capital: float = 100000,
+              quantity: int = 1, workers: int = 1, backend: str = 'auto', seed: Optional[int] = None) -> Dict:
+    """Hyperband: successive-halving brackets from many configs on short prefixes to few on long ones.
+
+    Configs for each bracket are drawn from the grid without replacement
+    (the whole grid when a bracket asks for more than it has).
+    """
+    if objective not in OBJECTIVES:
+        raise ValueError(f"Unknown objective: {objective} (choose from {', '.join(OBJECTIVES)})")
+    if eta < 2:
+        raise ValueError("eta must be at least 2")
+    prices = np.ascontiguousarray(prices, dtype=np.float64)
+    grid = param_combinations(param_grid or DEFAULT_PARAM_GRIDS[strategy_name])
+    rng = np.random.default_rng(seed)
+    n_ticks = len(prices)
+    s_max = max_rungs(n_ticks, min_ticks, eta) - 1
+
+    executor = _Executor(strategy_name, prices, workers, initial_capital, quantity, backend)
+    rungs: List[Dict] = []
+    finalists: List[Candidate] = []
+    n_configs = 0
+    try:
+        for bracket, s in enumerate(range(s_max, -1, -1)):
+            n = min(len(grid), int(math.ceil((s_max + 1) / (s + 1) * eta ** s)))
+            picks = rng.choice(len(grid), size=n, replace=False)
+            budgets = rung_budgets(n_ticks, s + 1, eta)
+            survivors = _halving(executor, [Candidate(dict(grid[i])) for i in picks], budgets, eta,
+                                 objective, initial_capital, rungs, bracket)
+            finalists.extend(survivors)
+            n_configs += n
+    finally:
+        executor.close()
+    return _summary(strategy_name, objective, initial_capital, finalists, rungs, n_ticks, n_configs,
+                    executor.ticks_evaluated)
@@ -1,6 +1,9 @@
+import threading
 from abc import ABC, abstractmethod
 from datetime import datetime
 
+from models import Trade, Position
+
 class Command(ABC):
     """Abstract command interface."""
     
@@ -55,7 +58,6 @@ class ExecuteOrderCommand(Command):
             if self.engine.cash >= cost:
                 self.engine.cash -= cost
                 if self.symbol not in self.engine.positions:
-                    from engine import Position
                     self.engine.positions[self.symbol] = Position(symbol=self.symbol)
                 self.engine.positions[self.symbol].update_position('BUY', self.price, self.quantity)
                 self._add_trade()
@@ -110,7 +112,6 @@ class ExecuteOrderCommand(Command):
     
     def _add_trade(self):
         """Add trade to engine's trade history."""
-        from engine import Trade
         cost = self.price * self.quantity if self.action == 'BUY' else -self.price * self.quantity
         trade = Trade(
             timestamp=self.timestamp,
@@ -139,41 +140,49 @@ class UndoOrderCommand(Command):
 
 
 class CommandInvoker:
-    """Manages command history for undo/redo functionality."""
+    """Manages command history for undo/redo functionality.
+
+    Execute, undo and redo run under one re-entrant lock, so commands from
+    several threads are applied (and recorded in history) one at a time.
+    """
     
     def __init__(self):
         self.history = []
         self.current_index = -1
+        self._lock = threading.RLock()
     
     def execute_command(self, command: Command) -> bool:
         """Execute a command and add to history."""
-        # Remove any commands after current_index (branched undo scenario)
-        if self.current_index < len(self.history) - 1:
-            self.history = self.history[:self.current_index + 1]
-        
-        if command.execute():
-            self.history.append(command)
-            self.current_index += 1
-            return True
-        return False
+        with self._lock:
+            # Remove any commands after current_index (branched undo scenario)
+            if self.current_index < len(self.history) - 1:
+                self.history = self.history[:self.current_index + 1]
+            
+            if command.execute():
+                self.history.append(command)
+                self.current_index += 1
+                return True
+            return False
     
     def undo(self) -> bool:
         """Undo the last executed command."""
-        if self.current_index >= 0:
-            command = self.history[self.current_index]
-            if command.undo():
-                self.current_index -= 1
-                return True
-        return False
+        with self._lock:
+            if self.current_index >= 0:
+                command = self.history[self.current_index]
+                if command.undo():
+                    self.current_index -= 1
+                    return True
+            return False
     
     def redo(self) -> bool:
         """Redo the next command in history."""
-        if self.current_index < len(self.history) - 1:
-            next_command = self.history[self.current_index + 1]
-            if next_command.execute():
-                self.current_index += 1
-                return True
-        return False
+        with self._lock:
+            if self.current_index < len(self.history) - 1:
+                next_command = self.history[self.current_index + 1]
+                if next_command.execute():
+                    self.current_index += 1
+                    return True
+            return False
     
     def get_history_length(self) -> int:
         """Get total number of commands in history."""
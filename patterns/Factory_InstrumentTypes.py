@@ -1,12 +1,17 @@
 import csv
+import io
+from typing import Dict, Iterator, List, Optional
 
 # Implement InstrumentFactory.create_instrument(data: dict) -> Instrument.
 # Support at least three instrument types with appropriate attributes.
 # Demonstrate instantiation from instruments.csv.
 
 class Instrument:
+    # Slotted so large universes don't pay for a per-object __dict__;
+    # the source row is not kept once the attributes are parsed.
+    __slots__ = ('symbol', 'price', 'sector', 'issuer', 'instrument_type')
+
     def __init__(self, data: dict):
-        self.data = data
         self.symbol = data.get('symbol')
         self.price = float(data.get('price', 0)) if data.get('price') else 0
         self.sector = data.get('sector')
@@ -43,20 +48,128 @@ class InstrumentFactory:
                     print(f"Error creating instrument from {row}: {e}")
         return instruments
 
+    @staticmethod
+    def from_security_master(master, symbol: str) -> Instrument:
+        """Create the instrument for `symbol` from a columnar SecurityMaster row."""
+        return InstrumentFactory.create_instrument(master.record(symbol))
+
+    @staticmethod
+    def load_registry(filepath: str) -> 'InstrumentRegistry':
+        """Index `filepath` by symbol without creating any instruments yet."""
+        return InstrumentRegistry(filepath)
+
+
+class InstrumentRegistry:
+    """Lazy, interned instrument lookup over a security-master CSV.
+
+    Building the registry only scans the file once to record the byte offset
+    of each symbol's row. An instrument is created by InstrumentFactory the
+    first time its symbol is looked up and the same object is returned on
+    every later lookup. Rows are assumed to be one per line (no embedded
+    newlines), as in instruments.csv.
+    """
+
+    def __init__(self, filepath: str, encoding: str = 'utf-8-sig'):
+        self.filepath = filepath
+        self.encoding = encoding
+        self._offsets: Dict[str, int] = {}
+        self._instances: Dict[str, Instrument] = {}
+        self._file = None
+        self._build_index()
+
+    def _build_index(self):
+        with open(self.filepath, 'rb') as f:
+            header = f.readline()
+            # Excel exports start with a BOM; it must not end up in the first field name
+            self.fieldnames = next(csv.reader([header.decode(self.encoding).lstrip('\ufeff')]))
+            symbol_col = self.fieldnames.index('symbol')
+            offset = len(header)
+            for line in f:
+                if line.strip():
+                    if b'"' in line:
+                        symbol = next(csv.reader([line.decode(self.encoding)]))[symbol_col]
+                    else:
+                        symbol = line.split(b',', symbol_col + 1)[symbol_col].decode(self.encoding).strip()
+                    # Keep the first row of a duplicated symbol
+                    self._offsets.setdefault(symbol, offset)
+                offset += len(line)
+
+    def _read_row(self, offset: int) -> dict:
+        if self._file is None:
+            self._file = open(self.filepath, 'rb')
+        self._file.seek(offset)
+        line = self._file.readline().decode(self.encoding)
+        values = next(csv.reader(io.StringIO(line)))
+        return dict(zip(self.fieldnames, values))
+
+    def get(self, symbol: str) -> Optional[Instrument]:
+        """Return the instrument for `symbol`, creating it on first access, or None."""
+        instrument = self._instances.get(symbol)
+        if instrument is not None:
+            return instrument
+        offset = self._offsets.get(symbol)
+        if offset is None:
+            return None
+        instrument = InstrumentFactory.create_instrument(self._read_row(offset))
+        self._instances[symbol] = instrument
+        return instrument
+
+    def __getitem__(self, symbol: str) -> Instrument:
+        instrument = self.get(symbol)
+        if instrument is None:
+            raise KeyError(symbol)
+        return instrument
+
+    def __contains__(self, symbol: str) -> bool:
+        return symbol in self._offsets
+
+    def __len__(self) -> int:
+        return len(self._offsets)
+
+    def __iter__(self) -> Iterator[Instrument]:
+        """Iterate all instruments in file order, creating them as needed."""
+        for symbol in self._offsets:
+            yield self[symbol]
+
+    def symbols(self) -> List[str]:
+        return list(self._offsets)
+
+    def loaded_count(self) -> int:
+        """Number of instruments materialized so far."""
+        return len(self._instances)
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
+
 # Instruments
 
 class Stock(Instrument):
+    __slots__ = ()
+
     def __init__(self, data: dict):
         super().__init__(data)
         self.instrument_type = 'stock'
 
 class Bond(Instrument):
+    __slots__ = ('maturity',)
+
     def __init__(self, data: dict):
         super().__init__(data)
         self.instrument_type = 'bond'
         self.maturity = data.get('maturity')
         
 class ETF(Instrument):
+    __slots__ = ()
+
     def __init__(self, data: dict):
         super().__init__(data)
         self.instrument_type = 'etf'
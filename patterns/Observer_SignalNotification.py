@@ -2,6 +2,7 @@ from abc import ABC, abstractmethod
 from datetime import datetime
 from typing import Dict, List
 import json
+import threading
 
 # Problem: Notify external modules when signals are generated.
 # Expectations:
@@ -11,6 +12,10 @@ import json
 # LoggerObserver: logs signals
 # AlertObserver: alerts on large trades
 # Demonstrate dynamic observer registration and notification.
+#
+# attach/detach replace the observer list under a lock (copy-on-write), so
+# notify can iterate the current list without locking while other threads
+# register or remove observers.
 
 class Observer(ABC):
     """Abstract observer interface for signal notifications."""
@@ -31,18 +36,23 @@ class SignalPublisher:
     
     def __init__(self):
         self.observers: List[Observer] = []
+        self._lock = threading.Lock()
     
     def attach(self, observer: Observer):
         """Attach an observer to receive notifications."""
-        if observer not in self.observers:
-            self.observers.append(observer)
-            print(f"Observer {observer.__class__.__name__} attached")
+        with self._lock:
+            if observer in self.observers:
+                return
+            self.observers = self.observers + [observer]
+        print(f"Observer {observer.__class__.__name__} attached")
     
     def detach(self, observer: Observer):
         """Remove an observer from notifications."""
-        if observer in self.observers:
-            self.observers.remove(observer)
-            print(f"Observer {observer.__class__.__name__} detached")
+        with self._lock:
+            if observer not in self.observers:
+                return
+            self.observers = [o for o in self.observers if o is not observer]
+        print(f"Observer {observer.__class__.__name__} detached")
     
     def notify(self, signal: Dict):
         """Notify all registered observers about a signal."""
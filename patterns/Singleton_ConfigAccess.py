@@ -1,26 +1,208 @@
 import json
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional
 
 # Problem: Centralize system configuration (e.g., logging level, strategy parameters).
 # Expectations:
 # Implement a Singleton Config class.
 # Load settings from config.json.
 # Ensure all modules access the same instance.
+#
+# The singleton owns every config file (config.json and strategy_params.json),
+# caches the parsed JSON together with typed, immutable views, and reloads a
+# file only when its mtime/size change. Accessors look for changes at most
+# once per `check_interval` seconds (maybe_reload); reload() looks right away.
+# Readers get the current snapshot without locking; reloads swap snapshots
+# under a lock and then call the registered change listeners.
+
+CONFIG_FILE = 'inputs/config.json'
+STRATEGY_PARAMS_FILE = 'inputs/strategy_params.json'
+
+
+@dataclass(frozen=True)
+class Settings:
+    """Typed view of config.json."""
+    log_level: str = 'INFO'
+    data_path: str = './data/'
+    report_path: str = './reports/'
+    default_strategy: Optional[str] = None
+    raw: Dict = field(default_factory=dict, repr=False, compare=False)
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'Settings':
+        return cls(
+            log_level=data.get('log_level', 'INFO'),
+            data_path=data.get('data_path', './data/'),
+            report_path=data.get('report_path', './reports/'),
+            default_strategy=data.get('default_strategy'),
+            raw=data,
+        )
+
+
+@dataclass(frozen=True)
+class StrategyParams:
+    """Typed view of one strategy's entry in strategy_params.json."""
+    name: str
+    lookback_window: Optional[int] = None
+    threshold: Optional[float] = None
+    raw: Dict = field(default_factory=dict, repr=False, compare=False)
+
+    @classmethod
+    def from_dict(cls, name: str, data: Dict) -> 'StrategyParams':
+        lookback = data.get('lookback_window')
+        threshold = data.get('threshold')
+        return cls(
+            name=name,
+            lookback_window=int(lookback) if lookback is not None else None,
+            threshold=float(threshold) if threshold is not None else None,
+            raw=data,
+        )
+
+
+class _CachedFile:
+    """Parsed contents of one JSON file plus the stat signature it was read at."""
+    __slots__ = ('path', 'signature', 'data', 'view')
+
+    def __init__(self, path: str, signature, data, view):
+        self.path = path
+        self.signature = signature
+        self.data = data
+        self.view = view
+
 
 class Config:
 
     _instance = None
     _initialized = False
+    _lock = threading.RLock()
 
     def __new__(cls):
         if cls._instance is None:
-            cls._instance = super(Config, cls).__new__(cls)
+            with cls._lock:
+                if cls._instance is None:
+                    cls._instance = super(Config, cls).__new__(cls)
         return cls._instance
 
-    def __init__(self): #idk if we need this
-        if not Config._initialized:
-            self.config = self.load_config()
+    def __init__(self):
+        if Config._initialized:
+            return
+        with Config._lock:
+            if Config._initialized:
+                return
+            self._files: Dict[str, _CachedFile] = {}
+            self._listeners: List[Callable] = []
+            self.check_interval = 1.0  # seconds between mtime checks in maybe_reload()
+            self._last_check = time.monotonic()
+            if os.path.exists(CONFIG_FILE):
+                self.config = self.load_config()
+            else:
+                # Strategy params can still be served without a config.json
+                self._apply_settings(_CachedFile(None, None, {}, ('settings', Settings())))
             Config._initialized = True
 
-    def load_config(self, filepath: str = 'inputs/config.json'):
-        with open(filepath, 'r') as f:
-            return json.load(f)
\ No newline at end of file
+    # Loading
+
+    @staticmethod
+    def _signature(path: str):
+        stat = os.stat(path)
+        return (stat.st_mtime_ns, stat.st_size)
+
+    @staticmethod
+    def _build_view(kind: str, data: Dict):
+        if kind == 'settings':
+            return Settings.from_dict(data)
+        return {name: StrategyParams.from_dict(name, params) for name, params in data.items()}
+
+    def _load(self, filepath: str, kind: str) -> _CachedFile:
+        path = os.path.abspath(filepath)
+        entry = self._files.get(path)
+        if entry is not None:
+            # Hot path: the cached entry; files are re-stat'ed at most once per check_interval
+            if self.maybe_reload():
+                entry = self._files[path]
+            return entry
+        with Config._lock:
+            entry = self._files.get(path)
+            if entry is None:
+                signature = self._signature(path)
+                with open(path, 'r') as f:
+                    data = json.load(f)
+                entry = _CachedFile(path, signature, data, (kind, self._build_view(kind, data)))
+                self._files[path] = entry
+                if kind == 'settings' and os.path.abspath(CONFIG_FILE) == path:
+                    self._apply_settings(entry)
+        return entry
+
+    def _apply_settings(self, entry: _CachedFile):
+        # Precomputed attributes for hot paths
+        self.config = entry.data
+        self.settings: Settings = entry.view[1]
+        self.log_level = self.settings.log_level
+        self.data_path = self.settings.data_path
+        self.report_path = self.settings.report_path
+        self.default_strategy = self.settings.default_strategy
+
+    def load_config(self, filepath: str = CONFIG_FILE):
+        return self._load(filepath, 'settings').data
+
+    def load_strategy_params(self, filepath: str = STRATEGY_PARAMS_FILE) -> Dict[str, StrategyParams]:
+        """All strategy parameter sets in `filepath`, parsed once and cached."""
+        return self._load(filepath, 'strategy_params').view[1]
+
+    def get_strategy_params(self, name: str, filepath: str = STRATEGY_PARAMS_FILE) -> StrategyParams:
+        """Typed parameters for strategy `name`; KeyError if the file has no such entry."""
+        return self.load_strategy_params(filepath)[name]
+
+    # Hot reload
+
+    def reload(self) -> List[str]:
+        """Re-read every cached file whose mtime or size changed.
+
+        Returns the changed paths and notifies listeners if there were any.
+        """
+        changed = []
+        with Config._lock:
+            for path, entry in list(self._files.items()):
+                try:
+                    signature = self._signature(path)
+                except OSError:
+                    continue  # keep the last good snapshot if the file disappears
+                if signature == entry.signature:
+                    continue
+                try:
+                    with open(path, 'r') as f:
+                        data = json.load(f)
+                except (OSError, ValueError):
+                    continue  # half-written file: try again on the next check
+                kind = entry.view[0]
+                new_entry = _CachedFile(path, signature, data, (kind, self._build_view(kind, data)))
+                self._files[path] = new_entry
+                if kind == 'settings' and os.path.abspath(CONFIG_FILE) == path:
+                    self._apply_settings(new_entry)
+                changed.append(path)
+            self._last_check = time.monotonic()
+            listeners = list(self._listeners)
+        if changed:
+            for listener in listeners:
+                listener(self, changed)
+        return changed
+
+    def maybe_reload(self) -> List[str]:
+        """Call reload() at most once per `check_interval` seconds."""
+        if time.monotonic() - self._last_check < self.check_interval:
+            return []
+        return self.reload()
+
+    def add_listener(self, callback: Callable):
+        """Register `callback(config, changed_paths)` to run after a reload changes something."""
+        with Config._lock:
+            if callback not in self._listeners:
+                self._listeners.append(callback)
+
+    def remove_listener(self, callback: Callable):
+        with Config._lock:
+            if callback in self._listeners:
+                self._listeners.remove(callback)
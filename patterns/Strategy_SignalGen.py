@@ -1,7 +1,8 @@
-import json
+from indicators import SMA, RollingMax, RollingMin
 from models import MarketDataPoint
 
 from patterns.Observer_SignalNotification import SignalPublisher
+from patterns.Singleton_ConfigAccess import Config, STRATEGY_PARAMS_FILE
 
 # Problem: Support interchangeable trading strategies.
 # Expectations:
@@ -12,14 +13,38 @@ from patterns.Observer_SignalNotification import SignalPublisher
 # Each maintains internal state and uses parameters from strategy_params.json.
 # Demonstrate strategy interchangeability and signal generation.
 # Returns: 1 for BUY, -1 for SELL, 0 for NO ACTION
+# With an IndicatorGraph attached (indicators.py) a strategy reads its rolling
+# statistics from the shared graph instead of its own price_history.
 
 from abc import ABC, abstractmethod
 
 class Strategy(ABC):
+    indicator_graph = None  # set by IndicatorGraph.attach
+
     @abstractmethod
     def generate_signals(self, tick: MarketDataPoint) -> int:
         pass
 
+    def indicators(self) -> tuple:
+        """Indicators this strategy reads when an IndicatorGraph is attached."""
+        return ()
+
+    def get_state(self) -> dict:
+        """Internal state needed to resume signal generation: {symbol: [prices]}.
+
+        With an IndicatorGraph attached the prices live in the graph, so its history is saved.
+        """
+        if self.indicator_graph is not None:
+            return self.indicator_graph.get_state()
+        return {symbol: list(prices) for symbol, prices in getattr(self, 'price_history', {}).items()}
+
+    def set_state(self, state: dict):
+        """Restore state produced by get_state."""
+        if self.indicator_graph is not None:
+            self.indicator_graph.set_state(state)
+            return
+        self.price_history = {symbol: list(prices) for symbol, prices in state.items()}
+
 class MeanReversionStrategy(Strategy):
     def __init__(self, lookback_window: int = 20, threshold: float = 0.02):
         self.lookback_window = lookback_window
@@ -30,13 +55,15 @@ class MeanReversionStrategy(Strategy):
         self.strategy_name = 'MeanReversionStrategy'
 
 
-    def load_params(self, filepath: str = 'inputs/strategy_params.json'):
-        with open(filepath, 'r') as f:
-            params = json.load(f)
-        
-        self.lookback_window = params['MeanReversionStrategy'].get('lookback_window', 20)
-        self.threshold = params['MeanReversionStrategy'].get('threshold', 0.02)
-    
+    def load_params(self, filepath: str = STRATEGY_PARAMS_FILE):
+        # Parsed once and cached by the Config singleton
+        params = Config().get_strategy_params('MeanReversionStrategy', filepath)
+        self.lookback_window = params.lookback_window if params.lookback_window is not None else 20
+        self.threshold = params.threshold if params.threshold is not None else 0.02
+
+    def indicators(self) -> tuple:
+        return (SMA(self.lookback_window),)
+
     def generate_signals(self, tick: MarketDataPoint) -> int:
         """
         Generate signals based on mean reversion strategy.
@@ -46,23 +73,29 @@ class MeanReversionStrategy(Strategy):
         """
         symbol = tick.symbol
         price = tick.price
-        
-        # Initialize price history for this symbol if needed
-        if symbol not in self.price_history:
-            self.price_history[symbol] = []
-        
-        # Update price history
-        self.price_history[symbol].append(price)
-        
-        # Only generate signals if we have enough data
-        if len(self.price_history[symbol]) < self.lookback_window:
-            return 0  # NO ACTION - not enough data
-        
-        # Keep only the last lookback_window prices
-        self.price_history[symbol] = self.price_history[symbol][-self.lookback_window:]
-        
-        # Calculate mean price over lookback window
-        mean_price = sum(self.price_history[symbol]) / len(self.price_history[symbol])
+
+        if self.indicator_graph is not None:
+            # Shared rolling mean, computed once per tick for all strategies
+            mean_price = self.indicator_graph.on_tick(tick, self)[SMA(self.lookback_window)]
+            if mean_price is None:
+                return 0  # NO ACTION - not enough data
+        else:
+            # Initialize price history for this symbol if needed
+            if symbol not in self.price_history:
+                self.price_history[symbol] = []
+
+            # Update price history
+            self.price_history[symbol].append(price)
+
+            # Only generate signals if we have enough data
+            if len(self.price_history[symbol]) < self.lookback_window:
+                return 0  # NO ACTION - not enough data
+
+            # Keep only the last lookback_window prices
+            self.price_history[symbol] = self.price_history[symbol][-self.lookback_window:]
+
+            # Calculate mean price over lookback window
+            mean_price = sum(self.price_history[symbol]) / len(self.price_history[symbol])
         
         # Calculate deviation from mean
         deviation = (price - mean_price) / mean_price
@@ -110,13 +143,15 @@ class BreakoutStrategy(Strategy):
         self.publisher = SignalPublisher()
         self.strategy_name = 'BreakoutStrategy'
     
-    def load_params(self, filepath: str = 'inputs/strategy_params.json'):
-        with open(filepath, 'r') as f:
-            params = json.load(f)
-        
-        self.lookback_window = params['BreakoutStrategy'].get('lookback_window', 15)
-        self.threshold = params['BreakoutStrategy'].get('threshold', 0.03)
-    
+    def load_params(self, filepath: str = STRATEGY_PARAMS_FILE):
+        # Parsed once and cached by the Config singleton
+        params = Config().get_strategy_params('BreakoutStrategy', filepath)
+        self.lookback_window = params.lookback_window if params.lookback_window is not None else 15
+        self.threshold = params.threshold if params.threshold is not None else 0.03
+
+    def indicators(self) -> tuple:
+        return (RollingMax(self.lookback_window), RollingMin(self.lookback_window))
+
     def generate_signals(self, tick: MarketDataPoint) -> int:
         """
         Generate signals based on breakout strategy.
@@ -126,25 +161,33 @@ class BreakoutStrategy(Strategy):
         """
         symbol = tick.symbol
         price = tick.price
-        
-        # Initialize price history for this symbol if needed
-        if symbol not in self.price_history:
-            self.price_history[symbol] = []
-        
-        # Update price history
-        self.price_history[symbol].append(price)
-        
-        # Only generate signals if we have enough data
-        if len(self.price_history[symbol]) < self.lookback_window:
-            return 0  # NO ACTION - not enough data
-        
-        # Keep only the last lookback_window prices
-        recent_prices = self.price_history[symbol][-self.lookback_window:]
-        self.price_history[symbol] = recent_prices
-        
-        # Calculate high and low over lookback window
-        high_price = max(recent_prices)
-        low_price = min(recent_prices)
+
+        if self.indicator_graph is not None:
+            # Shared rolling high / low, computed once per tick for all strategies
+            values = self.indicator_graph.on_tick(tick, self)
+            high_price = values[RollingMax(self.lookback_window)]
+            low_price = values[RollingMin(self.lookback_window)]
+            if high_price is None:
+                return 0  # NO ACTION - not enough data
+        else:
+            # Initialize price history for this symbol if needed
+            if symbol not in self.price_history:
+                self.price_history[symbol] = []
+
+            # Update price history
+            self.price_history[symbol].append(price)
+
+            # Only generate signals if we have enough data
+            if len(self.price_history[symbol]) < self.lookback_window:
+                return 0  # NO ACTION - not enough data
+
+            # Keep only the last lookback_window prices
+            recent_prices = self.price_history[symbol][-self.lookback_window:]
+            self.price_history[symbol] = recent_prices
+
+            # Calculate high and low over lookback window
+            high_price = max(recent_prices)
+            low_price = min(recent_prices)
         
         # Calculate breakout thresholds
         upward_breakout = high_price * (1 + self.threshold)
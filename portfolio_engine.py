@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+from typing import Dict, Mapping, Optional, Sequence, Union
+
+from engine import BacktestEngine
+from equity_curve import EquityCurve
+from indicators import IndicatorGraph
+from models import MarketDataPoint
+from patterns.Strategy_SignalGen import Strategy
+
+# Several strategies backtested in one pass over a symbol's data.
+# Each strategy trades its own sub-book (a BacktestEngine funded with its
+# allocation of the capital), so cash, positions and trades never mix. Every
+# tick is built once and handed to all strategies in turn; the symbol's rows
+# are read as plain arrays instead of through iterrows. At the end the
+# sub-book curves are summed, together with any unallocated cash, into a
+# combined book. Rolling indicators the strategies declare are computed once
+# per tick in a shared IndicatorGraph (indicators.py), so strategies asking
+# for the same SMA(n) or max/min(n) do not each recompute it.
+
+
+def _name_strategies(strategies: Sequence[Strategy]) -> Dict[str, Strategy]:
+    """Key strategies by class name; repeated classes become 'Name#2', 'Name#3', ..."""
+    named: Dict[str, Strategy] = {}
+    counts: Dict[str, int] = {}
+    for strategy in strategies:
+        name = strategy.__class__.__name__
+        counts[name] = counts.get(name, 0) + 1
+        named[name if counts[name] == 1 else f"{name}#{counts[name]}"] = strategy
+    return named
+
+
+class MultiStrategyEngine:
+    """Runs many strategies over the same ticks with isolated, allocation-weighted sub-books."""
+
+    def __init__(self, strategies: Union[Mapping[str, Strategy], Sequence[Strategy]],
+                 allocations: Optional[Mapping[str, float]] = None, initial_capital: float = 100000,
+                 share_indicators: bool = True):
+        if not isinstance(strategies, Mapping):
+            strategies = _name_strategies(strategies)
+        if not strategies:
+            raise ValueError("At least one strategy is required")
+        if allocations is None:
+            allocations = {name: 1.0 / len(strategies) for name in strategies}
+        unknown = set(allocations) - set(strategies)
+        if unknown:
+            raise ValueError(f"Allocations for unknown strategies: {', '.join(sorted(unknown))}")
+        if any(w < 0 for w in allocations.values()) or sum(allocations.values()) > 1 + 1e-9:
+            raise ValueError("Allocations must be non-negative and sum to at most 1")
+
+        self.initial_capital = initial_capital
+        self.strategies: Dict[str, Strategy] = dict(strategies)
+        self.allocations: Dict[str, float] = {name: allocations.get(name, 0.0) for name in strategies}
+        self.books: Dict[str, BacktestEngine] = {
+            name: BacktestEngine(initial_capital=initial_capital * weight, instrumentation=None)
+            for name, weight in self.allocations.items()
+        }
+        self.unallocated_cash = initial_capital * (1 - sum(self.allocations.values()))
+        self.curve = EquityCurve()
+        self.indicators = IndicatorGraph() if share_indicators else None
+
+    def backtest(self, symbol: str, df) -> dict:
+        """Backtest every strategy on `symbol` in a single pass over its ticks.
+
+        Returns {'strategies': {name: results}, 'combined': results}, where
+        each per-strategy entry has the same keys as BacktestEngine results.
+        """
+        print(f"\n{'='*80}")
+        print(f"Backtesting {', '.join(self.strategies)} on {symbol}")
+        print(f"{'='*80}")
+
+        books = [(self.strategies[name], self.books[name]) for name in self.strategies]
+        attached = []
+        if self.indicators is not None:
+            for strategy, _ in books:
+                if strategy.indicators() and strategy.indicator_graph is None:
+                    self.indicators.attach(strategy)
+                    attached.append(strategy)
+        try:
+            return self._run(symbol, df, books)
+        finally:
+            # The strategies belong to the caller; leave them standalone again
+            for strategy in attached:
+                strategy.indicator_graph = None
+
+    def _run(self, symbol: str, df, books) -> dict:
+        symbol_data = books[0][1].get_symbol_data(df, symbol)
+        timestamps = symbol_data['timestamp'].tolist()
+        prices = symbol_data['price'].tolist()
+        n_ticks = len(prices)
+
+        starts = {}
+        for strategy, book in books:
+            book.reset_positions_for_symbol(symbol)
+            book.curve.reserve(n_ticks)
+            starts[id(book)] = (book.curve.size, book.curve.traded_notional)
+
+        for idx in range(n_ticks):
+            tick = MarketDataPoint(timestamp=timestamps[idx], symbol=symbol, price=prices[idx])
+            for strategy, book in books:
+                signal = strategy.generate_signals(tick)
+                if signal == 1:
+                    book.execute_trade(tick.timestamp, symbol, 'BUY', tick.price, quantity=1)
+                elif signal == -1:
+                    book.execute_trade(tick.timestamp, symbol, 'SELL', tick.price, quantity=1)
+                book.mark_to_market(symbol, tick.timestamp, tick.price, signal != 0, idx, n_ticks)
+
+        per_strategy = {}
+        for name, (strategy, book) in zip(self.strategies, books):
+            run_start, notional_start = starts[id(book)]
+            stats = book.curve.get_stats(run_start, traded_notional=book.curve.traded_notional - notional_start)
+            results = book.print_results(strategy, symbol, stats)
+            results['allocation'] = self.allocations[name]
+            per_strategy[name] = results
+
+        combined = self._combine(symbol, books, starts, per_strategy)
+        return {'strategies': per_strategy, 'combined': combined}
+
+    def _combine(self, symbol: str, books, starts, per_strategy: Dict[str, dict]) -> dict:
+        """Sum the sub-book curves of the last run into the combined book."""
+        first_book = books[0][1]
+        run_start = starts[id(first_book)][0]
+        values = self.unallocated_cash + sum(book.curve.get_values(starts[id(book)][0]) for _, book in books)
+        timestamps = first_book.curve.get_timestamps(run_start).view('int64')
+        self.curve.extend(timestamps, values)
+        traded_notional = sum(book.curve.traded_notional - starts[id(book)][1] for _, book in books)
+        self.curve.traded_notional += traded_notional
+
+        final_value = self.unallocated_cash + sum(r['final_portfolio_value'] for r in per_strategy.values())
+        return {
+            'symbol': symbol,
+            'initial_capital': self.initial_capital,
+            'final_portfolio_value': final_value,
+            'total_return_pct': (final_value - self.initial_capital) / self.initial_capital * 100,
+            'total_trades': sum(r['total_trades'] for r in per_strategy.values()),
+            'allocations': dict(self.allocations),
+            'equity': self.curve.get_stats(self.curve.size - len(values), traded_notional=traded_notional),
+        }
@@ -0,0 +1,254 @@
+import contextlib
+import hashlib
+import json
+import os
+import sqlite3
+from datetime import datetime
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from engine import BacktestEngine
+from equity_curve import to_ns
+from market_data import MarketData
+from runner import make_strategy, strategy_params
+from patterns.Singleton_ConfigAccess import STRATEGY_PARAMS_FILE
+
+# Persistent results store for backtest runs (SQLite, stdlib only).
+# A run is keyed by a hash of (strategy class, params, symbol, data
+# fingerprint), where the fingerprint hashes the symbol's timestamps and
+# prices. Asking for an identical run returns the stored results. When the
+# symbol's data has grown and the stored run's data is an exact prefix of
+# it, the run is resumed from the saved engine and strategy state and only
+# the appended ticks are processed.
+#
+# Tables:
+#   runs    one row per run: config, summary and resumable state as JSON
+#   trades  one row per trade
+#   equity          the full-resolution equity curve as two NumPy BLOBs
+#   equity_samples  the engine's sampled equity_curve, the same way, so a
+#                   resumed run continues it like an uninterrupted one
+
+DEFAULT_PATH = 'reports/results.db'
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_key TEXT PRIMARY KEY,
+    config_key TEXT NOT NULL,
+    strategy TEXT NOT NULL,
+    params TEXT NOT NULL,
+    symbol TEXT NOT NULL,
+    data_fingerprint TEXT NOT NULL,
+    n_ticks INTEGER NOT NULL,
+    initial_capital REAL NOT NULL,
+    summary TEXT NOT NULL,
+    engine_state TEXT NOT NULL,
+    strategy_state TEXT NOT NULL,
+    created TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS runs_config ON runs (config_key, n_ticks);
+CREATE TABLE IF NOT EXISTS trades (
+    run_key TEXT NOT NULL,
+    seq INTEGER NOT NULL,
+    timestamp INTEGER NOT NULL,
+    symbol TEXT NOT NULL,
+    action TEXT NOT NULL,
+    price REAL NOT NULL,
+    quantity INTEGER NOT NULL,
+    cost REAL NOT NULL,
+    PRIMARY KEY (run_key, seq)
+);
+CREATE TABLE IF NOT EXISTS equity (
+    run_key TEXT PRIMARY KEY,
+    timestamps BLOB NOT NULL,
+    equity_values BLOB NOT NULL
+);
+CREATE TABLE IF NOT EXISTS equity_samples (
+    run_key TEXT PRIMARY KEY,
+    timestamps BLOB NOT NULL,
+    sample_values BLOB NOT NULL
+);
+"""
+
+
+def data_fingerprint(data: MarketData, symbol: str, n_ticks: Optional[int] = None) -> str:
+    """Hash of the first `n_ticks` (default: all) timestamps and prices of `symbol`."""
+    end = None if n_ticks is None else n_ticks
+    digest = hashlib.sha256()
+    digest.update(np.ascontiguousarray(data.timestamps_ns(symbol)[:end]).tobytes())
+    digest.update(np.ascontiguousarray(data.prices(symbol)[:end]).tobytes())
+    return digest.hexdigest()
+
+
+def _hash(*parts) -> str:
+    return hashlib.sha256(json.dumps(parts, sort_keys=True, default=str).encode()).hexdigest()
+
+
+class ResultsStore:
+    """SQLite-backed cache of backtest runs with incremental re-runs."""
+
+    def __init__(self, path: str = DEFAULT_PATH):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.conn = sqlite3.connect(path)
+        self.conn.executescript(SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
+
+    # Keys
+
+    @staticmethod
+    def config_key(strategy_name: str, params: Dict, symbol: str, initial_capital: float) -> str:
+        return _hash(strategy_name, params, symbol, initial_capital)
+
+    @staticmethod
+    def run_key(config_key: str, fingerprint: str) -> str:
+        return _hash(config_key, fingerprint)
+
+    # Running
+
+    def run(self, strategy_name: str, symbol: str, data: MarketData, params: Optional[Dict] = None,
+            initial_capital: float = 100000, params_file: Optional[str] = STRATEGY_PARAMS_FILE,
+            quiet: bool = True) -> Dict:
+        """Return results for this configuration, computing only what is not stored yet.
+
+        The returned summary has a 'cache' entry: 'hit' (nothing recomputed),
+        'incremental' (resumed from a stored prefix) or 'miss' (full run).
+        """
+        strategy = make_strategy(strategy_name, params, params_file)
+        resolved_params = strategy_params(strategy)
+        n_ticks = len(data.prices(symbol))
+        fingerprint = data_fingerprint(data, symbol)
+        config_key = self.config_key(strategy_name, resolved_params, symbol, initial_capital)
+        run_key = self.run_key(config_key, fingerprint)
+
+        stored = self.get(run_key)
+        if stored is not None:
+            stored['cache'] = 'hit'
+            return stored
+
+        engine = BacktestEngine(initial_capital=initial_capital)
+        start_index = 0
+        previous = self._find_prefix_run(config_key, data, symbol, n_ticks)
+        if previous is not None:
+            engine.restore_state(json.loads(previous['engine_state']))
+            strategy.set_state(json.loads(previous['strategy_state']))
+            timestamps, values = self.load_equity(previous['run_key'])
+            engine.curve.extend(timestamps, values)
+            start_index = previous['n_ticks']
+            sample_ts, sample_values = self.load_samples(previous['run_key'])
+            engine.equity_curve = [(pd.Timestamp(ts), value)
+                                   for ts, value in zip(sample_ts.tolist(), sample_values.tolist())]
+            if engine.equity_curve and (start_index - 1) % 1000 != 0:
+                engine.equity_curve.pop()  # sampled only because it was the prefix's last tick
+
+        with open(os.devnull, 'w') as devnull, \
+                (contextlib.redirect_stdout(devnull) if quiet else contextlib.nullcontext()):
+            results = engine.backtest_strategy(strategy, symbol, data, start_index=start_index)
+
+        # Stats over the whole curve, including any resumed prefix
+        results['equity'] = engine.curve.get_stats()
+        results['params'] = resolved_params
+        results['ticks'] = n_ticks
+        results['run_key'] = run_key
+        self._save(run_key, config_key, strategy_name, resolved_params, symbol, fingerprint,
+                   n_ticks, initial_capital, results, engine, strategy)
+        results['cache'] = 'incremental' if previous is not None else 'miss'
+        return results
+
+    def _find_prefix_run(self, config_key: str, data: MarketData, symbol: str, n_ticks: int):
+        rows = self.conn.execute(
+            "SELECT run_key, n_ticks, data_fingerprint, engine_state, strategy_state FROM runs "
+            "WHERE config_key = ? AND n_ticks < ? ORDER BY n_ticks DESC",
+            (config_key, n_ticks),
+        ).fetchall()
+        for run_key, prefix_ticks, fingerprint, engine_state, strategy_state in rows:
+            if data_fingerprint(data, symbol, prefix_ticks) == fingerprint:
+                return {'run_key': run_key, 'n_ticks': prefix_ticks,
+                        'engine_state': engine_state, 'strategy_state': strategy_state}
+        return None
+
+    def _save(self, run_key, config_key, strategy_name, params, symbol, fingerprint, n_ticks,
+              initial_capital, results, engine: BacktestEngine, strategy):
+        engine_state = engine.get_state()
+        trades = engine_state['trades']
+        with self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO runs VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (run_key, config_key, strategy_name, json.dumps(params, sort_keys=True), symbol,
+                 fingerprint, n_ticks, initial_capital, json.dumps(results, default=str),
+                 json.dumps(engine_state), json.dumps(strategy.get_state()),
+                 datetime.now().isoformat(timespec='seconds')),
+            )
+            self.conn.execute("DELETE FROM trades WHERE run_key = ?", (run_key,))
+            self.conn.executemany(
+                "INSERT INTO trades VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                [(run_key, seq, *trade) for seq, trade in enumerate(trades)],
+            )
+            curve = engine.curve
+            self.conn.execute(
+                "INSERT OR REPLACE INTO equity VALUES (?, ?, ?)",
+                (run_key, curve.get_timestamps().astype(np.int64).tobytes(), curve.get_values().tobytes()),
+            )
+            samples = engine.equity_curve
+            self.conn.execute(
+                "INSERT OR REPLACE INTO equity_samples VALUES (?, ?, ?)",
+                (run_key, np.array([to_ns(ts) for ts, _ in samples], dtype=np.int64).tobytes(),
+                 np.array([value for _, value in samples], dtype=np.float64).tobytes()),
+            )
+
+    # Reading
+
+    def get(self, run_key: str) -> Optional[Dict]:
+        """Stored summary of a run, or None."""
+        row = self.conn.execute("SELECT summary FROM runs WHERE run_key = ?", (run_key,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def list_runs(self) -> List[Dict]:
+        rows = self.conn.execute(
+            "SELECT run_key, strategy, params, symbol, n_ticks, created FROM runs ORDER BY created"
+        ).fetchall()
+        return [
+            {'run_key': r[0], 'strategy': r[1], 'params': json.loads(r[2]), 'symbol': r[3],
+             'n_ticks': r[4], 'created': r[5]}
+            for r in rows
+        ]
+
+    def load_trades(self, run_key: str) -> List[Dict]:
+        rows = self.conn.execute(
+            "SELECT timestamp, symbol, action, price, quantity, cost FROM trades WHERE run_key = ? ORDER BY seq",
+            (run_key,),
+        ).fetchall()
+        return [
+            {'timestamp': np.datetime64(ts, 'ns'), 'symbol': s, 'action': a, 'price': p, 'quantity': q, 'cost': c}
+            for ts, s, a, p, q, c in rows
+        ]
+
+    def load_equity(self, run_key: str):
+        """(timestamps int64 ns, values float64) arrays of a stored run."""
+        row = self.conn.execute(
+            "SELECT timestamps, equity_values FROM equity WHERE run_key = ?", (run_key,)
+        ).fetchone()
+        if row is None:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float64)
+        return np.frombuffer(row[0], dtype=np.int64), np.frombuffer(row[1], dtype=np.float64)
+
+    def load_samples(self, run_key: str):
+        """(timestamps int64 ns, values float64) of the run's sampled equity_curve."""
+        row = self.conn.execute(
+            "SELECT timestamps, sample_values FROM equity_samples WHERE run_key = ?", (run_key,)
+        ).fetchone()
+        if row is None:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float64)
+        return np.frombuffer(row[0], dtype=np.int64), np.frombuffer(row[1], dtype=np.float64)
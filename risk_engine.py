@@ -0,0 +1,213 @@
+from __future__ import annotations
+
+from collections import deque
+from statistics import NormalDist
+from typing import Dict, List, Optional, Sequence
+
+from lazy_imports import lazy_import
+from patterns.Composite_PortModel import PortfolioComponent, PortfolioGroup, Position
+
+np = lazy_import('numpy')
+
+# Risk for every node of a Composite portfolio tree in one batched pass.
+# The tree is flattened once into
+#   leaf exposures  L (leaves x assets): quantity * price in the leaf's column
+#   membership      M (nodes x leaves):  1 where the leaf sits under the node
+# so E = M @ L holds the dollar exposure of every node (groups and single
+# positions) to every asset. With the asset return matrix R (periods x
+# assets), its mean mu and covariance S:
+#   parametric   sigma = sqrt(rowsum((E @ S) * E)),  VaR = z * sigma - E @ mu
+#   historical   P&L = R @ E.T, VaR / CVaR from its lower tail per column
+# The covariance is kept as running co-moments, so a new return row updates
+# it (and appends one P&L row) in O(assets^2) instead of recomputing from
+# the full history. With `window` set, the oldest row is removed the same way.
+
+
+class RunningCovariance:
+    """Sample mean and covariance updated one row (or batch) at a time."""
+
+    def __init__(self, n_assets: int):
+        self.count = 0
+        self.mean = np.zeros(n_assets)
+        self.comoment = np.zeros((n_assets, n_assets))
+
+    def update(self, rows):
+        """Add a batch of rows (Chan et al. pairwise update)."""
+        rows = np.atleast_2d(np.asarray(rows, dtype=np.float64))
+        k = len(rows)
+        if k == 0:
+            return
+        batch_mean = rows.mean(axis=0)
+        centered = rows - batch_mean
+        delta = batch_mean - self.mean
+        total = self.count + k
+        self.comoment += centered.T @ centered + np.outer(delta, delta) * (self.count * k / total)
+        self.mean += delta * (k / total)
+        self.count = total
+
+    def remove(self, row):
+        """Remove a row that was added earlier (reverse Welford step)."""
+        row = np.asarray(row, dtype=np.float64)
+        if self.count <= 1:
+            self.count = 0
+            self.mean[:] = 0.0
+            self.comoment[:] = 0.0
+            return
+        previous_mean = (self.count * self.mean - row) / (self.count - 1)
+        self.comoment -= np.outer(row - previous_mean, row - self.mean)
+        self.mean = previous_mean
+        self.count -= 1
+
+    @property
+    def cov(self) -> np.ndarray:
+        if self.count < 2:
+            return np.full_like(self.comoment, np.nan)
+        return self.comoment / (self.count - 1)
+
+
+def flatten_tree(root: PortfolioComponent):
+    """Nodes in depth-first order as (path, component), plus each node's leaf indices."""
+    nodes: List = []
+    leaves: List[Position] = []
+    members: List[List[int]] = []
+
+    def visit(component, path):
+        index = len(nodes)
+        nodes.append((path, component))
+        members.append([])
+        if isinstance(component, PortfolioGroup):
+            for child in component.components:
+                child_name = child.name if isinstance(child, PortfolioGroup) else child.symbol
+                for leaf in visit(child, f"{path}/{child_name}"):
+                    members[index].append(leaf)
+        else:
+            members[index].append(len(leaves))
+            leaves.append(component)
+        return members[index]
+
+    visit(root, root.name if isinstance(root, PortfolioGroup) else root.symbol)
+    return nodes, leaves, members
+
+
+def aligned_returns(data, symbols: Sequence[str]):
+    """(timestamps_ns, simple returns) of `symbols` on the timestamps they all share.
+
+    Where a symbol has several ticks on one timestamp, the last one is its price.
+    """
+    missing = [s for s in symbols if s not in data]
+    if missing:
+        raise ValueError(f"No market data for: {', '.join(missing)}")
+    series = []
+    for symbol in symbols:
+        ts = data.timestamps_ns(symbol)
+        last = np.r_[ts[1:] != ts[:-1], True] if len(ts) else np.zeros(0, dtype=bool)
+        series.append((ts[last], data.prices(symbol)[last]))
+    common = series[0][0]
+    for ts, _ in series[1:]:
+        common = np.intersect1d(common, ts, assume_unique=True)
+    prices = np.empty((len(common), len(symbols)))
+    for j, (ts, values) in enumerate(series):
+        prices[:, j] = values[np.searchsorted(ts, common)]
+    return common[1:], prices[1:] / prices[:-1] - 1
+
+
+class RiskEngine:
+    """Parametric and historical VaR/CVaR for every node of a portfolio tree."""
+
+    def __init__(self, root: PortfolioComponent, returns, symbols: Sequence[str],
+                 confidence: float = 0.99, window: Optional[int] = None):
+        if not 0.5 < confidence < 1:
+            raise ValueError("confidence must be between 0.5 and 1")
+        self.root = root
+        self.symbols = list(symbols)
+        self.confidence = confidence
+        self.window = window
+        self.nodes, self.leaves, members = flatten_tree(root)
+        self.paths = [path for path, _ in self.nodes]
+
+        columns = {s: j for j, s in enumerate(self.symbols)}
+        missing = sorted({leaf.symbol for leaf in self.leaves} - set(columns))
+        if missing:
+            raise ValueError(f"No returns for: {', '.join(missing)}")
+        self._leaf_columns = np.array([columns[leaf.symbol] for leaf in self.leaves], dtype=np.int64)
+        self.membership = np.zeros((len(self.nodes), len(self.leaves)))
+        for i, leaf_indices in enumerate(members):
+            self.membership[i, leaf_indices] = 1.0
+        self.exposures = None
+        self.refresh_exposures()
+
+        returns = np.asarray(returns, dtype=np.float64).reshape(-1, len(self.symbols))
+        if window is not None:
+            returns = returns[-window:]
+        self.covariance = RunningCovariance(len(self.symbols))
+        self.covariance.update(returns)
+        self._returns = deque(returns)
+        self._pnl = deque(returns @ self.exposures.T)
+
+    @classmethod
+    def from_market_data(cls, root: PortfolioComponent, data, **kwargs) -> 'RiskEngine':
+        """Build the returns matrix for the tree's symbols from a MarketData."""
+        _, leaves, _ = flatten_tree(root)
+        symbols = sorted({leaf.symbol for leaf in leaves})
+        _, returns = aligned_returns(data, symbols)
+        return cls(root, returns, symbols, **kwargs)
+
+    def refresh_exposures(self):
+        """Re-read quantities and prices from the tree (e.g. after marking it to new prices)."""
+        leaf_exposures = np.zeros((len(self.leaves), len(self.symbols)))
+        leaf_exposures[np.arange(len(self.leaves)), self._leaf_columns] = [
+            leaf.quantity * leaf.price for leaf in self.leaves
+        ]
+        self.exposures = self.membership @ leaf_exposures
+        if getattr(self, '_returns', None):
+            self._pnl = deque(np.asarray(self._returns) @ self.exposures.T)
+
+    def update(self, return_row):
+        """Add one period of asset returns (same column order as `symbols`)."""
+        row = np.asarray(return_row, dtype=np.float64)
+        self.covariance.update(row)
+        self._returns.append(row)
+        self._pnl.append(self.exposures @ row)
+        if self.window is not None and len(self._returns) > self.window:
+            self.covariance.remove(self._returns.popleft())
+            self._pnl.popleft()
+
+    # Risk measures
+
+    def parametric(self) -> Dict[str, np.ndarray]:
+        """Normal VaR / CVaR (positive numbers = losses) for all nodes."""
+        E = self.exposures
+        sigma = np.sqrt(np.maximum(np.einsum('ij,ij->i', E @ self.covariance.cov, E), 0.0))
+        mu = E @ self.covariance.mean
+        z = NormalDist().inv_cdf(self.confidence)
+        tail = NormalDist().pdf(z) / (1 - self.confidence)
+        return {'volatility': sigma, 'var': z * sigma - mu, 'cvar': tail * sigma - mu}
+
+    def historical(self) -> Dict[str, np.ndarray]:
+        """Empirical VaR / CVaR (positive numbers = losses) for all nodes."""
+        pnl = np.asarray(self._pnl)
+        if len(pnl) == 0:
+            nan = np.full(len(self.nodes), np.nan)
+            return {'var': nan, 'cvar': nan}
+        cutoff = np.quantile(pnl, 1 - self.confidence, axis=0)
+        tail = pnl <= cutoff
+        cvar = -(np.where(tail, pnl, 0.0).sum(axis=0) / tail.sum(axis=0))
+        return {'var': -cutoff, 'cvar': cvar}
+
+    def report(self) -> List[Dict]:
+        """One row per node: value, volatility and both VaR / CVaR estimates."""
+        parametric = self.parametric()
+        historical = self.historical()
+        values = self.exposures.sum(axis=1)
+        return [
+            {
+                'node': path,
+                'value': float(values[i]),
+                'volatility': float(parametric['volatility'][i]),
+                'parametric_var': float(parametric['var'][i]),
+                'parametric_cvar': float(parametric['cvar'][i]),
+                'historical_var': float(historical['var'][i]),
+                'historical_cvar': float(historical['cvar'][i]),
+            }
+            for i, path in enumerate(self.paths)
+        ]
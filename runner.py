@@ -0,0 +1,97 @@
+import contextlib
+import os
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from engine import BacktestEngine
+from market_data import MarketData
+from patterns.Singleton_ConfigAccess import STRATEGY_PARAMS_FILE
+from patterns.Strategy_SignalGen import Strategy, MeanReversionStrategy, BreakoutStrategy
+
+# Batch runner for strategy x symbol backtests.
+# Every job gets its own BacktestEngine and strategy instance, so jobs are
+# independent and can run in separate processes. Market data is loaded once
+# by the caller and handed to each worker process when the pool starts
+# (inherited copy-on-write under fork), not re-read per job.
+
+STRATEGIES = {
+    'MeanReversionStrategy': MeanReversionStrategy,
+    'BreakoutStrategy': BreakoutStrategy,
+}
+
+# Market data of the current worker process, set by _init_worker
+_worker_data: Optional[MarketData] = None
+
+
+def make_strategy(name: str, params: Optional[Dict] = None, params_file: Optional[str] = STRATEGY_PARAMS_FILE) -> Strategy:
+    """Create a strategy by class name, with params from `params_file` and/or `params`."""
+    if name not in STRATEGIES:
+        raise ValueError(f"Unknown strategy: {name} (choose from {', '.join(STRATEGIES)})")
+    strategy = STRATEGIES[name]()
+    if params_file is not None and os.path.exists(params_file):
+        strategy.load_params(params_file)
+    for key, value in (params or {}).items():
+        setattr(strategy, key, value)
+    return strategy
+
+
+def strategy_params(strategy: Strategy) -> Dict:
+    """The tunable parameters of a strategy instance."""
+    return {'lookback_window': strategy.lookback_window, 'threshold': strategy.threshold}
+
+
+def run_job(strategy_name: str, symbol: str, data, initial_capital: float = 100000,
+            params: Optional[Dict] = None, params_file: Optional[str] = STRATEGY_PARAMS_FILE,
+            quiet: bool = True) -> Dict:
+    """Backtest one strategy on one symbol with an isolated engine."""
+    start = time.perf_counter()
+    try:
+        strategy = make_strategy(strategy_name, params, params_file)
+        engine = BacktestEngine(initial_capital=initial_capital)
+        with open(os.devnull, 'w') as devnull, \
+                (contextlib.redirect_stdout(devnull) if quiet else contextlib.nullcontext()):
+            results = engine.backtest_strategy(strategy, symbol, data)
+        results['params'] = strategy_params(strategy)
+        results['ticks'] = len(engine.get_symbol_data(data, symbol))
+    except Exception as e:
+        results = {
+            'strategy': strategy_name,
+            'symbol': symbol,
+            'params': params or {},
+            'error': f"{e.__class__.__name__}: {e}",
+            'traceback': traceback.format_exc(),
+        }
+    results['elapsed_seconds'] = time.perf_counter() - start
+    return results
+
+
+def _init_worker(data: MarketData):
+    global _worker_data
+    _worker_data = data
+
+
+def _run_worker_job(job: Tuple[str, str, Optional[Dict]], initial_capital: float,
+                    params_file: Optional[str], quiet: bool) -> Dict:
+    strategy_name, symbol, params = job
+    return run_job(strategy_name, symbol, _worker_data, initial_capital, params, params_file, quiet)
+
+
+def run_jobs(jobs: Sequence[Tuple[str, str, Optional[Dict]]], data: MarketData, workers: int = 1,
+             initial_capital: float = 100000, params_file: Optional[str] = STRATEGY_PARAMS_FILE,
+             quiet: bool = True) -> List[Dict]:
+    """Run (strategy_name, symbol, params) jobs, in parallel when workers > 1.
+
+    Results come back in the order of `jobs`.
+    """
+    if workers <= 1 or len(jobs) <= 1:
+        return [run_job(name, symbol, data, initial_capital, params, params_file, quiet)
+                for name, symbol, params in jobs]
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(data,)) as pool:
+        futures = [
+            pool.submit(_run_worker_job, job, initial_capital, params_file, quiet)
+            for job in jobs
+        ]
+        return [future.result() for future in futures]
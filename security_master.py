@@ -0,0 +1,124 @@
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from patterns.Factory_InstrumentTypes import InstrumentFactory, Instrument
+
+# Columnar security master for universe-selection queries.
+# Holds instruments.csv-style data as one DataFrame with categorical
+# type / sector / issuer, float price and a parsed datetime64 maturity, so
+# queries like "all Technology stocks" or "bonds maturing before 2030" are
+# vectorized masks instead of loops over Instrument objects. Individual
+# objects can still be built from a row through InstrumentFactory.
+
+CATEGORICAL_COLUMNS = ('type', 'sector', 'issuer')
+
+
+class SecurityMaster:
+    """Instrument table with vectorized filters, group-bys and market-data joins."""
+
+    def __init__(self, df: pd.DataFrame):
+        table = df.copy()
+        table['symbol'] = table['symbol'].astype(str).str.strip()
+        for column in CATEGORICAL_COLUMNS:
+            if column not in table:
+                table[column] = None
+            values = table[column].astype('string').str.strip()
+            if column == 'type':
+                values = values.str.lower()
+            table[column] = values.replace('', pd.NA).astype('category')
+        table['price'] = pd.to_numeric(table.get('price'), errors='coerce').fillna(0.0).astype(np.float64)
+        if 'maturity' not in table:
+            table['maturity'] = None
+        table['maturity'] = pd.to_datetime(table['maturity'].replace('', None), errors='coerce').astype('datetime64[ns]')
+        self.table = table.reset_index(drop=True)
+        self._rows = pd.Index(self.table['symbol'])
+
+    @classmethod
+    def from_csv(cls, filepath: str = 'inputs/instruments.csv') -> 'SecurityMaster':
+        return cls(pd.read_csv(filepath, dtype=str, keep_default_na=False))
+
+    def __len__(self) -> int:
+        return len(self.table)
+
+    def __contains__(self, symbol: str) -> bool:
+        return symbol in self._rows
+
+    @property
+    def symbols(self) -> List[str]:
+        return self.table['symbol'].tolist()
+
+    def select(self, type: Optional[str] = None, sector=None, issuer=None,
+               maturity_before=None, maturity_after=None,
+               min_price: Optional[float] = None, max_price: Optional[float] = None) -> 'SecurityMaster':
+        """Return the instruments matching every given condition.
+
+        `sector` and `issuer` accept a single value or a list of values.
+        Maturity bounds are exclusive and drop rows without a maturity.
+        """
+        t = self.table
+        mask = np.ones(len(t), dtype=bool)
+        if type is not None:
+            mask &= (t['type'] == type.lower()).to_numpy(dtype=bool, na_value=False)
+        for column, value in (('sector', sector), ('issuer', issuer)):
+            if value is None:
+                continue
+            values = [value] if isinstance(value, str) else list(value)
+            mask &= t[column].isin(values).to_numpy()
+        if maturity_before is not None:
+            mask &= (t['maturity'] < pd.Timestamp(maturity_before)).to_numpy()
+        if maturity_after is not None:
+            mask &= (t['maturity'] > pd.Timestamp(maturity_after)).to_numpy()
+        if min_price is not None:
+            mask &= t['price'].to_numpy() >= min_price
+        if max_price is not None:
+            mask &= t['price'].to_numpy() <= max_price
+        return SecurityMaster._from_table(t[mask])
+
+    @classmethod
+    def _from_table(cls, table: pd.DataFrame) -> 'SecurityMaster':
+        # Already normalized: skip the parsing in __init__
+        master = cls.__new__(cls)
+        master.table = table.reset_index(drop=True)
+        master._rows = pd.Index(master.table['symbol'])
+        return master
+
+    def group_by(self, by, column: str = 'price', aggs=('count', 'mean', 'min', 'max')) -> pd.DataFrame:
+        """Aggregate `column` per group, e.g. group_by('sector') or group_by(['type', 'sector'])."""
+        return self.table.groupby(by, observed=True)[column].agg(list(aggs))
+
+    def join_market_data(self, market_data, columns=('type', 'sector', 'issuer', 'maturity'),
+                         how: str = 'inner') -> pd.DataFrame:
+        """Attach instrument attributes to each market-data row by symbol.
+
+        `market_data` is a raw frame or a MarketData partition.
+        """
+        frame = getattr(market_data, 'frame', market_data)
+        right = self.table[['symbol', *columns]]
+        left = frame.assign(symbol=frame['symbol'].astype(str))
+        return left.merge(right, on='symbol', how=how, suffixes=('', '_reference'))
+
+    def record(self, symbol: str) -> Dict[str, str]:
+        """The row for `symbol` in the string form InstrumentFactory expects."""
+        i = self._rows.get_loc(symbol)  # KeyError if missing
+        if isinstance(i, slice):  # duplicated symbol: first row wins
+            i = i.start
+        elif not isinstance(i, (int, np.integer)):
+            i = int(np.argmax(i))
+        row = self.table.iloc[i]
+        maturity = row['maturity']
+        return {
+            'symbol': row['symbol'],
+            'type': '' if pd.isna(row['type']) else str(row['type']),
+            'price': str(row['price']),
+            'sector': None if pd.isna(row['sector']) else str(row['sector']),
+            'issuer': None if pd.isna(row['issuer']) else str(row['issuer']),
+            'maturity': None if pd.isna(maturity) else maturity.strftime('%Y-%m-%d'),
+        }
+
+    def to_instrument(self, symbol: str) -> Instrument:
+        return InstrumentFactory.from_security_master(self, symbol)
+
+    def to_instruments(self) -> List[Instrument]:
+        return [self.to_instrument(symbol) for symbol in self.symbols]
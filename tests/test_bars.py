@@ -0,0 +1,76 @@
+import unittest
+import contextlib
+import io
+import os
+import sys
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+# Ensure project root is importable when running tests
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from bars import freq_to_ns, resample_ohlcv
+from engine import BacktestEngine
+from market_data import MarketData
+from patterns.Strategy_SignalGen import MeanReversionStrategy
+from benchmarks.synthetic_data import generate_market_data, write_market_data_csv
+
+
+class BarsTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.df = generate_market_data(n_symbols=2, n_ticks=5000, seed=4)
+        self.data = MarketData(self.df)
+
+    def test_matches_pandas_resample(self):
+        ticks = self.data.get('SPY').set_index('timestamp')['price']
+        expected = ticks.resample('5min').ohlc().dropna()
+        bars = self.data.bars('SPY', '5min')
+        self.assertEqual(len(bars), len(expected))
+        np.testing.assert_array_equal(bars['timestamp'].to_numpy(), expected.index.to_numpy())
+        for column in ('open', 'high', 'low', 'close'):
+            np.testing.assert_array_equal(bars[column].to_numpy(), expected[column].to_numpy())
+        np.testing.assert_array_equal(bars['ticks'].to_numpy(), ticks.resample('5min').count().to_numpy())
+        np.testing.assert_array_equal(bars['price'].to_numpy(), bars['close'].to_numpy())
+
+    def test_gaps_and_volume(self):
+        ts = np.array([0, 10, 70, 250, 260], dtype=np.int64) * 1_000_000_000
+        bars = resample_ohlcv(ts, [1.0, 3.0, 2.0, 5.0, 4.0], '1min', volumes=[1, 2, 3, 4, 5])
+        np.testing.assert_array_equal(bars['timestamp'] // 1_000_000_000, [0, 60, 240])
+        np.testing.assert_array_equal(bars['open'], [1.0, 2.0, 5.0])
+        np.testing.assert_array_equal(bars['high'], [3.0, 2.0, 5.0])
+        np.testing.assert_array_equal(bars['low'], [1.0, 2.0, 4.0])
+        np.testing.assert_array_equal(bars['close'], [3.0, 2.0, 4.0])
+        np.testing.assert_array_equal(bars['volume'], [3.0, 3.0, 9.0])
+        self.assertEqual(len(resample_ohlcv([], [], '1min')['close']), 0)
+        with self.assertRaises(ValueError):
+            freq_to_ns('0s')
+
+    def test_results_are_cached(self):
+        self.assertIs(self.data.bars('SPY', '1h'), self.data.bars('SPY', '60min'))
+        self.assertIs(self.data.resample('1h'), self.data.resample(pd.Timedelta(hours=1)))
+
+    def test_backtest_on_bars(self):
+        bars = self.data.resample('1min')
+        self.assertEqual(set(bars.symbols), {'SPY', 'SYM0000'})
+        self.assertEqual(len(bars.prices('SPY')), -(-5000 // 60))
+        engine = BacktestEngine()
+        with contextlib.redirect_stdout(io.StringIO()):
+            results = engine.backtest_strategy(MeanReversionStrategy(lookback_window=5, threshold=0.001), 'SPY', bars)
+        self.assertEqual(engine.curve.size, len(bars.prices('SPY')))
+        self.assertGreater(results['total_trades'], 0)
+
+    def test_load_market_data_with_bars(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'data.csv')
+            write_market_data_csv(self.df, path)
+            bars = BacktestEngine().load_market_data(path, bar_freq='15min')
+        np.testing.assert_array_equal(bars.prices('SYM0000'), self.data.bars('SYM0000', '15min')['close'].to_numpy())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,51 @@
+import unittest
+import contextlib
+import io
+import os
+import sys
+import tempfile
+
+# Ensure project root is importable when running tests
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from benchmarks.synthetic_data import generate_market_data
+from benchmarks.run_benchmarks import BENCHMARKS, run_suite, compare_to_baseline, main
+
+
+class BenchmarkSuiteTestCase(unittest.TestCase):
+
+    def test_synthetic_data_is_reproducible(self):
+        df1 = generate_market_data(n_symbols=3, n_ticks=50, seed=7)
+        df2 = generate_market_data(n_symbols=3, n_ticks=50, seed=7)
+        self.assertEqual(len(df1), 150)
+        self.assertIn('SPY', set(df1['symbol']))
+        self.assertTrue(df1.equals(df2))
+
+    def test_suite_reports_every_benchmark(self):
+        report = run_suite(n_symbols=2, n_ticks=200, repeat=1)
+        self.assertEqual(set(report['results']), set(BENCHMARKS))
+        for result in report['results'].values():
+            self.assertGreater(result['ticks_per_sec'], 0)
+            self.assertGreater(result['peak_rss_mb'], 0)
+
+        # A baseline twice as fast as this run flags every benchmark
+        baseline = {'meta': report['meta'], 'results': {
+            name: {'seconds': r['seconds'] / 2} for name, r in report['results'].items()
+        }}
+        comparison = compare_to_baseline(report, baseline, tolerance=0.2)
+        self.assertTrue(all(c['regression'] for c in comparison.values()))
+
+    def test_fail_on_regression_requires_a_baseline(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            missing = os.path.join(tmp, 'baseline.json')
+            with contextlib.redirect_stderr(io.StringIO()) as err, self.assertRaises(SystemExit) as exit_:
+                main(['--baseline', missing, '--fail-on-regression', '--output', os.path.join(tmp, 'out.json')])
+            self.assertEqual(exit_.exception.code, 2)
+            self.assertIn('--save-baseline', err.getvalue())
+            self.assertFalse(os.path.exists(os.path.join(tmp, 'out.json')))  # failed before running the suite
+
+
+if __name__ == '__main__':
+    unittest.main()
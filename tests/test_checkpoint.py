@@ -0,0 +1,148 @@
+import unittest
+import contextlib
+import io
+import os
+import sys
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+# Ensure project root is importable when running tests
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from engine import BacktestEngine
+from checkpoint import Checkpointer
+from fill_simulator import FixedBpsSlippage, PerShareCommission
+from market_data import MarketData
+from patterns.Strategy_SignalGen import MeanReversionStrategy, BreakoutStrategy
+from benchmarks.synthetic_data import generate_market_data
+
+
+class Crash(Exception):
+    pass
+
+
+def crash_after(strategy, n_ticks):
+    """Make `strategy` raise on its (n_ticks + 1)-th tick, like a process dying mid-run."""
+    generate = strategy.generate_signals
+    calls = [0]
+
+    def generate_signals(tick):
+        calls[0] += 1
+        if calls[0] > n_ticks:
+            raise Crash()
+        return generate(tick)
+
+    strategy.generate_signals = generate_signals
+    return strategy
+
+
+class CheckpointTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.data = MarketData(generate_market_data(n_symbols=1, n_ticks=500, seed=5))
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def run_quietly(self, fn, *args):
+        with contextlib.redirect_stdout(io.StringIO()):
+            return fn(*args)
+
+    def test_resume_after_crash_matches_uninterrupted_run(self):
+        for strategy_cls in (MeanReversionStrategy, BreakoutStrategy):
+            directory = os.path.join(self.tmp.name, strategy_cls.__name__)
+            reference = BacktestEngine()
+            expected = self.run_quietly(reference.backtest_strategy,
+                                        strategy_cls(lookback_window=5, threshold=0.002), 'SPY', self.data)
+
+            engine = BacktestEngine()
+            engine.enable_checkpointing(directory, interval=100)
+            strategy = crash_after(strategy_cls(lookback_window=5, threshold=0.002), 370)
+            with self.assertRaises(Crash):
+                self.run_quietly(engine.backtest_strategy, strategy, 'SPY', self.data)
+            self.assertEqual(engine.checkpointer.latest(), 300)
+
+            resumed = BacktestEngine()
+            resumed.enable_checkpointing(directory, interval=100)
+            results = self.run_quietly(resumed.resume_from_checkpoint,
+                                       strategy_cls(lookback_window=5, threshold=0.002), 'SPY', self.data)
+
+            self.assertEqual(results, expected)
+            self.assertEqual(resumed.trades, reference.trades)
+            self.assertEqual(resumed.equity_curve, reference.equity_curve)
+            np.testing.assert_array_equal(resumed.curve.get_values(), reference.curve.get_values())
+            np.testing.assert_array_equal(resumed.curve.get_timestamps(), reference.curve.get_timestamps())
+
+    def test_resume_with_fill_simulator_matches_uninterrupted_run(self):
+        # Thin volume spread over several days, so orders rest and the daily cap matters
+        frame = generate_market_data(n_symbols=1, n_ticks=500, seed=5)
+        frame['timestamp'] = pd.date_range('2025-01-01', periods=len(frame), freq='10min')
+        frame['daily_volume'] = 150.0
+        data = MarketData(frame)
+
+        def run(engine, strategy, resume=False):
+            engine.enable_fill_simulation(participation=0.1, slippage=FixedBpsSlippage(2.0),
+                                          commission=PerShareCommission(0.01))
+            fn = engine.resume_from_checkpoint if resume else engine.backtest_strategy
+            return self.run_quietly(fn, strategy, 'SPY', data)
+
+        reference = BacktestEngine()
+        expected = run(reference, MeanReversionStrategy(lookback_window=5, threshold=0.002))
+        self.assertGreater(expected['fills']['open_orders'], 0)
+
+        engine = BacktestEngine()
+        engine.enable_checkpointing(self.tmp.name, interval=100)
+        with self.assertRaises(Crash):
+            run(engine, crash_after(MeanReversionStrategy(lookback_window=5, threshold=0.002), 370))
+        header, _ = Checkpointer.read(engine.checkpointer.path_for(300))
+        self.assertIsNotNone(header['fill_simulator'])
+
+        resumed = BacktestEngine()
+        resumed.enable_checkpointing(self.tmp.name, interval=100)
+        results = run(resumed, MeanReversionStrategy(lookback_window=5, threshold=0.002), resume=True)
+        self.assertEqual(results, expected)
+        self.assertEqual(resumed.trades, reference.trades)
+        np.testing.assert_array_equal(resumed.curve.get_values(), reference.curve.get_values())
+
+        # A checkpoint written with fill simulation cannot resume an engine without it
+        plain = BacktestEngine()
+        plain.enable_checkpointing(self.tmp.name, interval=100)
+        with self.assertRaises(ValueError):
+            plain.resume_from_checkpoint(MeanReversionStrategy(lookback_window=5, threshold=0.002), 'SPY', data)
+
+    def test_checkpoints_are_plain_arrays_with_deltas(self):
+        engine = BacktestEngine()
+        checkpointer = engine.enable_checkpointing(self.tmp.name, interval=200)
+        self.run_quietly(engine.backtest_strategy, MeanReversionStrategy(5, 0.002), 'SPY', self.data)
+        self.assertEqual([t for t, _ in checkpointer.checkpoints()], [200, 400])
+        header, arrays = Checkpointer.read(checkpointer.path_for(400))  # loads with allow_pickle=False
+        self.assertEqual(header['tick_index'], 400)
+        self.assertEqual(len(arrays['curve_values']), 200)  # only the points since the previous checkpoint
+        self.assertEqual(header['totals'][1], 400)
+
+    def test_fresh_run_discards_old_checkpoints(self):
+        engine = BacktestEngine()
+        engine.enable_checkpointing(self.tmp.name, interval=200)
+        self.run_quietly(engine.backtest_strategy, MeanReversionStrategy(5, 0.002), 'SPY', self.data)
+        other = BacktestEngine()
+        checkpointer = other.enable_checkpointing(self.tmp.name, interval=300)
+        self.run_quietly(other.backtest_strategy, MeanReversionStrategy(5, 0.002), 'SPY', self.data)
+        self.assertEqual([t for t, _ in checkpointer.checkpoints()], [300])
+
+    def test_resume_rejects_other_strategy(self):
+        engine = BacktestEngine()
+        engine.enable_checkpointing(self.tmp.name, interval=100)
+        self.run_quietly(engine.backtest_strategy, MeanReversionStrategy(5, 0.002), 'SPY', self.data)
+        resumed = BacktestEngine()
+        resumed.enable_checkpointing(self.tmp.name, interval=100)
+        with self.assertRaises(ValueError):
+            resumed.resume_from_checkpoint(BreakoutStrategy(5, 0.002), 'SPY', self.data)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,54 @@
+import unittest
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+# Ensure project root is importable when running tests
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from benchmarks.synthetic_data import generate_market_data
+
+# Wall-clock budgets for short-lived processes, generous enough for a loaded CI box
+IMPORT_BUDGET_SECONDS = 1.5
+MAIN_BUDGET_SECONDS = 6.0
+
+
+def run_python(args, cwd):
+    env = dict(os.environ, PYTHONPATH=ROOT)
+    start = time.perf_counter()
+    proc = subprocess.run([sys.executable] + args, cwd=cwd, env=env, capture_output=True, text=True)
+    return proc, time.perf_counter() - start
+
+
+class ColdStartTestCase(unittest.TestCase):
+
+    def test_engine_import_defers_heavy_dependencies(self):
+        proc, elapsed = run_python(['-c', (
+            "import sys, engine; "
+            "print('pandas.core' in sys.modules, 'numpy._core' in sys.modules or 'numpy.core' in sys.modules)"
+        )], cwd=ROOT)
+        self.assertEqual(proc.returncode, 0, proc.stderr)
+        self.assertEqual(proc.stdout.split(), ['False', 'False'])
+        self.assertLess(elapsed, IMPORT_BUDGET_SECONDS)
+
+    def test_main_cold_start_budget(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            inputs = os.path.join(tmp, 'inputs')
+            shutil.copytree(os.path.join(ROOT, 'inputs'), inputs)
+            df = generate_market_data(n_symbols=3, n_ticks=200, seed=1)
+            df['symbol'] = df['symbol'].replace({'SYM0000': 'AAPL'})
+            df.to_csv(os.path.join(inputs, 'market_data.csv'), index=False)
+
+            proc, elapsed = run_python([os.path.join(ROOT, 'main.py')], cwd=tmp)
+        self.assertEqual(proc.returncode, 0, proc.stderr)
+        self.assertIn('BACKTEST SUMMARY', proc.stdout)
+        self.assertLess(elapsed, MAIN_BUDGET_SECONDS)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,148 @@
+import unittest
+import contextlib
+import io
+import os
+import sys
+import threading
+from datetime import datetime
+
+# Ensure project root is importable when running tests
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from engine import BacktestEngine
+from concurrent_engine import ConcurrentEngine, market_data_feed
+from market_data import MarketData
+from patterns.Command_TradeExecution import CommandInvoker, ExecuteOrderCommand
+from patterns.Observer_SignalNotification import SignalPublisher, Observer
+from patterns.Strategy_SignalGen import MeanReversionStrategy
+from benchmarks.synthetic_data import generate_market_data
+
+
+class CountingObserver(Observer):
+    def __init__(self):
+        self.count = 0
+        self.lock = threading.Lock()
+
+    def update(self, signal):
+        with self.lock:
+            self.count += 1
+
+
+class ConcurrentEngineTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.data = MarketData(generate_market_data(n_symbols=7, n_ticks=600, seed=17))
+        # Switch threads as often as possible to provoke interleavings
+        self.switch_interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)
+
+    def tearDown(self):
+        sys.setswitchinterval(self.switch_interval)
+
+    def test_parallel_feeds_match_sequential_backtests(self):
+        engine = ConcurrentEngine(MeanReversionStrategy(lookback_window=5, threshold=0.002),
+                                  initial_capital=1e7, max_pending=64)
+        with contextlib.redirect_stdout(io.StringIO()):
+            with engine:
+                snapshot = engine.run_feeds([market_data_feed(self.data, s) for s in self.data.symbols])
+
+            sequential = BacktestEngine(initial_capital=1e7)
+            for symbol in self.data.symbols:
+                sequential.backtest_strategy(MeanReversionStrategy(lookback_window=5, threshold=0.002),
+                                             symbol, self.data)
+
+        self.assertEqual(snapshot['ticks_processed'], len(self.data))
+        self.assertEqual(snapshot['total_trades'], len(sequential.trades))
+        self.assertGreater(snapshot['total_trades'], 0)
+        self.assertAlmostEqual(snapshot['cash'], sequential.cash, places=6)
+        self.assertEqual(snapshot['positions'],
+                         {s: p.quantity for s, p in sequential.positions.items() if p.quantity})
+        self.assertEqual(engine.curve.size, len(self.data))
+        # Per-symbol trade order is preserved
+        for symbol in self.data.symbols:
+            self.assertEqual([t for t in engine.trades if t.symbol == symbol],
+                             [t for t in sequential.trades if t.symbol == symbol])
+
+    def test_contended_orders_keep_book_consistent(self):
+        engine = ConcurrentEngine(MeanReversionStrategy(), initial_capital=500.0, max_pending=16)
+        ts = datetime(2025, 1, 1)
+        barrier = threading.Barrier(8)
+
+        def hammer(i):
+            barrier.wait()
+            for n in range(300):
+                engine.submit_order(ts, 'AAA', 'BUY' if (n + i) % 3 else 'SELL', 10.0)
+                if n % 50 == 0:
+                    snap = engine.snapshot()
+                    self.assertGreaterEqual(snap['cash'], 0.0)
+                    self.assertGreaterEqual(snap['positions'].get('AAA', 0), 0)
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            with engine:
+                threads = [threading.Thread(target=hammer, args=(i,)) for i in range(8)]
+                for t in threads:
+                    t.start()
+                for t in threads:
+                    t.join()
+
+        bought = sum(t.quantity for t in engine.trades if t.action == 'BUY')
+        sold = sum(t.quantity for t in engine.trades if t.action == 'SELL')
+        position = engine.positions['AAA'].quantity if 'AAA' in engine.positions else 0
+        self.assertEqual(position, bought - sold)
+        self.assertAlmostEqual(engine.cash, 500.0 - sum(t.cost for t in engine.trades))
+        self.assertGreaterEqual(engine.cash, 0.0)
+        self.assertAlmostEqual(engine.cash + 10.0 * position, 500.0)
+
+    def test_writer_errors_surface_on_stop(self):
+        engine = ConcurrentEngine(MeanReversionStrategy())
+        engine.submit_order(datetime(2025, 1, 1), 'AAA', 'BUY', 'not a price')
+        with self.assertRaises(TypeError):
+            engine.stop()
+        self.assertEqual(engine.trades, [])
+
+    def test_command_invoker_is_serialized(self):
+        engine = BacktestEngine(initial_capital=1e6)
+        invoker = CommandInvoker()
+        ts = datetime(2025, 1, 1)
+
+        def run():
+            for _ in range(500):
+                invoker.execute_command(ExecuteOrderCommand(engine, ts, 'AAA', 'BUY', 1.0, 1))
+
+        threads = [threading.Thread(target=run) for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertEqual(invoker.get_history_length(), 4000)
+        self.assertEqual(invoker.current_index, 3999)
+        self.assertEqual(engine.positions['AAA'].quantity, 4000)
+        self.assertAlmostEqual(engine.cash, 1e6 - 4000)
+
+    def test_publisher_attach_detach_during_notify(self):
+        publisher = SignalPublisher()
+        stable = CountingObserver()
+        with contextlib.redirect_stdout(io.StringIO()):
+            publisher.attach(stable)
+            stop = threading.Event()
+
+            def churn():
+                while not stop.is_set():
+                    observer = CountingObserver()
+                    publisher.attach(observer)
+                    publisher.detach(observer)
+
+            churner = threading.Thread(target=churn)
+            churner.start()
+            for _ in range(5000):
+                publisher.notify({'signal_type': 'BUY'})
+            stop.set()
+            churner.join()
+        self.assertEqual(stable.count, 5000)
+        self.assertEqual(publisher.observers, [stable])
+
+
+if __name__ == '__main__':
+    unittest.main()
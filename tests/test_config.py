@@ -0,0 +1,98 @@
+import unittest
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+from unittest import mock
+
+# Ensure project root is importable when running tests
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from patterns.Singleton_ConfigAccess import Config, StrategyParams
+from patterns.Strategy_SignalGen import MeanReversionStrategy, BreakoutStrategy
+
+
+class ConfigTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, 'strategy_params.json')
+        self.write_params(30, 0.05)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write_params(self, lookback, threshold):
+        with open(self.path, 'w') as f:
+            json.dump({'MeanReversionStrategy': {'lookback_window': lookback, 'threshold': threshold},
+                       'BreakoutStrategy': {}}, f)
+        # Make sure the mtime changes even on coarse-grained filesystems
+        stat = os.stat(self.path)
+        os.utime(self.path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000 * lookback))
+
+    def test_typed_settings_and_strategy_params(self):
+        config = Config()
+        self.assertEqual(config.log_level, config.config.get('log_level'))
+        params = config.get_strategy_params('MeanReversionStrategy')
+        self.assertIsInstance(params, StrategyParams)
+        self.assertEqual(params.lookback_window, 20)
+        # Parsed once: the same view object is returned
+        self.assertIs(config.load_strategy_params(), config.load_strategy_params())
+
+    def test_strategies_load_through_config(self):
+        strat = MeanReversionStrategy()
+        strat.load_params(self.path)
+        self.assertEqual((strat.lookback_window, strat.threshold), (30, 0.05))
+        # Missing keys fall back to the strategy defaults
+        breakout = BreakoutStrategy()
+        breakout.load_params(self.path)
+        self.assertEqual((breakout.lookback_window, breakout.threshold), (15, 0.03))
+
+    def test_reload_on_change_notifies_listeners(self):
+        config = Config()
+        config.load_strategy_params(self.path)
+        events = []
+        listener = lambda cfg, changed: events.append(changed)
+        config.add_listener(listener)
+        try:
+            self.assertEqual(config.reload(), [])
+            self.write_params(40, 0.01)
+            changed = config.reload()
+            self.assertEqual(changed, [os.path.abspath(self.path)])
+            self.assertEqual(events, [changed])
+            self.assertEqual(config.get_strategy_params('MeanReversionStrategy', self.path).lookback_window, 40)
+        finally:
+            config.remove_listener(listener)
+
+    def test_rewritten_file_is_read_after_check_interval(self):
+        config = Config()
+        self.assertEqual(config.get_strategy_params('MeanReversionStrategy', self.path).lookback_window, 30)
+        self.write_params(45, 0.02)
+        # Within check_interval the cached snapshot is served without touching the disk
+        config._last_check = time.monotonic()
+        with mock.patch('os.stat', side_effect=AssertionError("stat on the hot path")):
+            for _ in range(100):
+                self.assertEqual(config.get_strategy_params('MeanReversionStrategy', self.path).lookback_window, 30)
+        config._last_check -= config.check_interval
+        params = config.get_strategy_params('MeanReversionStrategy', self.path)
+        self.assertEqual((params.lookback_window, params.threshold), (45, 0.02))
+        strat = MeanReversionStrategy()
+        strat.load_params(self.path)
+        self.assertEqual(strat.lookback_window, 45)
+
+    def test_thread_safe_singleton(self):
+        instances = []
+        threads = [threading.Thread(target=lambda: instances.append(Config())) for _ in range(16)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertTrue(all(i is Config() for i in instances))
+
+
+if __name__ == '__main__':
+    unittest.main()
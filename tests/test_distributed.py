@@ -0,0 +1,127 @@
+import unittest
+import contextlib
+import io
+import os
+import sys
+import tempfile
+from multiprocessing import Process
+from multiprocessing.connection import Client
+from unittest import mock
+
+# Ensure project root is importable when running tests
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from distributed import Coordinator, main, make_shards, parse_address, spawn_local_workers
+from market_data import MarketData
+from runner import run_jobs
+from benchmarks.synthetic_data import generate_market_data, write_market_data_csv
+
+AUTHKEY = b'test-key'
+
+
+def _crashing_worker(address, authkey):
+    # Takes one shard, sends half a result and dies without reporting it done
+    conn = Client(address, authkey=authkey)
+    conn.send(('hello', 'crasher'))
+    conn.send(('ready',))
+    _, task_id, shard = conn.recv()
+    conn.send(('result', task_id, 0, {'symbol': shard.symbols[0], 'bogus': True}))
+    os._exit(1)
+
+
+class DistributedTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.df = generate_market_data(n_symbols=6, n_ticks=300, seed=12)
+        self.csv = os.path.join(self.tmp.name, 'data.csv')
+        write_market_data_csv(self.df, self.csv)
+        self.symbols = MarketData(self.df).symbols
+
+    def _join(self, processes):
+        for process in processes:
+            process.join(timeout=30)
+            self.assertFalse(process.is_alive())
+
+    def test_make_shards_and_addresses(self):
+        shards = make_shards(['MeanReversionStrategy', 'BreakoutStrategy'], self.symbols,
+                             param_sets=[None, {'lookback_window': 5}], shard_size=4)
+        self.assertEqual(len(shards), 2 * 2 * 2)
+        self.assertEqual([len(s.symbols) for s in shards[:2]], [4, 2])
+        self.assertEqual(parse_address('10.0.0.5:6000'), ('10.0.0.5', 6000))
+        self.assertEqual(parse_address('/tmp/backtest.sock'), '/tmp/backtest.sock')
+
+    def test_cli_requires_an_authkey(self):
+        with mock.patch.dict(os.environ, {}, clear=True), contextlib.redirect_stderr(io.StringIO()):
+            with self.assertRaises(SystemExit):
+                main(['worker', '--connect', '127.0.0.1:6000', '--data', self.csv])
+        with self.assertRaises(TypeError):
+            Coordinator()
+
+    def test_cli_times_out_without_workers(self):
+        output = os.path.join(self.tmp.name, 'results.json')
+        err = io.StringIO()
+        with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(err):
+            code = main(['coordinator', '--bind', '127.0.0.1:0', '--data', self.csv, '--authkey', 'test-key',
+                         '--timeout', '0.2', '--output', output])
+        self.assertEqual(code, 1)
+        self.assertIn('timed out after 0.2s', err.getvalue())
+        self.assertIn('0 worker(s) connected', err.getvalue())
+        self.assertFalse(os.path.exists(output))
+
+    def test_local_workers_match_serial_runner(self):
+        shards = make_shards(['MeanReversionStrategy', 'BreakoutStrategy'], self.symbols, shard_size=2)
+        with Coordinator(authkey=AUTHKEY) as coordinator:
+            workers = spawn_local_workers(coordinator.address, self.csv, 3, AUTHKEY, params_file=None)
+            results = coordinator.run(shards, timeout=60)
+        self._join(workers)
+
+        expected = run_jobs([(s.strategy, symbol, None) for s in shards for symbol in s.symbols],
+                            MarketData(self.df), params_file=None)
+        self.assertEqual([(r['strategy'], r['symbol']) for r in results],
+                         [(r['strategy'], r['symbol']) for r in expected])
+        for got, want in zip(results, expected):
+            self.assertEqual(got['total_trades'], want['total_trades'])
+            self.assertAlmostEqual(got['final_portfolio_value'], want['final_portfolio_value'])
+        self.assertGreater(len({r['worker'] for r in results}), 1)
+
+    def test_unix_socket(self):
+        address = os.path.join(self.tmp.name, 'coordinator.sock')
+        with Coordinator(address, authkey=AUTHKEY) as coordinator:
+            workers = spawn_local_workers(coordinator.address, self.csv, 1, AUTHKEY, params_file=None)
+            results = coordinator.run(make_shards(['BreakoutStrategy'], self.symbols[:2]), timeout=60)
+        self._join(workers)
+        self.assertEqual(len(results), 2)
+        self.assertFalse(any('error' in r for r in results))
+
+    def test_dead_worker_shard_is_retried(self):
+        shards = make_shards(['MeanReversionStrategy'], self.symbols, shard_size=3)
+        with Coordinator(authkey=AUTHKEY, max_retries=2) as coordinator:
+            ids = coordinator.submit(shards)
+            crasher = Process(target=_crashing_worker, args=(coordinator.address, AUTHKEY))
+            crasher.start()
+            crasher.join(timeout=30)
+            workers = spawn_local_workers(coordinator.address, self.csv, 2, AUTHKEY, params_file=None)
+            results = coordinator.wait(ids, timeout=60)
+        self._join(workers)
+        self.assertEqual(coordinator.retries, 1)
+        self.assertEqual([r['symbol'] for r in results], self.symbols)
+        self.assertFalse(any('bogus' in r or 'error' in r for r in results))
+
+    def test_gives_up_after_max_retries(self):
+        shards = make_shards(['MeanReversionStrategy'], self.symbols[:2])
+        with Coordinator(authkey=AUTHKEY, max_retries=0) as coordinator:
+            ids = coordinator.submit(shards)
+            crasher = Process(target=_crashing_worker, args=(coordinator.address, AUTHKEY))
+            crasher.start()
+            crasher.join(timeout=30)
+            results = coordinator.wait(ids, timeout=30)
+        self.assertEqual(len(results), 2)
+        self.assertTrue(all('gave up after 1 attempt' in r['error'] for r in results))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,66 @@
+import unittest
+import contextlib
+import io
+import os
+import sys
+from datetime import datetime
+
+import numpy as np
+
+# Ensure project root is importable when running tests
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from engine import BacktestEngine
+from equity_curve import EquityCurve
+from patterns.Strategy_SignalGen import MeanReversionStrategy
+from benchmarks.synthetic_data import generate_market_data
+
+
+class EquityCurveTestCase(unittest.TestCase):
+
+    def test_incremental_mark_to_market(self):
+        curve = EquityCurve(capacity=2)
+        ts = datetime(2025, 1, 1)
+        curve.on_tick('A', 10.0)
+        curve.update_position('A', 5, 10.0)
+        self.assertEqual(curve.record(ts, cash=50.0), 100.0)
+        curve.on_tick('A', 12.0)
+        self.assertEqual(curve.record(ts, cash=50.0), 110.0)
+        curve.update_position('A', 0, 12.0)
+        self.assertEqual(curve.record(ts, cash=110.0), 110.0)  # grows past capacity
+        self.assertEqual(curve.size, 3)
+        self.assertEqual(curve.traded_notional, 5 * 10.0 + 5 * 12.0)
+
+        stats = curve.get_stats()
+        self.assertAlmostEqual(stats['max_drawdown'], 0.0)
+        self.assertEqual(stats['points'], 3)
+
+    def test_max_drawdown(self):
+        curve = EquityCurve()
+        for value in (100.0, 120.0, 90.0, 130.0):
+            curve.record(datetime(2025, 1, 1), cash=value)
+        self.assertAlmostEqual(curve.get_stats()['max_drawdown'], 0.25)
+
+    def test_backtest_records_every_tick(self):
+        df = generate_market_data(n_symbols=2, n_ticks=1500, seed=11)
+        engine = BacktestEngine()
+        with contextlib.redirect_stdout(io.StringIO()):
+            results = engine.backtest_strategy(MeanReversionStrategy(lookback_window=5, threshold=0.002), 'SYM0000', df)
+
+        self.assertEqual(engine.curve.size, 1500)
+        self.assertGreater(results['total_trades'], 0)
+        # Final point matches a full DataFrame revaluation
+        last_ts = df['timestamp'].iloc[-1]
+        expected = engine.calculate_portfolio_value(df, last_ts)
+        self.assertAlmostEqual(engine.curve.get_values()[-1], expected, places=6)
+        self.assertAlmostEqual(results['final_portfolio_value'], expected, places=6)
+        self.assertEqual(len(engine.equity_curve), 3)  # ticks 0, 1000 and the last one
+        self.assertTrue(np.all(np.diff(engine.curve.get_timestamps().astype(np.int64)) > 0))
+        for key in ('sharpe', 'max_drawdown', 'turnover'):
+            self.assertIn(key, results['equity'])
+
+
+if __name__ == '__main__':
+    unittest.main()
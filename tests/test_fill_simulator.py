@@ -0,0 +1,120 @@
+import unittest
+import contextlib
+import io
+import os
+import sys
+from datetime import datetime, timedelta
+
+# Ensure project root is importable when running tests
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from engine import BacktestEngine
+from fill_simulator import (FillSimulator, FixedBpsSlippage, SquareRootImpactSlippage,
+                            PerShareCommission, BpsCommission)
+from market_data import MarketData
+from models import MarketDataPoint
+from patterns.Strategy_SignalGen import MeanReversionStrategy
+from benchmarks.synthetic_data import generate_market_data
+
+
+def tick(minute, price, daily_volume=None, day=1, symbol='AAA'):
+    return MarketDataPoint(timestamp=datetime(2025, 1, day, 10, 0) + timedelta(minutes=minute),
+                           symbol=symbol, price=price, daily_volume=daily_volume)
+
+
+class FillSimulatorTestCase(unittest.TestCase):
+
+    def test_participation_caps_fills_per_day(self):
+        sim = FillSimulator(participation=0.1)
+        sim.submit('AAA', 'BUY', 250)
+        self.assertEqual([f.quantity for f in sim.on_tick(tick(0, 10.0, 1000))], [100])
+        self.assertEqual(sim.on_tick(tick(1, 10.0, 1000)), [])  # day's capacity used up
+        fills = sim.on_tick(tick(0, 10.0, 1000, day=2))
+        self.assertEqual([(f.quantity, f.remaining) for f in fills], [(100, 50)])
+        self.assertEqual(sim.on_tick(tick(0, 10.0, 1000, day=3))[0].quantity, 50)
+        self.assertEqual(sim.stats()['fill_ratio'], 1.0)
+        self.assertEqual(sim.stats()['open_orders'], 0)
+
+    def test_market_orders_fill_first_in_fifo_order(self):
+        sim = FillSimulator(max_fill_per_tick=3)
+        first = sim.submit('AAA', 'BUY', 2)
+        second = sim.submit('AAA', 'SELL', 2)
+        sim.submit('BBB', 'BUY', 5)
+        fills = sim.on_tick(tick(0, 10.0))
+        self.assertEqual([(f.order_id, f.quantity) for f in fills], [(first, 2), (second, 1)])
+        self.assertEqual([(f.order_id, f.quantity) for f in sim.on_tick(tick(1, 10.0))], [(second, 1)])
+        self.assertEqual(len(sim.open_orders('BBB')), 1)
+
+    def test_limit_orders_by_price_then_time(self):
+        sim = FillSimulator()
+        low = sim.submit('AAA', 'BUY', 1, limit_price=9.0)
+        high = sim.submit('AAA', 'BUY', 1, limit_price=9.5)
+        high_later = sim.submit('AAA', 'BUY', 1, limit_price=9.5)
+        ask = sim.submit('AAA', 'SELL', 1, limit_price=11.0)
+        self.assertEqual(sim.on_tick(tick(0, 10.0)), [])
+        self.assertEqual([f.order_id for f in sim.on_tick(tick(1, 9.4))], [high, high_later])
+        self.assertEqual([f.order_id for f in sim.on_tick(tick(2, 8.0))], [low])
+        self.assertEqual([f.order_id for f in sim.on_tick(tick(3, 11.5))], [ask])
+
+    def test_cancel(self):
+        sim = FillSimulator()
+        order_id = sim.submit('AAA', 'SELL', 1, limit_price=12.0)
+        self.assertTrue(sim.cancel(order_id))
+        self.assertFalse(sim.cancel(order_id))
+        self.assertEqual(sim.on_tick(tick(0, 13.0)), [])
+        self.assertEqual(sim.books['AAA'].asks, [])  # no live orders left, queue emptied
+
+    def test_slippage_and_commission(self):
+        sim = FillSimulator(slippage=FixedBpsSlippage(10), commission=PerShareCommission(0.01, minimum=1.0))
+        sim.submit('AAA', 'BUY', 10)
+        sim.submit('AAA', 'SELL', 10)
+        buy, sell = sim.on_tick(tick(0, 100.0))
+        self.assertAlmostEqual(buy.price, 100.1)
+        self.assertAlmostEqual(sell.price, 99.9)
+        self.assertEqual(buy.commission, 1.0)
+        self.assertAlmostEqual(sim.slippage_cost, 2.0)
+
+        impact = FillSimulator(slippage=SquareRootImpactSlippage(coefficient=0.1), commission=BpsCommission(5))
+        impact.submit('AAA', 'BUY', 100, limit_price=100.5)
+        fill = impact.on_tick(tick(0, 100.0, daily_volume=10000))[0]
+        self.assertAlmostEqual(fill.price, 100.5)  # 1% impact capped at the limit
+        self.assertAlmostEqual(fill.commission, 100.5 * 100 * 5 / 10000)
+
+
+class EngineFillSimulationTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.data = MarketData(generate_market_data(n_symbols=1, n_ticks=800, seed=9))
+        self.prices = self.data.prices('SPY')
+
+    def test_signals_fill_on_the_next_tick(self):
+        engine = BacktestEngine()
+        engine.enable_fill_simulation(commission=PerShareCommission(0.5))
+        with contextlib.redirect_stdout(io.StringIO()):
+            results = engine.backtest_strategy(MeanReversionStrategy(5, 0.002), 'SPY', self.data)
+        self.assertGreater(results['total_trades'], 0)
+        timestamps = list(self.data.get('SPY')['timestamp'])
+        for trade in engine.trades:
+            i = timestamps.index(trade.timestamp)
+            self.assertGreater(i, 0)
+            self.assertEqual(trade.price, self.prices[i])
+        self.assertEqual(results['fills']['fills'], results['total_trades'])
+        self.assertAlmostEqual(results['fills']['commission_paid'], 0.5 * results['total_trades'])
+        expected_cash = 100000 - sum(t.cost for t in engine.trades)
+        self.assertAlmostEqual(engine.cash, expected_cash)
+        self.assertAlmostEqual(results['final_portfolio_value'], engine.curve.get_values()[-1])
+
+    def test_unaffordable_fill_cancels_order(self):
+        engine = BacktestEngine(initial_capital=0.0)
+        sim = engine.enable_fill_simulation()
+        sim.submit('AAA', 'BUY', 5)
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.assertFalse(engine.apply_fills(sim.on_tick(tick(0, 10.0))))
+        self.assertEqual(engine.trades, [])
+        self.assertEqual(sim.open_orders(), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
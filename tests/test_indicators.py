@@ -0,0 +1,147 @@
+import unittest
+import contextlib
+import io
+import os
+import sys
+from datetime import datetime
+
+import numpy as np
+
+# Ensure project root is importable when running tests
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from engine import BacktestEngine
+from indicators import Indicator, IndicatorGraph, RollingMax, RollingMin, RollingStd, SMA
+from market_data import MarketData
+from models import MarketDataPoint
+from portfolio_engine import MultiStrategyEngine
+from patterns.Strategy_SignalGen import MeanReversionStrategy, BreakoutStrategy
+from benchmarks.synthetic_data import generate_market_data
+
+
+class IndicatorGraphTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.data = MarketData(generate_market_data(n_symbols=1, n_ticks=800, seed=6))
+        self.prices = self.data.prices('SPY')
+
+    def test_nodes_are_deduplicated_with_dependencies(self):
+        graph = IndicatorGraph()
+        for _ in range(20):
+            graph.attach(MeanReversionStrategy(lookback_window=20))
+        graph.add(RollingStd(20), RollingStd(10))
+        self.assertEqual(graph.nodes, [SMA(20), RollingStd(20), SMA(10), RollingStd(10)])
+        self.assertEqual(graph.depth, 20)
+        with self.assertRaises(ValueError):
+            Indicator('ema', 5)
+
+    def test_tick_values_match_numpy_and_batch(self):
+        graph = IndicatorGraph([SMA(5), RollingMax(7), RollingMin(7), RollingStd(5)])
+        batch = graph.compute_batch(self.prices)
+        for i, price in enumerate(self.prices):
+            values = graph.on_tick(MarketDataPoint(None, 'SPY', float(price)))
+            if i < 6:
+                self.assertIsNone(values[RollingMax(7)])
+                continue
+            self.assertEqual(values[SMA(5)], batch[SMA(5)][i])
+            self.assertEqual(values[RollingMax(7)], self.prices[i - 6:i + 1].max())
+            self.assertEqual(values[RollingMin(7)], batch[RollingMin(7)][i])
+            self.assertAlmostEqual(values[RollingStd(5)], self.prices[i - 4:i + 1].std(ddof=1))
+            self.assertAlmostEqual(values[RollingStd(5)], batch[RollingStd(5)][i])
+        self.assertTrue(np.isnan(batch[SMA(5)][3]))
+
+    def test_views_are_read_only(self):
+        graph = IndicatorGraph([SMA(2)])
+        view = graph.on_tick(MarketDataPoint(None, 'SPY', 1.0))
+        with self.assertRaises(TypeError):
+            view[SMA(2)] = 5.0
+        graph.on_tick(MarketDataPoint(None, 'SPY', 3.0))
+        self.assertEqual(view[SMA(2)], 2.0)  # live
+        with self.assertRaises(ValueError):
+            graph.compute_batch(self.prices)[SMA(2)][0] = 1.0
+
+    def test_shared_tick_is_computed_once(self):
+        graph = IndicatorGraph()
+        strategies = [MeanReversionStrategy(lookback_window=10, threshold=0.001) for _ in range(20)]
+        for strategy in strategies:
+            graph.attach(strategy)
+        for price in self.prices[:50]:
+            tick = MarketDataPoint(None, 'SPY', float(price))
+            for strategy in strategies:
+                strategy.generate_signals(tick)
+        self.assertEqual(graph.computations, 41)  # one SMA(10) per tick once the window is full
+
+    def test_repeated_prints_match_standalone_strategies(self):
+        # Same-second prints at the same price are separate ticks, not one repeated tick
+        prices = [100.0, 100.0, 100.0, 99.0, 99.0, 101.0, 101.0, 101.0, 99.5, 99.5, 99.0, 101.5, 101.5, 101.5, 99.0]
+        ticks = [MarketDataPoint(datetime(2025, 1, 1, 9, 30, i // 2), 'SPY', p) for i, p in enumerate(prices)]
+
+        def build():
+            return [MeanReversionStrategy(3, 0.001), MeanReversionStrategy(3, 0.002),
+                    BreakoutStrategy(3, -0.005)]
+
+        standalone = build()
+        expected = [[s.generate_signals(tick) for tick in ticks] for s in standalone]
+        self.assertIn(1, expected[0])
+        shared = build()
+        graph = IndicatorGraph()
+        for strategy in shared:
+            graph.attach(strategy)
+        signals = [[] for _ in shared]
+        for tick in ticks:
+            for out, strategy in zip(signals, shared):
+                out.append(strategy.generate_signals(tick))
+        self.assertEqual(signals, expected)
+        self.assertEqual(graph.get_state(), {'SPY': prices[-3:]})
+
+    def test_attached_strategy_state_round_trips(self):
+        ticks = [MarketDataPoint(i, 'SPY', float(p)) for i, p in enumerate(self.prices[:60])]
+        reference = MeanReversionStrategy(lookback_window=10, threshold=0.001)
+        IndicatorGraph().attach(reference)
+        expected = [reference.generate_signals(tick) for tick in ticks]
+
+        first = MeanReversionStrategy(lookback_window=10, threshold=0.001)
+        IndicatorGraph().attach(first)
+        for tick in ticks[:30]:
+            first.generate_signals(tick)
+        state = first.get_state()
+        self.assertEqual(state['SPY'], [float(p) for p in self.prices[20:30]])
+
+        resumed = MeanReversionStrategy(lookback_window=10, threshold=0.001)
+        IndicatorGraph().attach(resumed)
+        resumed.set_state(state)
+        self.assertEqual([resumed.generate_signals(tick) for tick in ticks[30:]], expected[30:])
+
+    def test_multi_strategy_engine_detaches_strategies(self):
+        strategies = {'mr': MeanReversionStrategy(lookback_window=10), 'bo': BreakoutStrategy(lookback_window=10)}
+        with contextlib.redirect_stdout(io.StringIO()):
+            MultiStrategyEngine(strategies).backtest('SPY', self.data)
+        self.assertIsNone(strategies['mr'].indicator_graph)
+        self.assertIsNone(strategies['bo'].indicator_graph)
+
+    def test_signals_match_standalone_strategies(self):
+        def build():
+            return {
+                'mr_a': MeanReversionStrategy(lookback_window=10, threshold=0.002),
+                'mr_b': MeanReversionStrategy(lookback_window=10, threshold=0.004),
+                'bo': BreakoutStrategy(lookback_window=10, threshold=-0.005),
+            }
+        with contextlib.redirect_stdout(io.StringIO()):
+            shared = MultiStrategyEngine(build()).backtest('SPY', self.data)
+            alone = MultiStrategyEngine(build(), share_indicators=False).backtest('SPY', self.data)
+            single = BacktestEngine(initial_capital=100000 / 3)
+            strategy = BreakoutStrategy(lookback_window=10, threshold=-0.005)
+            IndicatorGraph().attach(strategy)
+            single_results = single.backtest_strategy(strategy, 'SPY', self.data)
+        for name in ('mr_a', 'mr_b', 'bo'):
+            self.assertEqual(shared['strategies'][name]['total_trades'], alone['strategies'][name]['total_trades'])
+            self.assertAlmostEqual(shared['strategies'][name]['final_portfolio_value'],
+                                   alone['strategies'][name]['final_portfolio_value'])
+        self.assertGreater(shared['combined']['total_trades'], 0)
+        self.assertEqual(single_results['total_trades'], shared['strategies']['bo']['total_trades'])
+
+
+if __name__ == '__main__':
+    unittest.main()
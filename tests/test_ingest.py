@@ -0,0 +1,121 @@
+import unittest
+import json
+import os
+import sys
+import tempfile
+
+import numpy as np
+
+# Ensure project root is importable when running tests
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from Adapter_DataLoader import YahooFinanceAdapter, BloombergXMLAdapter
+from ingest import MarketDataStore, find_vendor_files, ingest
+
+
+def write_yahoo(path, quotes):
+    with open(path, 'w') as f:
+        json.dump([{'ticker': s, 'last_price': p, 'timestamp': t} for s, p, t in quotes], f)
+
+
+def write_bloomberg(path, quotes):
+    lines = ['<instruments>']
+    for symbol, price, timestamp in quotes:
+        lines.append(f'<instrument><symbol>{symbol}</symbol><price>{price}</price>'
+                     f'<timestamp>{timestamp}</timestamp></instrument>')
+    lines.append('</instruments>')
+    with open(path, 'w') as f:
+        f.write('\n'.join(lines))
+
+
+class IngestTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.drop = os.path.join(self.tmp.name, 'drop')
+        self.store_dir = os.path.join(self.tmp.name, 'store')
+        os.makedirs(os.path.join(self.drop, 'bbg'))
+        for i in range(12):
+            minute = f"{i:02d}"
+            write_yahoo(os.path.join(self.drop, f'yahoo_{i}.json'),
+                        [('AAPL', 100 + i, f'2025-10-01T09:{minute}:00Z')])
+            write_bloomberg(os.path.join(self.drop, 'bbg', f'bbg_{i}.xml'),
+                            [('MSFT', 200 + i, f'2025-10-01T09:{minute}:00Z'),
+                             ('SPY', 400 + i, f'2025-10-01T09:{minute}:00Z')])
+
+    def test_adapters_read_given_file(self):
+        yahoo = YahooFinanceAdapter(os.path.join(self.drop, 'yahoo_3.json'))
+        self.assertEqual(yahoo.get_data('AAPL').price, 103.0)
+        bbg = BloombergXMLAdapter(os.path.join(self.drop, 'bbg', 'bbg_3.xml'))
+        self.assertEqual([p.symbol for p in bbg.get_all()], ['MSFT', 'SPY'])
+
+    def test_ingest_sorted_and_loadable(self):
+        summary = ingest([self.drop], self.store_dir, workers=2)
+        self.assertEqual(summary['files_found'], 24)
+        self.assertEqual(summary['files_ingested'], 24)
+        self.assertEqual(summary['rows'], 36)
+        data = MarketDataStore(self.store_dir).load()
+        self.assertEqual(sorted(data.symbols), ['AAPL', 'MSFT', 'SPY'])
+        np.testing.assert_array_equal(data.prices('MSFT'), 200.0 + np.arange(12))
+        self.assertTrue(np.all(np.diff(data.timestamps_ns('SPY')) > 0))
+        self.assertEqual(str(data.timestamps('AAPL')[0]), '2025-10-01T09:00:00.000000000')
+
+    def test_rerun_is_incremental(self):
+        ingest([self.drop], self.store_dir)
+        again = ingest([self.drop], self.store_dir)
+        self.assertEqual((again['files_ingested'], again['files_skipped'], again['rows']), (0, 24, 36))
+
+        # A correction for an existing tick replaces it; a new tick is added
+        write_yahoo(os.path.join(self.drop, 'yahoo_fix.json'),
+                    [('AAPL', 999.0, '2025-10-01T09:05:00Z'), ('AAPL', 1.0, '2025-10-01T10:00:00Z')])
+        summary = ingest([self.drop], self.store_dir)
+        self.assertEqual((summary['files_ingested'], summary['rows_added'], summary['rows']), (1, 1, 37))
+        self.assertEqual(summary['duplicates_dropped'], 1)
+        prices = MarketDataStore(self.store_dir).load().prices('AAPL')
+        self.assertEqual(prices[5], 999.0)
+        self.assertEqual(prices[-1], 1.0)
+
+    def test_each_ingest_writes_a_new_chunk(self):
+        ingest([self.drop], self.store_dir)
+        first_chunk = os.path.join(self.store_dir, 'price.1.npy')
+        written = os.stat(first_chunk).st_mtime_ns
+        write_yahoo(os.path.join(self.drop, 'yahoo_fix.json'),
+                    [('AAPL', 999.0, '2025-10-01T09:05:00Z'), ('QQQ', 300.0, '2025-10-01T09:05:00Z')])
+        ingest([self.drop], self.store_dir)
+
+        store = MarketDataStore(self.store_dir)
+        self.assertEqual([c['rows'] for c in store.manifest['chunks']], [36, 2])
+        self.assertEqual(os.stat(first_chunk).st_mtime_ns, written)  # earlier chunk untouched
+        self.assertEqual(store.manifest['symbols'], ['AAPL', 'MSFT', 'SPY', 'QQQ'])
+        data = store.load()
+        self.assertEqual(data.prices('AAPL')[5], 999.0)  # later chunk wins
+        self.assertEqual(len(data.prices('AAPL')), 12)
+        self.assertEqual(len(store.columns()['price']), len(store))
+
+        before = store.to_frame()
+        self.assertEqual(store.compact(), 2)
+        self.assertEqual(len(MarketDataStore(self.store_dir).manifest['chunks']), 1)
+        self.assertFalse(os.path.exists(first_chunk))
+        self.assertTrue(MarketDataStore(self.store_dir).to_frame().equals(before))
+
+    def test_bad_files_are_reported_and_retried(self):
+        with open(os.path.join(self.drop, 'broken.json'), 'w') as f:
+            f.write('{not json')
+        summary = ingest([self.drop], self.store_dir)
+        self.assertEqual(len(summary['errors']), 1)
+        self.assertEqual(summary['files_ingested'], 24)
+        self.assertNotIn('broken.json', json.dumps(MarketDataStore(self.store_dir).manifest['files']))
+        self.assertEqual(len(ingest([self.drop], self.store_dir)['errors']), 1)
+
+    def test_find_vendor_files_filters_extensions(self):
+        open(os.path.join(self.drop, 'notes.txt'), 'w').close()
+        files = find_vendor_files([self.drop])
+        self.assertEqual(len(files), 24)
+        self.assertEqual(files, sorted(files))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,70 @@
+import unittest
+import os
+import sys
+import tempfile
+
+# Ensure project root is importable when running tests
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from patterns.Factory_InstrumentTypes import InstrumentFactory, InstrumentRegistry, Stock, Bond, ETF
+
+
+class InstrumentRegistryTestCase(unittest.TestCase):
+
+    def test_lazy_interned_lookup(self):
+        path = os.path.join(ROOT, 'inputs', 'instruments.csv')
+        with InstrumentFactory.load_registry(path) as registry:
+            self.assertEqual(len(registry), 4)
+            self.assertEqual(registry.loaded_count(), 0)
+
+            bond = registry['US10Y']
+            self.assertIsInstance(bond, Bond)
+            self.assertEqual(bond.maturity, '2035-10-01')
+            self.assertEqual(bond.price, 100.0)
+            self.assertIs(registry.get('US10Y'), bond)
+            self.assertEqual(registry.loaded_count(), 1)
+
+            self.assertIsNone(registry.get('NOPE'))
+            with self.assertRaises(KeyError):
+                registry['NOPE']
+            self.assertEqual([i.symbol for i in registry], ['AAPL', 'MSFT', 'US10Y', 'SPY'])
+            self.assertIsInstance(registry['SPY'], ETF)
+
+    def test_large_security_master(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'master.csv')
+            with open(path, 'w') as f:
+                f.write('symbol,type,price,sector,issuer,maturity\n')
+                for i in range(50000):
+                    f.write(f'S{i},Stock,{i}.5,Tech,"Issuer, Inc. {i}",\n')
+            registry = InstrumentRegistry(path)
+            self.assertEqual(len(registry), 50000)
+            stock = registry['S49999']
+            self.assertIsInstance(stock, Stock)
+            self.assertEqual(stock.issuer, 'Issuer, Inc. 49999')
+            self.assertEqual(stock.price, 49999.5)
+            self.assertEqual(registry.loaded_count(), 1)
+            registry.close()
+
+    def test_header_with_bom(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'excel.csv')
+            with open(path, 'w', encoding='utf-8-sig') as f:
+                f.write('symbol,type,price\nAAPL,Stock,190.5\nSPY,ETF,500\n')
+            for encoding in ('utf-8-sig', 'utf-8'):
+                registry = InstrumentRegistry(path, encoding=encoding)
+                self.assertEqual(registry.fieldnames, ['symbol', 'type', 'price'])
+                self.assertEqual(registry['AAPL'].price, 190.5)
+                self.assertIsInstance(registry['SPY'], ETF)
+                registry.close()
+
+    def test_instruments_are_slotted(self):
+        s = InstrumentFactory.create_instrument({'symbol': 'X', 'type': 'stock', 'price': '10'})
+        self.assertFalse(hasattr(s, '__dict__'))
+        self.assertFalse(hasattr(s, 'data'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,67 @@
+import unittest
+import cProfile
+import contextlib
+import io
+import os
+import sys
+
+# Ensure project root is importable when running tests
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from engine import BacktestEngine
+from instrumentation import EngineInstrumentation, STAGES
+from patterns.Observer_SignalNotification import LoggerObserver
+from patterns.Strategy_SignalGen import MeanReversionStrategy
+from benchmarks.synthetic_data import generate_market_data
+
+
+class InstrumentationTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.df = generate_market_data(n_symbols=2, n_ticks=500, seed=3)
+
+    def run_backtest(self, engine, strategy):
+        with contextlib.redirect_stdout(io.StringIO()):
+            return engine.backtest_strategy(strategy, 'SYM0000', self.df)
+
+    def test_disabled_by_default(self):
+        engine = BacktestEngine()
+        results = self.run_backtest(engine, MeanReversionStrategy())
+        self.assertIsNone(engine.instrumentation)
+        self.assertNotIn('instrumentation', results)
+        self.assertEqual(results['symbol'], 'SYM0000')
+
+    def test_stage_timers_and_histogram(self):
+        engine = BacktestEngine()
+        engine.enable_instrumentation()
+        strategy = MeanReversionStrategy(lookback_window=5, threshold=0.001)
+        strategy.publisher.attach(LoggerObserver())
+        results = self.run_backtest(engine, strategy)
+
+        summary = results['instrumentation']
+        self.assertEqual(set(summary['stages']), set(STAGES))
+        self.assertEqual(summary['ticks'], 500)
+        self.assertEqual(summary['stages']['create_data_point']['calls'], 500)
+        self.assertEqual(summary['stages']['generate_signals']['calls'], 500)
+        self.assertGreater(summary['stages']['notify']['calls'], 0)
+        self.assertEqual(sum(b['count'] for b in summary['tick_latency']['histogram']), 500)
+        self.assertLessEqual(summary['tick_latency']['p50_us'], summary['tick_latency']['p99_us'])
+        # The publisher is restored once the run is over
+        self.assertNotIn('notify', strategy.publisher.__dict__)
+
+    def test_profiler_hook(self):
+        engine = BacktestEngine(instrumentation=EngineInstrumentation(profiler=cProfile.Profile()))
+        results = self.run_backtest(engine, MeanReversionStrategy())
+        profile = results['instrumentation']['profile']
+        self.assertTrue(profile)
+        self.assertLessEqual(len(profile), 20)
+        # Look it up in the full table: in the top 20 it can rank behind pandas internals
+        rows = engine.instrumentation.profile_stats(limit=None)
+        calls = [row['calls'] for row in rows if 'generate_signals' in row['function']]
+        self.assertEqual(calls, [500])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,86 @@
+import unittest
+import contextlib
+import io
+import os
+import sys
+from datetime import datetime
+
+import numpy as np
+
+# Ensure project root is importable when running tests
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from engine import BacktestEngine
+from kernels import NUMBA_AVAILABLE, run_kernel
+from models import MarketDataPoint
+from patterns.Strategy_SignalGen import MeanReversionStrategy, BreakoutStrategy
+
+
+def random_walk(n, seed=5):
+    rng = np.random.default_rng(seed)
+    return 100.0 * np.exp(np.cumsum(rng.normal(0.0, 0.01, size=n)))
+
+
+def reference_run(strategy, prices, initial_cash):
+    """Drive the pure-Python strategy and engine tick by tick."""
+    engine = BacktestEngine(initial_capital=initial_cash)
+    signals, positions, cash = [], [], []
+    with contextlib.redirect_stdout(io.StringIO()):
+        for price in prices:
+            tick = MarketDataPoint(timestamp=datetime(2025, 1, 1), symbol='SIM', price=float(price))
+            signal = strategy.generate_signals(tick)
+            if signal == 1:
+                engine.execute_trade(tick.timestamp, 'SIM', 'BUY', tick.price)
+            elif signal == -1:
+                engine.execute_trade(tick.timestamp, 'SIM', 'SELL', tick.price)
+            signals.append(signal)
+            positions.append(engine.positions['SIM'].quantity if 'SIM' in engine.positions else 0)
+            cash.append(engine.cash)
+    return np.array(signals), np.array(positions), np.array(cash)
+
+
+class KernelEquivalenceTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.prices = random_walk(3000)
+        # Small cash so BUYs are sometimes rejected and SELLs sometimes lack shares
+        self.cash = 1000.0
+        self.strategies = [
+            lambda: MeanReversionStrategy(lookback_window=10, threshold=0.01),
+            lambda: BreakoutStrategy(lookback_window=8, threshold=-0.005),
+            lambda: BreakoutStrategy(lookback_window=15, threshold=-0.01),
+        ]
+
+    def test_python_kernel_matches_reference(self):
+        for make in self.strategies:
+            signals, positions, cash = reference_run(make(), self.prices, self.cash)
+            result = run_kernel(make(), self.prices, initial_cash=self.cash, backend='python')
+            self.assertTrue(np.any(signals != 0))
+            np.testing.assert_array_equal(result.signals, signals)
+            np.testing.assert_array_equal(result.positions, positions)
+            np.testing.assert_array_equal(result.cash, cash)
+
+    def test_resume_from_state(self):
+        strategy = MeanReversionStrategy(lookback_window=10, threshold=0.01)
+        full = run_kernel(strategy, self.prices, initial_cash=self.cash, backend='python')
+        first = run_kernel(strategy, self.prices[:1234], initial_cash=self.cash, backend='python')
+        second = run_kernel(strategy, self.prices[1234:], state=first.state, backend='python')
+        np.testing.assert_array_equal(np.concatenate([first.signals, second.signals]), full.signals)
+        self.assertEqual(second.state.cash, full.state.cash)
+        self.assertEqual(second.state.position, full.state.position)
+        self.assertEqual(second.state.price_history(), list(self.prices[-10:]))
+
+    @unittest.skipUnless(NUMBA_AVAILABLE, "numba not installed")
+    def test_compiled_kernel_matches_python(self):
+        for make in self.strategies:
+            python = run_kernel(make(), self.prices, initial_cash=self.cash, backend='python')
+            compiled = run_kernel(make(), self.prices, initial_cash=self.cash, backend='numba')
+            np.testing.assert_array_equal(compiled.signals, python.signals)
+            np.testing.assert_array_equal(compiled.positions, python.positions)
+            np.testing.assert_array_equal(compiled.equity, python.equity)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,107 @@
+import unittest
+import contextlib
+import io
+import json
+import os
+import sys
+import tempfile
+
+import numpy as np
+
+# Ensure project root is importable when running tests
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+import latency_harness
+from Adapter_DataLoader import YahooFinanceAdapter, BloombergXMLAdapter
+from kernels import run_kernel
+from latency_harness import LatencyReplay, record_messages
+from market_data import MarketData
+from runner import make_strategy
+from benchmarks.synthetic_data import generate_market_data, write_market_data_csv
+
+
+def strategy():
+    return make_strategy('MeanReversionStrategy', {'lookback_window': 10, 'threshold': 0.002}, params_file=None)
+
+
+class LatencyHarnessTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.df = generate_market_data(n_symbols=1, n_ticks=600, seed=9)
+        self.data = MarketData(self.df)
+
+    def test_recorded_messages_parse_back(self):
+        for source, adapter in (('yahoo', YahooFinanceAdapter), ('bloomberg', BloombergXMLAdapter)):
+            offsets, messages = record_messages(self.data, 'SPY', source, limit=5)
+            self.assertEqual(offsets.tolist(), [i * 1_000_000_000 for i in range(5)])
+            point = adapter.parse_quote(messages[3])
+            self.assertEqual(point.symbol, 'SPY')
+            self.assertEqual(point.price, self.data.prices('SPY')[3])
+        with self.assertRaises(ValueError):
+            record_messages(self.data, 'SPY', 'reuters')
+
+    def test_stages_add_up_and_signals_match_strategy(self):
+        offsets, messages = record_messages(self.data, 'SPY')
+        report = LatencyReplay(strategy).run(offsets, messages)
+        self.assertEqual(report.events, 600)
+        stages = report.queue + report.adapter + report.strategy + report.execute
+        np.testing.assert_array_equal(stages, report.total)
+        self.assertTrue((report.adapter > 0).all())
+        self.assertTrue((report.execute[~report.trades] >= 0).all())
+
+        signals = run_kernel(strategy(), self.data.prices('SPY')).signals
+        np.testing.assert_array_equal(report.trades, signals != 0)
+
+        summary = report.summary()
+        self.assertEqual(set(summary['total']), {'p50', 'p99', 'p99.9', 'max'})
+        self.assertLessEqual(summary['total']['p50'], summary['total']['p99'])
+        self.assertLessEqual(summary['total']['p99'], summary['total']['p99.9'])
+        self.assertGreater(summary['throughput_per_s'], 0)
+
+    def test_paced_replay_follows_offered_rate(self):
+        _, messages = record_messages(self.data, 'SPY', 'bloomberg', limit=200)
+        replay = LatencyReplay(strategy, source='bloomberg')
+        report = replay.run(None, messages, rate=2000, warmup=20)
+        self.assertEqual(report.events, 180)
+        np.testing.assert_array_equal(np.diff(report.arrive), 500_000)  # 1e9 / rate
+        self.assertEqual(report.arrive[0], 20 * 500_000)
+        self.assertTrue((report.queue >= 0).all())
+
+        offsets, messages = record_messages(self.data, 'SPY', 'bloomberg', limit=50)
+        report = replay.run(offsets, messages, speed=2000)
+        np.testing.assert_array_equal(report.arrive, offsets // 2000)
+        self.assertTrue((report.queue >= 0).all())
+        self.assertGreaterEqual(report.elapsed_ns, 49 * 500_000)
+        with self.assertRaises(ValueError):
+            replay.run(offsets, messages, speed=1, rate=1)
+
+    def test_saturation_curve(self):
+        _, messages = record_messages(self.data, 'SPY', limit=300)
+        points = LatencyReplay(strategy).saturation_curve(messages, [1000, 1e7], events_per_rate=250, warmup=50)
+        self.assertEqual([p['offered_per_s'] for p in points], [1000, 1e7])
+        self.assertIn('total_p99.9', points[0])
+        self.assertGreater(points[1]['achieved_per_s'], 0)
+
+        report = LatencyReplay(strategy).run(None, messages, rate=1e7, warmup=50)
+        np.testing.assert_array_equal(np.diff(report.arrive), 100)
+        self.assertTrue((report.queue >= 0).all())
+
+    def test_cli_writes_report(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            csv = os.path.join(tmp, 'data.csv')
+            output = os.path.join(tmp, 'latency.json')
+            write_market_data_csv(self.df, csv)
+            with contextlib.redirect_stdout(io.StringIO()):
+                code = latency_harness.main(['--data', csv, '--events', '300', '--rates', '5000',
+                                             '--output', output])
+            self.assertEqual(code, 0)
+            with open(output) as f:
+                report = json.load(f)
+        self.assertEqual(report['replay']['events'], 270)
+        self.assertEqual(len(report['saturation']), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,74 @@
+import unittest
+import contextlib
+import io
+import os
+import sys
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+# Ensure project root is importable when running tests
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+import Decorator_Analytics
+from Decorator_Analytics import VolatilityDecorator, DrawdownDecorator
+from engine import BacktestEngine
+from market_data import MarketData
+from patterns.Factory_InstrumentTypes import Stock
+from patterns.Strategy_SignalGen import MeanReversionStrategy
+from benchmarks.synthetic_data import generate_market_data
+
+
+class MarketDataTestCase(unittest.TestCase):
+
+    def setUp(self):
+        # Shuffle so the partition has to do the sorting
+        self.df = generate_market_data(n_symbols=3, n_ticks=400, seed=9).sample(frac=1.0, random_state=0)
+        self.data = MarketData(self.df)
+
+    def test_slices_match_filter_and_sort(self):
+        self.assertEqual(sorted(self.data.symbols), sorted(self.df['symbol'].unique()))
+        for symbol in self.data.symbols:
+            expected = self.df[self.df['symbol'] == symbol].sort_values('timestamp')
+            got = self.data.get(symbol)
+            np.testing.assert_array_equal(got['price'].to_numpy(), expected['price'].to_numpy())
+            np.testing.assert_array_equal(self.data.prices(symbol), expected['price'].to_numpy())
+            np.testing.assert_array_equal(self.data.timestamps(symbol), expected['timestamp'].to_numpy())
+        self.assertTrue(self.data.get('MISSING').empty)
+
+    def test_slices_share_memory(self):
+        prices = self.data.prices('SPY')
+        self.assertTrue(np.shares_memory(prices, self.data.prices('SPY')))
+        self.assertIsInstance(self.data.frame['symbol'].dtype, pd.CategoricalDtype)
+
+    def test_engine_accepts_partition(self):
+        strategy_kwargs = dict(lookback_window=5, threshold=0.002)
+        with contextlib.redirect_stdout(io.StringIO()):
+            r1 = BacktestEngine().backtest_strategy(MeanReversionStrategy(**strategy_kwargs), 'SYM0000', self.df)
+            r2 = BacktestEngine().backtest_strategy(MeanReversionStrategy(**strategy_kwargs), 'SYM0000', self.data)
+        self.assertEqual(r1, r2)
+
+    def test_decorators_share_cached_partition(self):
+        original = Decorator_Analytics.MARKET_DATA_CSV
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'market_data.csv')
+            self.df.to_csv(path, index=False)
+            Decorator_Analytics.MARKET_DATA_CSV = path
+            try:
+                stock = Stock({'symbol': 'SYM0001', 'price': '10', 'type': 'stock'})
+                metrics = DrawdownDecorator(VolatilityDecorator(stock)).get_metrics()
+                self.assertIs(MarketData.cached(path), MarketData.cached(path))
+            finally:
+                Decorator_Analytics.MARKET_DATA_CSV = original
+                MarketData.clear_cache()
+
+        prices = self.df[self.df['symbol'] == 'SYM0001'].sort_values('timestamp')['price']
+        self.assertAlmostEqual(metrics['volatility'], float(prices.pct_change().dropna().std()))
+        self.assertAlmostEqual(metrics['max_drawdown'], float(((prices.cummax() - prices) / prices.cummax()).max()))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,99 @@
+import unittest
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+# Ensure project root is importable when running tests
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+import Decorator_Analytics
+from Decorator_Analytics import BootstrapDecorator
+from kernels import run_kernel
+from market_data import MarketData
+from monte_carlo import (MonteCarloEngine, block_bootstrap_indices, bootstrap_price_paths,
+                         path_metrics, replay_signals, strategy_signals)
+from patterns.Factory_InstrumentTypes import Stock
+from patterns.Strategy_SignalGen import MeanReversionStrategy, BreakoutStrategy
+from benchmarks.synthetic_data import generate_market_data
+
+
+class MonteCarloTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.df = generate_market_data(n_symbols=1, n_ticks=1000, seed=3)
+        self.prices = MarketData(self.df).prices('SPY')
+
+    def test_blocks_are_consecutive_and_circular(self):
+        idx = block_bootstrap_indices(10, 4, 3, np.random.default_rng(0))
+        self.assertEqual(idx.shape, (4, 10))
+        for row in idx:
+            for b in range(0, 9, 3):
+                block = row[b:b + 3]
+                self.assertTrue(all((block[k + 1] - block[k]) % 10 == 1 for k in range(len(block) - 1)))
+
+    def test_paths_resample_historical_returns(self):
+        paths = bootstrap_price_paths(self.prices, 50, 10, np.random.default_rng(1))
+        self.assertTrue(np.all(paths[:, 0] == self.prices[0]))
+        returns = self.prices[1:] / self.prices[:-1] - 1
+        path_returns = paths[:, 1:] / paths[:, :-1] - 1
+        self.assertTrue(np.all(np.isclose(path_returns[:, :, None], returns[None, None, :]).any(axis=2)))
+
+    def test_vectorized_replay_matches_kernels(self):
+        paths = bootstrap_price_paths(self.prices, 20, 25, np.random.default_rng(2))
+        for strategy in (MeanReversionStrategy(lookback_window=10, threshold=0.003),
+                         BreakoutStrategy(lookback_window=10, threshold=-0.004)):
+            signals = strategy_signals(strategy, paths)
+            equity = replay_signals(paths, signals, 1000.0, 2)
+            for i in range(len(paths)):
+                expected = run_kernel(strategy, paths[i], initial_cash=1000.0, quantity=2, backend='python')
+                np.testing.assert_array_equal(signals[i], expected.signals)
+                np.testing.assert_allclose(equity[i, 1:], expected.equity)
+            self.assertTrue(np.any(signals != 0))
+
+    def test_metrics_and_intervals(self):
+        equity = np.array([[100.0, 110.0, 99.0, 120.0], [100.0, 100.0, 100.0, 100.0]])
+        metrics = path_metrics(equity)
+        np.testing.assert_allclose(metrics['total_return'], [0.2, 0.0])
+        np.testing.assert_allclose(metrics['max_drawdown'], [0.1, 0.0])
+        self.assertTrue(np.isnan(metrics['sharpe'][1]))
+
+        result = MonteCarloEngine(n_paths=500, seed=7, chunk_size=128).simulate(self.prices)
+        again = MonteCarloEngine(n_paths=500, seed=7, chunk_size=128).simulate(self.prices)
+        np.testing.assert_array_equal(result['metrics']['total_return'], again['metrics']['total_return'])
+        ret = result['intervals']['total_return']
+        self.assertLessEqual(ret['p5'], ret['p50'])
+        self.assertLessEqual(ret['p50'], ret['p95'])
+        self.assertGreaterEqual(result['intervals']['max_drawdown']['p5'], 0.0)
+
+    def test_ten_thousand_strategy_paths_in_seconds(self):
+        engine = MonteCarloEngine(n_paths=10000, block_size=50, seed=11, chunk_size=2000)
+        start = time.perf_counter()
+        result = engine.simulate(self.prices, MeanReversionStrategy(lookback_window=10, threshold=0.003))
+        self.assertLess(time.perf_counter() - start, 30.0)
+        self.assertEqual(len(result['metrics']['sharpe']), 10000)
+        self.assertEqual(result['strategy'], 'MeanReversionStrategy')
+
+    def test_bootstrap_decorator(self):
+        original = Decorator_Analytics.MARKET_DATA_CSV
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'market_data.csv')
+            self.df.to_csv(path, index=False)
+            Decorator_Analytics.MARKET_DATA_CSV = path
+            try:
+                metrics = BootstrapDecorator(Stock({'symbol': 'SPY', 'price': '10', 'type': 'stock'}),
+                                             n_paths=200, seed=1).get_metrics()
+                missing = BootstrapDecorator(Stock({'symbol': 'NOPE', 'price': '10', 'type': 'stock'})).get_metrics()
+            finally:
+                Decorator_Analytics.MARKET_DATA_CSV = original
+                MarketData.clear_cache()
+        self.assertEqual(set(metrics['bootstrap']), {'total_return', 'max_drawdown', 'sharpe'})
+        self.assertIsNone(missing['bootstrap'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,79 @@
+import unittest
+import os
+import sys
+
+import numpy as np
+
+# Ensure project root is importable when running tests
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from kernels import run_kernel
+from market_data import MarketData
+from param_search import Candidate, advance, hyperband, rung_budgets, successive_halving
+from runner import make_strategy
+from walk_forward import param_combinations, score
+from benchmarks.synthetic_data import generate_market_data
+
+GRID = {'lookback_window': [5, 10, 20], 'threshold': [0.001, 0.002, 0.005]}
+
+
+class ParamSearchTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.prices = MarketData(generate_market_data(n_symbols=1, n_ticks=6000, seed=8)).prices('SPY')
+
+    def test_rung_budgets_end_at_full_series(self):
+        self.assertEqual(rung_budgets(900, 3, 3), [100, 300, 900])
+        self.assertEqual(rung_budgets(1000, 1, 3), [1000])
+
+    def test_advancing_in_steps_matches_one_full_run(self):
+        params = {'lookback_window': 10, 'threshold': 0.002}
+        candidate = Candidate(params)
+        for end in (100, 700, 2500, 6000):
+            candidate = advance('MeanReversionStrategy', self.prices, candidate, end)
+        full = run_kernel(make_strategy('MeanReversionStrategy', params, params_file=None), self.prices)
+        self.assertEqual(candidate.state.n_trades, full.state.n_trades)
+        self.assertAlmostEqual(candidate.last_equity, full.equity[-1])
+        self.assertAlmostEqual(candidate.score('sharpe', 100000), score(full.equity, 'sharpe', 100000))
+        self.assertAlmostEqual(candidate.score('total_return', 100000), score(full.equity, 'total_return', 100000))
+
+    def test_successive_halving_prunes_and_saves_work(self):
+        result = successive_halving('MeanReversionStrategy', self.prices, GRID)
+        self.assertEqual([r['candidates'] for r in result['rungs']], [9, 3, 1])
+        self.assertEqual([r['ticks'] for r in result['rungs']], [666, 2000, 6000])
+        self.assertLess(result['ticks_evaluated'], result['grid_ticks'] / 3)
+        self.assertIn(result['best_params'], param_combinations(GRID))
+
+        # The winner's score is its score on the full series
+        strategy = make_strategy('MeanReversionStrategy', result['best_params'], params_file=None)
+        full = run_kernel(strategy, self.prices)
+        self.assertAlmostEqual(result['best_score'], score(full.equity, 'sharpe', 100000))
+
+    def test_parallel_matches_serial(self):
+        serial = successive_halving('BreakoutStrategy', self.prices, objective='total_return')
+        parallel = successive_halving('BreakoutStrategy', self.prices, objective='total_return', workers=2)
+        self.assertEqual(serial['best_params'], parallel['best_params'])
+        self.assertEqual(serial['rungs'], parallel['rungs'])
+
+    def test_hyperband_brackets(self):
+        result = hyperband('MeanReversionStrategy', self.prices, GRID, min_ticks=500, seed=1)
+        brackets = sorted({r['bracket'] for r in result['rungs']})
+        self.assertEqual(brackets, [0, 1, 2])
+        self.assertTrue(all(r['ticks'] >= 500 for r in result['rungs']))
+        final = [r for r in result['rungs'] if r['ticks'] == len(self.prices)]
+        self.assertEqual(len(final), 3)
+        self.assertLess(result['ticks_evaluated'], result['grid_ticks'])
+        again = hyperband('MeanReversionStrategy', self.prices, GRID, min_ticks=500, seed=1)
+        self.assertEqual(again['best_params'], result['best_params'])
+
+    def test_invalid_arguments(self):
+        with self.assertRaises(ValueError):
+            successive_halving('MeanReversionStrategy', self.prices, GRID, objective='sortino')
+        with self.assertRaises(ValueError):
+            hyperband('MeanReversionStrategy', self.prices, GRID, eta=1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,79 @@
+import unittest
+import contextlib
+import io
+import os
+import sys
+
+import numpy as np
+
+# Ensure project root is importable when running tests
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from engine import BacktestEngine
+from market_data import MarketData
+from portfolio_engine import MultiStrategyEngine
+from patterns.Strategy_SignalGen import MeanReversionStrategy, BreakoutStrategy
+from benchmarks.synthetic_data import generate_market_data
+
+
+class MultiStrategyEngineTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.df = generate_market_data(n_symbols=1, n_ticks=1500, seed=8)
+        self.data = MarketData(self.df)
+
+    def make_strategies(self):
+        return {
+            'mr': MeanReversionStrategy(lookback_window=5, threshold=0.002),
+            'bo': BreakoutStrategy(lookback_window=5, threshold=-0.005),
+        }
+
+    def test_sub_books_match_separate_backtests(self):
+        allocations = {'mr': 0.6, 'bo': 0.3}
+        engine = MultiStrategyEngine(self.make_strategies(), allocations, initial_capital=100000)
+        with contextlib.redirect_stdout(io.StringIO()):
+            results = engine.backtest('SPY', self.data)
+
+            for name, strategy in self.make_strategies().items():
+                single = BacktestEngine(initial_capital=100000 * allocations[name])
+                expected = single.backtest_strategy(strategy, 'SPY', self.df)
+                book = engine.books[name]
+                self.assertEqual({k: v for k, v in results['strategies'][name].items() if k != 'allocation'}, expected)
+                self.assertEqual(book.trades, single.trades)
+                np.testing.assert_allclose(book.curve.get_values(), single.curve.get_values())
+
+        self.assertGreater(results['strategies']['mr']['total_trades'], 0)
+        self.assertGreater(results['strategies']['bo']['total_trades'], 0)
+
+    def test_combined_book_is_allocation_weighted_sum(self):
+        engine = MultiStrategyEngine(self.make_strategies(), {'mr': 0.5, 'bo': 0.25}, initial_capital=80000)
+        with contextlib.redirect_stdout(io.StringIO()):
+            results = engine.backtest('SPY', self.data)
+        combined = results['combined']
+        expected_curve = 20000 + engine.books['mr'].curve.get_values() + engine.books['bo'].curve.get_values()
+        np.testing.assert_allclose(engine.curve.get_values(), expected_curve)
+        self.assertAlmostEqual(combined['final_portfolio_value'], expected_curve[-1])
+        self.assertEqual(combined['total_trades'],
+                         sum(r['total_trades'] for r in results['strategies'].values()))
+        self.assertEqual(combined['equity']['points'], 1500)
+
+    def test_default_allocation_and_validation(self):
+        engine = MultiStrategyEngine([MeanReversionStrategy(), BreakoutStrategy()])
+        self.assertEqual(engine.allocations, {'MeanReversionStrategy': 0.5, 'BreakoutStrategy': 0.5})
+        self.assertEqual(engine.books['BreakoutStrategy'].initial_capital, 50000)
+        with self.assertRaises(ValueError):
+            MultiStrategyEngine(self.make_strategies(), {'mr': 0.8, 'bo': 0.4})
+        with self.assertRaises(ValueError):
+            MultiStrategyEngine(self.make_strategies(), {'other': 0.5})
+
+    def test_duplicate_strategy_classes_get_unique_names(self):
+        first, second = MeanReversionStrategy(), MeanReversionStrategy()
+        engine = MultiStrategyEngine([first, second, BreakoutStrategy()])
+        self.assertEqual(list(engine.books), ['MeanReversionStrategy', 'MeanReversionStrategy#2', 'BreakoutStrategy'])
+        self.assertIs(engine.strategies['MeanReversionStrategy#2'], second)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,89 @@
+import unittest
+import os
+import sys
+import tempfile
+
+import numpy as np
+
+# Ensure project root is importable when running tests
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from market_data import MarketData
+from results_store import ResultsStore, data_fingerprint
+from benchmarks.synthetic_data import generate_market_data
+
+
+class ResultsStoreTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, 'results.db')
+        self.df = generate_market_data(n_symbols=2, n_ticks=400, seed=11)
+        self.data = MarketData(self.df)
+        cutoff = self.df['timestamp'].sort_values().iloc[len(self.df) // 2]
+        self.prefix = MarketData(self.df[self.df['timestamp'] < cutoff])
+        self.params = {'lookback_window': 5, 'threshold': 0.002}
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def strip(self, results):
+        return {k: v for k, v in results.items() if k not in ('cache', 'run_key')}
+
+    def test_identical_run_is_served_from_store(self):
+        with ResultsStore(self.path) as store:
+            first = store.run('MeanReversionStrategy', 'SPY', self.data, self.params)
+            self.assertEqual(first['cache'], 'miss')
+        with ResultsStore(self.path) as store:
+            second = store.run('MeanReversionStrategy', 'SPY', self.data, self.params)
+            self.assertEqual(second['cache'], 'hit')
+            self.assertEqual(self.strip(first), self.strip(second))
+            self.assertEqual(len(store.load_trades(first['run_key'])), first['total_trades'])
+            _, values = store.load_equity(first['run_key'])
+            self.assertEqual(len(values), first['ticks'])
+
+    def test_changed_params_miss(self):
+        with ResultsStore(self.path) as store:
+            store.run('BreakoutStrategy', 'SPY', self.data, self.params)
+            other = store.run('BreakoutStrategy', 'SPY', self.data, {'lookback_window': 8, 'threshold': 0.002})
+            self.assertEqual(other['cache'], 'miss')
+            self.assertEqual(len(store.list_runs()), 2)
+
+    def test_appended_data_runs_incrementally(self):
+        for name in ('MeanReversionStrategy', 'BreakoutStrategy'):
+            with ResultsStore(self.path) as store:
+                store.run(name, 'SYM0000', self.prefix, self.params)
+                incremental = store.run(name, 'SYM0000', self.data, self.params)
+            with ResultsStore(os.path.join(self.tmp.name, f'full_{name}.db')) as fresh:
+                full = fresh.run(name, 'SYM0000', self.data, self.params)
+                full_values = fresh.load_equity(full['run_key'])[1]
+                full_samples = fresh.load_samples(full['run_key'])
+            self.assertEqual(incremental['cache'], 'incremental')
+            self.assertEqual(full['cache'], 'miss')
+            self.assertEqual(incremental['total_trades'], full['total_trades'])
+            self.assertAlmostEqual(incremental['final_portfolio_value'], full['final_portfolio_value'], places=6)
+            self.assertEqual(incremental['equity']['points'], full['equity']['points'])
+            with ResultsStore(self.path) as store:
+                np.testing.assert_allclose(store.load_equity(incremental['run_key'])[1], full_values)
+                samples = store.load_samples(incremental['run_key'])
+                np.testing.assert_array_equal(samples[0], full_samples[0])
+                np.testing.assert_allclose(samples[1], full_samples[1])
+                self.assertEqual(len(samples[0]), 2)  # first and last tick
+
+    def test_modified_history_is_not_reused(self):
+        changed = self.df.copy()
+        first_row = changed.index[changed['symbol'] == 'SPY'][0]
+        changed.loc[first_row, 'price'] += 1.0
+        changed_data = MarketData(changed)
+        self.assertNotEqual(data_fingerprint(self.prefix, 'SPY'),
+                            data_fingerprint(changed_data, 'SPY', len(self.prefix.prices('SPY'))))
+        with ResultsStore(self.path) as store:
+            store.run('MeanReversionStrategy', 'SPY', self.prefix, self.params)
+            result = store.run('MeanReversionStrategy', 'SPY', changed_data, self.params)
+            self.assertEqual(result['cache'], 'miss')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,114 @@
+import unittest
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+# Ensure project root is importable when running tests
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from market_data import MarketData
+from patterns.Composite_PortModel import PortfolioGroup, Position, build_portfolio_from_json
+from risk_engine import RiskEngine, RunningCovariance, aligned_returns, flatten_tree
+from benchmarks.synthetic_data import generate_market_data
+
+
+class RiskEngineTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.data = MarketData(generate_market_data(n_symbols=3, n_ticks=600, seed=11))
+        self.root = PortfolioGroup('Main')
+        self.root.add(Position('SPY', 10, 100.0))
+        sub = PortfolioGroup('Sub')
+        sub.add(Position('SYM0000', 5, 50.0))
+        sub.add(Position('SYM0001', -3, 20.0))
+        self.root.add(sub)
+
+    def test_flatten_tree_paths_and_members(self):
+        nodes, leaves, members = flatten_tree(self.root)
+        self.assertEqual([p for p, _ in nodes], ['Main', 'Main/SPY', 'Main/Sub', 'Main/Sub/SYM0000', 'Main/Sub/SYM0001'])
+        self.assertEqual(len(leaves), 3)
+        self.assertEqual(members[0], [0, 1, 2])
+        self.assertEqual(members[2], [1, 2])
+
+    def test_running_covariance_matches_numpy(self):
+        rows = np.random.default_rng(0).normal(size=(200, 4))
+        cov = RunningCovariance(4)
+        cov.update(rows[:50])
+        for row in rows[50:]:
+            cov.update(row)
+        np.testing.assert_allclose(cov.cov, np.cov(rows, rowvar=False))
+        for row in rows[:30]:
+            cov.remove(row)
+        np.testing.assert_allclose(cov.cov, np.cov(rows[30:], rowvar=False))
+        np.testing.assert_allclose(cov.mean, rows[30:].mean(axis=0))
+
+    def test_node_risk_matches_direct_computation(self):
+        engine = RiskEngine.from_market_data(self.root, self.data, confidence=0.95)
+        _, returns = aligned_returns(self.data, engine.symbols)
+        report = {row['node']: row for row in engine.report()}
+
+        # 'Main/Sub' is long SYM0000 and short SYM0001
+        weights = np.array([0.0, 250.0, -60.0])
+        pnl = returns @ weights
+        row = report['Main/Sub']
+        self.assertAlmostEqual(row['value'], 190.0)
+        self.assertAlmostEqual(row['volatility'], pnl.std(ddof=1))
+        self.assertAlmostEqual(row['historical_var'], -np.quantile(pnl, 0.05))
+        self.assertAlmostEqual(row['historical_cvar'], -pnl[pnl <= np.quantile(pnl, 0.05)].mean())
+        self.assertAlmostEqual(row['parametric_var'], 1.6448536269514722 * pnl.std(ddof=1) - pnl.mean())
+        self.assertGreater(row['parametric_cvar'], row['parametric_var'])
+        # A group's exposure is the sum of its children's
+        np.testing.assert_allclose(engine.exposures[2], engine.exposures[3] + engine.exposures[4])
+
+    def test_incremental_update_matches_rebuild(self):
+        _, returns = aligned_returns(self.data, ['SPY', 'SYM0000', 'SYM0001'])
+        symbols = ['SPY', 'SYM0000', 'SYM0001']
+        engine = RiskEngine(self.root, returns[:400], symbols, window=300)
+        for row in returns[400:]:
+            engine.update(row)
+        rebuilt = RiskEngine(self.root, returns[-300:], symbols)
+        for a, b in zip(engine.report(), rebuilt.report()):
+            for key in ('volatility', 'parametric_var', 'historical_var', 'historical_cvar'):
+                self.assertAlmostEqual(a[key], b[key])
+
+    def test_refresh_exposures_after_repricing(self):
+        engine = RiskEngine.from_market_data(self.root, self.data)
+        before = engine.report()[1]['volatility']
+        self.root.components[0].price = 200.0
+        engine.refresh_exposures()
+        self.assertAlmostEqual(engine.report()[1]['volatility'], 2 * before)
+
+    def test_aligned_returns_with_repeated_timestamps(self):
+        ts = pd.to_datetime(['2025-01-01 09:30:00', '2025-01-01 09:30:01', '2025-01-01 09:30:01',
+                             '2025-01-01 09:30:02', '2025-01-01 09:30:03'])
+        frame = pd.concat([
+            pd.DataFrame({'timestamp': ts, 'symbol': 'AAA', 'price': [10.0, 11.0, 12.0, 15.0, 18.0]}),
+            pd.DataFrame({'timestamp': ts[[0, 1, 3, 4]], 'symbol': 'BBB', 'price': [20.0, 22.0, 24.0, 30.0]}),
+        ], ignore_index=True)
+        timestamps, returns = aligned_returns(MarketData(frame), ['AAA', 'BBB'])
+        self.assertEqual(len(timestamps), 3)
+        np.testing.assert_array_equal(timestamps, ts[[1, 3, 4]].as_unit('ns').asi8)
+        # AAA's second print at 09:30:01 (12.0) is its price there
+        np.testing.assert_allclose(returns[:, 0], [12 / 10 - 1, 15 / 12 - 1, 18 / 15 - 1])
+        np.testing.assert_allclose(returns[:, 1], [22 / 20 - 1, 24 / 22 - 1, 30 / 24 - 1])
+
+    def test_missing_symbol_raises(self):
+        self.root.add(Position('NOPE', 1, 1.0))
+        with self.assertRaises(ValueError):
+            RiskEngine.from_market_data(self.root, self.data)
+
+    def test_sample_portfolio_file(self):
+        root = build_portfolio_from_json(os.path.join(ROOT, 'inputs', 'portfolio_structure.json'))
+        returns = np.random.default_rng(2).normal(0, 0.01, size=(250, 3))
+        engine = RiskEngine(root, returns, ['AAPL', 'MSFT', 'SPY'])
+        report = engine.report()
+        self.assertEqual(len(report), len(engine.nodes))
+        self.assertAlmostEqual(report[0]['value'], root.get_value())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,59 @@
+import unittest
+import json
+import os
+import sys
+import tempfile
+
+# Ensure project root is importable when running tests
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+import main
+from market_data import MarketData
+from runner import run_jobs
+from benchmarks.synthetic_data import generate_market_data
+
+
+class RunnerTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.df = generate_market_data(n_symbols=3, n_ticks=300, seed=21)
+        self.data = MarketData(self.df)
+        self.params = {'lookback_window': 5, 'threshold': 0.002}
+
+    def strip_timing(self, results):
+        return [{k: v for k, v in r.items() if k != 'elapsed_seconds'} for r in results]
+
+    def test_parallel_matches_serial(self):
+        jobs = [(name, symbol, self.params)
+                for name in ('MeanReversionStrategy', 'BreakoutStrategy')
+                for symbol in self.data.symbols]
+        serial = run_jobs(jobs, self.data, workers=1)
+        parallel = run_jobs(jobs, self.data, workers=3)
+        self.assertEqual(self.strip_timing(serial), self.strip_timing(parallel))
+        self.assertEqual([(r['strategy'], r['symbol']) for r in parallel], [j[:2] for j in jobs])
+        # Isolated engines: each run starts from the initial capital
+        self.assertTrue(all(r['initial_capital'] == 100000 for r in parallel))
+        self.assertGreater(sum(r['total_trades'] for r in parallel), 0)
+
+    def test_errors_are_reported_per_job(self):
+        results = run_jobs([('MeanReversionStrategy', 'SPY', {'lookback_window': 'bad'})], self.data)
+        self.assertIn('error', results[0])
+
+    def test_cli_writes_consolidated_results(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            data_path = os.path.join(tmp, 'market_data.csv')
+            output = os.path.join(tmp, 'out', 'results.json')
+            self.df.to_csv(data_path, index=False)
+            code = main.main(['--data', data_path, '--symbols', 'SPY', 'SYM0000',
+                              '--workers', '2', '--output', output])
+            self.assertEqual(code, 0)
+            with open(output) as f:
+                report = json.load(f)
+        self.assertEqual(len(report['results']), 4)
+        self.assertEqual(report['symbols'], ['SPY', 'SYM0000'])
+
+
+if __name__ == '__main__':
+    unittest.main()
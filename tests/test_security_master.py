@@ -0,0 +1,56 @@
+import unittest
+import os
+import sys
+
+import pandas as pd
+
+# Ensure project root is importable when running tests
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from patterns.Factory_InstrumentTypes import InstrumentFactory, Bond, Stock
+from security_master import SecurityMaster
+
+
+class SecurityMasterTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.master = SecurityMaster.from_csv(os.path.join(ROOT, 'inputs', 'instruments.csv'))
+
+    def test_typed_columns(self):
+        table = self.master.table
+        for column in ('type', 'sector', 'issuer'):
+            self.assertIsInstance(table[column].dtype, pd.CategoricalDtype)
+        self.assertEqual(str(table['maturity'].dtype), 'datetime64[ns]')
+        self.assertEqual(table['price'].dtype.kind, 'f')
+
+    def test_vectorized_selection(self):
+        tech = self.master.select(type='Stock', sector='Technology')
+        self.assertEqual(tech.symbols, ['AAPL', 'MSFT'])
+        self.assertEqual(self.master.select(type='bond', maturity_before='2030-01-01').symbols, [])
+        self.assertEqual(self.master.select(type='bond', maturity_before='2040-01-01').symbols, ['US10Y'])
+        self.assertEqual(self.master.select(min_price=300).symbols, ['MSFT', 'SPY'])
+
+        counts = self.master.group_by('type')['count']
+        self.assertEqual(counts['stock'], 2)
+
+    def test_join_and_objects(self):
+        md = pd.DataFrame({
+            'timestamp': pd.to_datetime(['2025-01-01', '2025-01-01', '2025-01-01']),
+            'symbol': ['AAPL', 'US10Y', 'ZZZ'],
+            'price': [170.0, 99.5, 1.0],
+        })
+        joined = self.master.join_market_data(md)
+        self.assertEqual(joined['symbol'].tolist(), ['AAPL', 'US10Y'])
+        self.assertEqual(joined['sector'].tolist(), ['Technology', 'Government'])
+
+        bond = InstrumentFactory.from_security_master(self.master, 'US10Y')
+        self.assertIsInstance(bond, Bond)
+        self.assertEqual(bond.maturity, '2035-10-01')
+        self.assertIsInstance(self.master.to_instrument('AAPL'), Stock)
+        self.assertEqual(len(self.master.to_instruments()), 4)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,83 @@
+import unittest
+import os
+import sys
+
+import numpy as np
+
+# Ensure project root is importable when running tests
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from kernels import run_kernel
+from market_data import MarketData
+from models import MarketDataPoint
+from patterns.Strategy_SignalGen import MeanReversionStrategy
+from walk_forward import (make_folds, param_combinations, run_fold, score, walk_forward,
+                          walk_forward_symbol, warm_state)
+from benchmarks.synthetic_data import generate_market_data
+
+
+class WalkForwardTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.data = MarketData(generate_market_data(n_symbols=1, n_ticks=3000, seed=4))
+        self.prices = self.data.prices('SPY')
+        self.grid = {'lookback_window': [5, 10], 'threshold': [0.001, 0.003]}
+
+    def test_make_folds(self):
+        folds = make_folds(100, train_size=40, test_size=20)
+        self.assertEqual([(f.train_start, f.train_end, f.test_end) for f in folds],
+                         [(0, 40, 60), (20, 60, 80), (40, 80, 100)])
+        anchored = make_folds(100, train_size=40, test_size=30, anchored=True)
+        self.assertEqual([(f.train_start, f.train_end, f.test_end) for f in anchored], [(0, 40, 70), (0, 70, 100)])
+        self.assertEqual(make_folds(50, 40, 20), [])
+
+    def test_warm_state_matches_strategy_history(self):
+        state = warm_state(self.prices, 100, 10, 1000.0)
+        self.assertEqual(state.price_history(), list(self.prices[90:100]))
+        self.assertEqual(warm_state(self.prices, 3, 10, 1000.0).price_history(), list(self.prices[:3]))
+
+        # A warm kernel run signals exactly like a strategy primed with the same history
+        strategy = MeanReversionStrategy(lookback_window=10, threshold=0.001)
+        strategy.set_state({'SPY': list(self.prices[90:100])})
+        expected = [strategy.generate_signals(MarketDataPoint(None, 'SPY', p)) for p in self.prices[100:200]]
+        result = run_kernel(strategy, self.prices[100:200], state=state)
+        self.assertEqual(result.signals.tolist(), expected)
+
+    def test_fold_picks_best_train_params(self):
+        fold = make_folds(len(self.prices), 1000, 500)[1]
+        result = run_fold('MeanReversionStrategy', self.prices, fold, self.grid, objective='total_return')
+        scores = {}
+        for params in param_combinations(self.grid):
+            strategy = MeanReversionStrategy(**params)
+            state = warm_state(self.prices, fold.train_start, params['lookback_window'], 100000)
+            equity = run_kernel(strategy, self.prices[fold.train_start:fold.train_end], state=state).equity
+            scores[tuple(sorted(params.items()))] = score(equity, 'total_return', 100000)
+        best = max(scores.values())
+        self.assertEqual(result['train_score'], best)
+        self.assertEqual(scores[tuple(sorted(result['params'].items()))], best)
+        self.assertEqual(len(result['test_equity']), 500)
+
+    def test_parallel_matches_serial_and_curve_is_stitched(self):
+        serial = walk_forward_symbol('MeanReversionStrategy', 'SPY', self.data, 1000, 500, param_grid=self.grid)
+        parallel = walk_forward_symbol('MeanReversionStrategy', 'SPY', self.data, 1000, 500,
+                                       param_grid=self.grid, workers=2)
+        self.assertEqual(len(serial['folds']), 4)
+        self.assertEqual([f['params'] for f in serial['folds']], [f['params'] for f in parallel['folds']])
+        np.testing.assert_array_equal(serial['oos_equity'], parallel['oos_equity'])
+
+        # Out-of-sample curve covers ticks 1000..2999 once and chains fold returns
+        np.testing.assert_array_equal(serial['oos_index'], np.arange(1000, 3000))
+        growth = np.prod([1 + f['test_return'] for f in serial['folds']])
+        self.assertAlmostEqual(serial['oos_return'], growth - 1)
+        self.assertEqual(serial['oos_stats']['points'], 2000)
+        np.testing.assert_array_equal(serial['oos_curve'].get_timestamps(), self.data.timestamps('SPY')[1000:3000])
+
+    def test_overlapping_test_windows_are_not_double_counted(self):
+        result = walk_forward('MeanReversionStrategy', self.prices, 1000, 500, param_grid=self.grid, step=250)
+        np.testing.assert_array_equal(result['oos_index'], np.arange(1000, 3000))
+
+
+if __name__ == '__main__':
+    unittest.main()
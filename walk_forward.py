@@ -0,0 +1,205 @@
+import itertools
+import math
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, asdict
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from equity_curve import EquityCurve
+from kernels import KernelState, run_kernel
+from market_data import MarketData
+from runner import make_strategy
+
+# Walk-forward optimization.
+# The tick axis of one symbol is cut into folds: a train window followed by
+# the test window right after it, rolled forward by `step` ticks (or with
+# the train window anchored at tick 0). For each fold every parameter set in
+# the grid is scored on the train window, and the best one is run on the
+# test window. Folds are independent and run in a process pool; the price
+# array is handed to each worker once, when the pool starts.
+#
+# Runs use the strategy kernels (kernels.py), so warm-up is state rather
+# than replay: a train run starts from a window primed with the prices just
+# before it, and the test run continues from the window the best train run
+# ended with (the train window ends where the test window starts) with a
+# flat book. The test-window equity curves are chained into one
+# out-of-sample curve.
+
+DEFAULT_PARAM_GRIDS = {
+    'MeanReversionStrategy': {'lookback_window': [10, 20, 40], 'threshold': [0.005, 0.01, 0.02]},
+    'BreakoutStrategy': {'lookback_window': [10, 15, 30], 'threshold': [-0.01, -0.005, 0.0]},
+}
+
+OBJECTIVES = ('sharpe', 'total_return')
+
+# Price array of the current worker process, set by _init_worker
+_worker_prices: Optional[np.ndarray] = None
+
+
+@dataclass(frozen=True)
+class Fold:
+    index: int
+    train_start: int
+    train_end: int  # exclusive; also the test start
+    test_end: int   # exclusive
+
+    @property
+    def test_start(self) -> int:
+        return self.train_end
+
+
+def make_folds(n_ticks: int, train_size: int, test_size: int, step: Optional[int] = None,
+               anchored: bool = False) -> List[Fold]:
+    """Train/test folds over `n_ticks` ticks; test windows are consecutive when step == test_size."""
+    if train_size <= 0 or test_size <= 0:
+        raise ValueError("train_size and test_size must be positive")
+    step = test_size if step is None else step
+    if step <= 0:
+        raise ValueError("step must be positive")
+    folds = []
+    start = 0
+    while start + train_size + test_size <= n_ticks:
+        train_start = 0 if anchored else start
+        folds.append(Fold(len(folds), train_start, start + train_size, start + train_size + test_size))
+        start += step
+    return folds
+
+
+def param_combinations(param_grid: Dict[str, Sequence]) -> List[Dict]:
+    names = sorted(param_grid)
+    return [dict(zip(names, values)) for values in itertools.product(*(param_grid[n] for n in names))]
+
+
+def warm_state(prices: np.ndarray, start: int, lookback: int, cash: float) -> KernelState:
+    """Kernel state whose window holds the (up to) `lookback` prices before `start`."""
+    state = KernelState.initial(lookback, cash)
+    history = prices[max(0, start - lookback):start]
+    state.window[:len(history)] = history
+    state.count = len(history)
+    return state
+
+
+def score(equity: np.ndarray, objective: str, initial_capital: float) -> float:
+    """Objective value of an equity path; higher is better."""
+    if len(equity) == 0:
+        return -math.inf
+    if objective == 'total_return':
+        return float(equity[-1] / initial_capital - 1)
+    if objective == 'sharpe':
+        values = np.concatenate(([initial_capital], equity))
+        returns = np.diff(values) / values[:-1]
+        std = returns.std(ddof=1) if len(returns) > 1 else 0.0
+        return float(returns.mean() / std) if std > 0 else -math.inf
+    raise ValueError(f"Unknown objective: {objective} (choose from {', '.join(OBJECTIVES)})")
+
+
+def run_fold(strategy_name: str, prices: np.ndarray, fold: Fold, param_grid: Dict[str, Sequence],
+             objective: str = 'sharpe', initial_capital: float = 100000, quantity: int = 1,
+             backend: str = 'auto') -> Dict:
+    """Optimize on the fold's train window and evaluate the best parameters on its test window."""
+    train = prices[fold.train_start:fold.train_end]
+    best = None
+    for params in param_combinations(param_grid):
+        strategy = make_strategy(strategy_name, params, params_file=None)
+        state = warm_state(prices, fold.train_start, int(strategy.lookback_window), initial_capital)
+        result = run_kernel(strategy, train, initial_capital, quantity, state=state, backend=backend)
+        value = score(result.equity, objective, initial_capital)
+        if best is None or value > best[0]:
+            best = (value, params, strategy, result.state)
+
+    train_score, params, strategy, train_state = best
+    # Continue from the train run's window, with a fresh, flat book
+    state = train_state.copy()
+    state.cash, state.position, state.n_trades = float(initial_capital), 0, 0
+    test = run_kernel(strategy, prices[fold.test_start:fold.test_end], initial_capital, quantity,
+                      state=state, backend=backend)
+    return {
+        'fold': asdict(fold),
+        'params': params,
+        'train_score': train_score,
+        'test_score': score(test.equity, objective, initial_capital),
+        'test_return': float(test.equity[-1] / initial_capital - 1),
+        'test_trades': test.state.n_trades,
+        'test_equity': test.equity,
+    }
+
+
+def _init_worker(prices: np.ndarray):
+    global _worker_prices
+    _worker_prices = prices
+
+
+def _run_worker_fold(strategy_name, fold, param_grid, objective, initial_capital, quantity, backend):
+    return run_fold(strategy_name, _worker_prices, fold, param_grid, objective, initial_capital, quantity, backend)
+
+
+def walk_forward(strategy_name: str, prices, train_size: int, test_size: int,
+                 param_grid: Optional[Dict[str, Sequence]] = None, timestamps=None, step: Optional[int] = None,
+                 anchored: bool = False, objective: str = 'sharpe', initial_capital: float = 100000,
+                 quantity: int = 1, workers: int = 1, backend: str = 'auto') -> Dict:
+    """Walk-forward optimize `strategy_name` over a price series.
+
+    Returns the per-fold results (best params, train/test scores) and the
+    stitched out-of-sample curve: each fold's test equity rescaled to start
+    where the previous fold's ended, beginning at `initial_capital`.
+    """
+    if objective not in OBJECTIVES:
+        raise ValueError(f"Unknown objective: {objective} (choose from {', '.join(OBJECTIVES)})")
+    prices = np.ascontiguousarray(prices, dtype=np.float64)
+    param_grid = param_grid or DEFAULT_PARAM_GRIDS[strategy_name]
+    folds = make_folds(len(prices), train_size, test_size, step, anchored)
+    if not folds:
+        raise ValueError(f"{len(prices)} ticks are not enough for one {train_size}+{test_size} fold")
+
+    args = (param_grid, objective, initial_capital, quantity, backend)
+    if workers <= 1 or len(folds) <= 1:
+        results = [run_fold(strategy_name, prices, fold, *args) for fold in folds]
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(prices,)) as pool:
+            futures = [pool.submit(_run_worker_fold, strategy_name, fold, *args) for fold in folds]
+            results = [future.result() for future in futures]
+
+    # Chain the test windows: every fold starts from the previous fold's ending value
+    pieces, index = [], []
+    level, covered = float(initial_capital), 0
+    for result in results:
+        fold, equity = result['fold'], result['test_equity']
+        offset = max(covered - fold['train_end'], 0)  # ticks the previous fold already covered (step < test_size)
+        if offset >= len(equity):
+            continue
+        base = equity[offset - 1] if offset else initial_capital
+        piece = level * equity[offset:] / base
+        pieces.append(piece)
+        index.append(np.arange(fold['train_end'] + offset, fold['test_end']))
+        level, covered = float(piece[-1]), fold['test_end']
+    oos_index = np.concatenate(index)
+    oos_equity = np.concatenate(pieces)
+
+    if timestamps is None:
+        oos_timestamps = oos_index.astype(np.int64)
+    else:
+        timestamps = np.asarray(timestamps)
+        if timestamps.dtype.kind == 'M':
+            timestamps = timestamps.astype('datetime64[ns]').view(np.int64)
+        oos_timestamps = timestamps[oos_index]
+    curve = EquityCurve()
+    curve.extend(oos_timestamps, oos_equity)
+
+    return {
+        'strategy': strategy_name,
+        'objective': objective,
+        'folds': results,
+        'oos_index': oos_index,
+        'oos_equity': oos_equity,
+        'oos_curve': curve,
+        'oos_return': float(oos_equity[-1] / initial_capital - 1),
+        'oos_stats': curve.get_stats(),
+    }
+
+
+def walk_forward_symbol(strategy_name: str, symbol: str, data: MarketData, train_size: int, test_size: int,
+                        **kwargs) -> Dict:
+    """walk_forward over one symbol of a MarketData, with its timestamps on the out-of-sample curve."""
+    return walk_forward(strategy_name, data.prices(symbol), train_size, test_size,
+                        timestamps=data.timestamps_ns(symbol), **kwargs)